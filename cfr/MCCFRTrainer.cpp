@@ -1,13 +1,12 @@
 #include "MCCFRTrainer.hpp"
 
 
-MCCFRTrainer::MCCFRTrainer(){
-    mCards = {1,2,3};
+MCCFRTrainer::MCCFRTrainer(int numPlayers): MCCFRTrainer(leducSpec(numPlayers)){
 };
 
-MCCFRTrainer::MCCFRTrainer(int numPlayers){
-    mCards = {1,2,3,1,2,3};
-    mNumPlayers = numPlayers;
+MCCFRTrainer::MCCFRTrainer(GameSpec spec): mSpec(spec){
+    mCards = mSpec.deck();
+    mNumPlayers = mSpec.mNumPlayers;
 
     std::random_device mRd;
     std::mt19937 mActionEng(mRd());
@@ -24,7 +23,7 @@ void MCCFRTrainer::train(int iterations){
             std::cout << "\nIteration "<< i;
         }
         std::shuffle(mCards.begin(), mCards.end(), randEng);
-        State state(mNumPlayers, 2, mCards, 2);
+        State state(mSpec, mCards);
         for(int player=0; player<mNumPlayers;player++){
             if(i % mStrategyInterval == 0){
                 MCCFRTrainer::updateStrategy(state, player);
@@ -44,9 +43,8 @@ void MCCFRTrainer::train(int iterations){
         }
         if(i < mLCFRThreshold && i % mDiscountInterval == 0){
             float discount = (i/mDiscountInterval)/((i/mDiscountInterval) + 1.);
-            for(auto map: mNodeMap){
-                std::unordered_map<std::string, InfoNode> playerNodes = mNodeMap[map.first];
-                for(auto keyValue: playerNodes){
+            for(auto &map: mNodeMap){
+                for(auto &keyValue: map.second){
                     auto validActions = mValidActionsMap[keyValue.first];
                     for(auto action: validActions){
                         keyValue.second.regretSum.at(action) *= discount;
@@ -70,12 +68,12 @@ std::valarray<float> MCCFRTrainer::mccfr(State state, int player, bool prune){
         std::string infoSet = state.infoSet();
         auto search = mNodeMap[currentPlayer].find(infoSet);
         if(search == mNodeMap[currentPlayer].end()){
-            std::vector<std::string> validActions = state.validActions();
+            std::set<std::string> validActions = state.validActions();
             mNodeMap[currentPlayer].insert({infoSet, InfoNode(validActions)});
             mValidActionsMap[infoSet] = validActions;
         }
 
-        std::vector<std::string> validActions = mValidActionsMap[infoSet];
+        std::set<std::string> validActions = mValidActionsMap[infoSet];
         std::unordered_map<std::string, double> strategy = mNodeMap[currentPlayer].at(infoSet).getStrategy(validActions);
 
         std::unordered_map<std::string, double> utilities;
@@ -121,11 +119,11 @@ std::valarray<float> MCCFRTrainer::mccfr(State state, int player, bool prune){
         std::string infoSet = state.infoSet();
         auto search = mNodeMap[currentPlayer].find(infoSet);
         if(search == mNodeMap[currentPlayer].end()){
-            std::vector<std::string> validActions = state.validActions();
+            std::set<std::string> validActions = state.validActions();
             mNodeMap[currentPlayer].insert({infoSet, InfoNode(validActions)});
             mValidActionsMap[infoSet] = validActions;
         }
-        std::vector<std::string> validActions = mValidActionsMap[infoSet];
+        std::set<std::string> validActions = mValidActionsMap[infoSet];
         std::unordered_map<std::string, double> strategy = mNodeMap[currentPlayer].at(infoSet).getStrategy(validActions);
 
         std::vector<std::string> actions;
@@ -150,11 +148,11 @@ void MCCFRTrainer::updateStrategy(State state, int player){
         std::string infoSet = state.infoSet();
         auto search = mNodeMap[currentPlayer].find(infoSet);
         if(search == mNodeMap[currentPlayer].end()){
-            std::vector<std::string> validActions = state.validActions();
+            std::set<std::string> validActions = state.validActions();
             mNodeMap[currentPlayer].insert({infoSet, InfoNode(validActions)});
             mValidActionsMap[infoSet] = validActions;
         }
-        std::vector<std::string> validActions = mValidActionsMap[infoSet];
+        std::set<std::string> validActions = mValidActionsMap[infoSet];
         std::unordered_map<std::string, double> strategy = mNodeMap[currentPlayer].at(infoSet).getStrategy(validActions);
 
         std::vector<std::string> actions;
@@ -173,11 +171,11 @@ void MCCFRTrainer::updateStrategy(State state, int player){
         std::string infoSet = state.infoSet();
         auto search = mValidActionsMap.find(infoSet);
         if(search == mValidActionsMap.end()){
-            std::vector<std::string> validActions = state.validActions();
+            std::set<std::string> validActions = state.validActions();
             mNodeMap[currentPlayer].insert({infoSet, InfoNode(validActions)});
             mValidActionsMap[infoSet] = validActions;
         }
-        std::vector<std::string> validActions = mValidActionsMap[infoSet];
+        std::set<std::string> validActions = mValidActionsMap[infoSet];
         for(auto action: validActions){
             updateStrategy(State(state, action), player);
         }
@@ -187,15 +185,13 @@ void MCCFRTrainer::updateStrategy(State state, int player){
 std::valarray<float> MCCFRTrainer::expectedUtility(){
     std::valarray<float> expectedUtility(mNumPlayers);
 
-    std::sort(mCards.begin(), mCards.end());
-    int numPermutations = 0;
-    do{
-        State state(mNumPlayers, 2, mCards, 2);
+    std::vector<std::vector<int>> deals = mSpec.deals();
+    for(const auto &deal: deals){
+        State state(mSpec, deal);
         expectedUtility += traverseTree(state);
-        numPermutations += 1;
-    }while(std::next_permutation(mCards.begin(), mCards.end()));
+    }
 
-    return expectedUtility/numPermutations;
+    return expectedUtility/(float) deals.size();
 };
 
 std::valarray<float> MCCFRTrainer::traverseTree(State state){
@@ -206,7 +202,7 @@ std::valarray<float> MCCFRTrainer::traverseTree(State state){
 
     int player = state.mTurn;
     std::string infoSet = state.infoSet();
-    std::vector<std::string> validActions = mValidActionsMap[infoSet];
+    std::set<std::string> validActions = mValidActionsMap[infoSet];
     std::unordered_map<std::string, double> strategy = mNodeMap[player].at(infoSet).getAverageStrategy();
 
     std::valarray<float> expectedUtility(mNumPlayers);
@@ -8,10 +8,11 @@
 
 class MCCFRTrainer{
     public:
-        MCCFRTrainer();
         MCCFRTrainer(int numPlayers);
+        MCCFRTrainer(GameSpec spec);
         ~MCCFRTrainer();
         void train(int iterations);
+        GameSpec mSpec;
         std::vector<int> mCards;
         std::unordered_map<int, std::unordered_map<std::string, InfoNode>> mNodeMap;
         std::valarray<float> expectedUtility();
@@ -30,6 +31,6 @@ class MCCFRTrainer{
         std::random_device mRd;
         std::mt19937 mActionEng;
 
-        std::unordered_map<std::string, std::vector<std::string>> mValidActionsMap;
+        std::unordered_map<std::string, std::set<std::string>> mValidActionsMap;
         std::vector<std::string> mValidActions;
 };
\ No newline at end of file
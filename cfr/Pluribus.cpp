@@ -1,7 +1,7 @@
 #include "Pluribus.hpp"
 
-Pluribus::Pluribus(int numPlayers): mCards({1,2,3,1,2,3}), 
-            mCurrentState(State(numPlayers, 2, mCards, 2)), mPublicState(0){
+Pluribus::Pluribus(int numPlayers): mSpec(leducSpec(numPlayers)), mCards(mSpec.deck()),
+            mCurrentState(State(mSpec, mCards)), mPublicState(0){
     mNumPlayers = numPlayers;
 
     std::random_device mRd;
@@ -19,7 +19,7 @@ void Pluribus::train(int iterations){
             std::cout << "\nIteration "<< i;
         }
         std::shuffle(mCards.begin(), mCards.end(), randEng);
-        State state(mNumPlayers, 2, mCards, 2);
+        State state(mSpec, mCards);
         for(int player=0; player<mNumPlayers;player++){
             if(i % mStrategyInterval == 0){
                 Pluribus::updateStrategy(state, player);
@@ -185,7 +185,7 @@ std::valarray<float> Pluribus::expectedUtility(){
     std::sort(mCards.begin(), mCards.end());
     int numPermutations = 0;
     do{
-        State state(mNumPlayers, 2, mCards, 2);
+        State state(mSpec, mCards);
         expectedUtility += traverseTree(state);
         numPermutations += 1;
     }while(std::next_permutation(mCards.begin(), mCards.end()));
@@ -221,7 +221,7 @@ void Pluribus::search(int iterations){
             std::cout << "\nSolving, Iteration "<< i;
         }
         std::shuffle(mCards.begin(), mCards.end(), randEng);
-        State state(mNumPlayers, 2, mCards, 2);
+        State state(mSpec, mCards);
         for(int player=0; player<mNumPlayers;player++){
             if(i % mStrategyInterval == 0){
                 Pluribus::subgameUpdate(state, player);
@@ -19,6 +19,7 @@ class Pluribus{
         Pluribus(int numPlayers);
         ~Pluribus();
         void train(int iterations);
+        GameSpec mSpec;
         std::vector<int> mCards;
         std::unordered_map<int, std::unordered_map<std::string, InfoNode>> mNodeMap;
         std::valarray<float> expectedUtility();
@@ -1,174 +1,220 @@
 #include "State.hpp"
 
+const std::string RANK_STRING = "??23456789TJQKA";
+const std::string SUIT_STRING = "?shdc";
 
-State::State(int numPlayers, int numRounds, std::vector<int> cards, int numRaises): mTurn(0), mRound(0), mRaisesSoFar(0){
-    mNumPlayers = numPlayers;
-    mCards = cards;
-    mBets.assign(numPlayers, 1);
-    mTotalRounds = numRounds; 
-    mRaises = numRaises;
 
-    for(int i=0; i< numRounds; i++){
-        mHistory.push_back(std::vector<std::string>());
+GameSpec::GameSpec(std::vector<int> ranks, std::vector<int> suits, int numPlayers,
+                   std::vector<int> boardCards, std::vector<int> betSizes, int raiseCap,
+                   int ante, std::string handEval):
+    mRanks(ranks), mSuits(suits), mNumPlayers(numPlayers), mBoardCards(boardCards),
+    mBetSizes(betSizes), mRaiseCap(raiseCap), mAnte(ante), mHandEval(handEval){
+        if(boardCards.size() != betSizes.size()){
+            throw std::invalid_argument("boardCards and betSizes need one entry per round");
+        }
+        mNumRounds = betSizes.size();
+        int dealt = 0;
+        for(auto cards: boardCards){
+            dealt += cards;
+            mBoardDealt.push_back(dealt);
+        }
+        mNumCards = numPlayers + dealt;
+};
+
+std::vector<int> GameSpec::deck() const{
+    std::vector<int> cards;
+    for(auto suit: mSuits){
+        for(auto rank: mRanks){
+            cards.push_back(rank * 4 + suit - 1);
+        }
     }
-    
-    mIn.assign(numPlayers, true);
+    return cards;
 };
 
-State::State(const State &state, std::string action, bool search): mTurn(state.mTurn), mCards(state.mCards),
-    mRound(state.mRound), mBets(state.mBets), mNumPlayers(state.mNumPlayers),
-    mHistory(state.mHistory), mIn(state.mIn), mTotalRounds(state.mTotalRounds), 
-    mRaises(state.mRaises), mRaisesSoFar(state.mRaisesSoFar){
-        std::string lastAction = "EMPTY";
-        if(!mHistory[mRound].empty()){
-            lastAction = mHistory[mRound].back();
+// Every ordered deal of mNumCards cards from the deck.
+std::vector<std::vector<int>> GameSpec::deals() const{
+    std::vector<int> cards = deck();
+    std::vector<std::vector<int>> deals = {{}};
+    for(int i=0; i<mNumCards; i++){
+        std::vector<std::vector<int>> extended;
+        for(const auto &deal: deals){
+            for(auto card: cards){
+                if(std::find(deal.begin(), deal.end(), card) == deal.end()){
+                    extended.push_back(deal);
+                    extended.back().push_back(card);
+                }
+            }
         }
-        
+        deals = extended;
+    }
+    return deals;
+};
+
+GameSpec leducSpec(int numPlayers){
+    return GameSpec({14, 13, 12}, {1, 2}, numPlayers, {0, 1}, {2, 4}, 2, 1, "leduc");
+};
+
+
+State::State(const GameSpec &spec, std::vector<int> cards): mSpec(&spec), mCards(cards),
+    mTurn(0), mRound(0), mTerminal(false){
+        mNumPlayers = spec.mNumPlayers;
+        mBets.assign(mNumPlayers, spec.mAnte);
+        mTotalRounds = spec.mNumRounds;
+        mHistory.assign(mTotalRounds, std::vector<std::string>());
+        mIn.assign(mNumPlayers, true);
+        mToAct = mNumPlayers;
+};
+
+State::State(const State &state, std::string action, bool search): mSpec(state.mSpec),
+    mCards(state.mCards), mBets(state.mBets), mHistory(state.mHistory), mIn(state.mIn),
+    mNumPlayers(state.mNumPlayers), mTurn(state.mTurn), mTotalRounds(state.mTotalRounds),
+    mRound(state.mRound), mToAct(state.mToAct){
         mHistory[mRound].push_back(action);
 
+        int maxBet = *std::max_element(mBets.begin(), mBets.end());
         if(action == "F"){
             mIn[mTurn] = false;
         }
-        else if (action.find("R") != std::string::npos){
+        else if(action.find("R") != std::string::npos){
             int raiseSize = std::stoi(action.substr(0, action.size()-1));
-            mBets[mTurn] += *std::max_element(mBets.begin(), mBets.end()) + raiseSize;
-            mRaisesSoFar++;
+            mBets[mTurn] = maxBet + raiseSize;
         }
-        else if(action == "C"){
-            if(lastAction.find("R") != std::string::npos){
-                int callSize = *std::max_element(mBets.begin(), mBets.end()) - mBets[mTurn];
-                mBets[mTurn] += callSize;
-            }
+        else{
+            mBets[mTurn] = maxBet;
         }
 
-        mTurn = (mTurn + 1) % mNumPlayers;
-
-        int minActions = std::count(mIn.begin(), mIn.end(), true);
-        int actionsInRound = mHistory[mRound].size();
-
-        if(minActions <= actionsInRound and allCalledOrFolded()){
-            mRound += 1;
-            mRaisesSoFar = 0;
-        }
+        mTerminal = advance();
 }
 
 State::~State(){
 };
 
-std::string State::infoSet(){
-    int player = mTurn;
-    int card = mCards[player];
-
-    std::string infoSet = std::to_string(card) + " | ";
-
-    if(mRound > 0){
-        infoSet += std::to_string(mCards[mNumPlayers]) + " | ";
-    } 
-    for(const auto &chunk: mHistory){
-        for(const auto &piece: chunk){
-            infoSet += piece;
-        }
-        infoSet += "|";
-    }
-    
-
-    return infoSet;
-};
-
-bool State::isTerminal(){
+// Moves the turn on after an action, into the next round once everyone
+// still in has acted since the last raise. Returns whether the hand is over.
+bool State::advance(){
     int playersIn = std::count(mIn.begin(), mIn.end(), true);
     if(playersIn == 1){
         return true;
     }
 
-    else if(mRound < mTotalRounds){
-        return false;
+    if(mHistory[mRound].back().find("R") != std::string::npos){
+        mToAct = playersIn - 1;
     }
     else{
-        int minActions = playersIn;
-        int actionsInRound = mHistory.back().size();
+        mToAct--;
+    }
 
-        if(minActions <= actionsInRound and allCalledOrFolded()){
+    if(mToAct == 0){
+        if(mRound == mTotalRounds - 1){
             return true;
         }
-        return false;
+        mRound++;
+        mToAct = playersIn;
+        mTurn = 0;
+    }
+    else{
+        mTurn = (mTurn + 1) % mNumPlayers;
     }
+
+    while(!mIn[mTurn]){
+        mTurn = (mTurn + 1) % mNumPlayers;
+    }
+    return false;
 };
 
-bool State::allCalledOrFolded(){
-    int maxBet = *std::max_element(mBets.begin(), mBets.end());
+// Same key as GameState.info_set: the hole card and board with suits
+// relabelled in order of appearance, then the history of the rounds so far.
+std::string State::infoSet(){
+    std::vector<int> view = {mCards[mTurn]};
+    std::vector<int> boardCards = board();
+    view.insert(view.end(), boardCards.begin(), boardCards.end());
+
+    std::string infoSet;
+    int suits[5] = {0, 0, 0, 0, 0};
+    int used = 0;
+    for(int i=0; i<view.size(); i++){
+        int suit = (view[i] & 3) + 1;
+        if(suits[suit] == 0){
+            suits[suit] = mSpec->mSuits[used++];
+        }
+        infoSet += RANK_STRING[view[i] >> 2];
+        infoSet += SUIT_STRING[suits[suit]];
+        if(i == 0){
+            infoSet += " |";
+        }
+    }
 
-    for(int i=0; i< mIn.size(); i++){
-        if(mIn[i] and mBets[i] < maxBet){
-            return false;
+    infoSet += "| [";
+    for(int round=0; round<=mRound; round++){
+        infoSet += round > 0 ? ", [" : "[";
+        for(int i=0; i<mHistory[round].size(); i++){
+            infoSet += (i > 0 ? ", '" : "'") + mHistory[round][i] + "'";
         }
+        infoSet += "]";
     }
 
-    return true;
+    return infoSet + "]";
 };
 
-std::valarray<float> State::payoff(){
-    std::vector<int> winners;
-    int playersIn = std::count(mIn.begin(), mIn.end(), true);
-    if(playersIn == 1){
-        std::vector<bool>::iterator found = std::find(mIn.begin(), mIn.end(), true);
-        try{
-            if(found != mIn.end()){
-                int winner = found - mIn.begin();
-                winners.push_back(winner);
-            }
-            else{
-                throw std::logic_error("didn't find winner");
-            }
-        }
-        
-        catch(std::exception &ex){
-            std::cout << "Something weird happened";
-        }
+bool State::isTerminal(){
+    return mTerminal;
+};
+
+std::vector<int> State::board(){
+    auto start = mCards.begin() + mNumPlayers;
+    return std::vector<int>(start, start + mSpec->mBoardDealt[mRound]);
+};
+
+int State::score(int player){
+    int rank = mCards[player] >> 2;
+    if(mSpec->mHandEval == "kuhn"){
+        return rank;
     }
-    else{
-        winners = State::winners();
+
+    int high = rank, low = rank;
+    for(auto card: board()){
+        if(card >> 2 == rank){
+            return 15*14 + rank;
+        }
+        high = std::max(high, card >> 2);
+        low = std::min(low, card >> 2);
     }
+    return 14 * high + low;
+};
 
-    int pot = std::accumulate(mBets.begin(), mBets.end(), 0)/winners.size();
+std::valarray<float> State::payoff(){
+    std::vector<int> winners = State::winners();
+    float pot = std::accumulate(mBets.begin(), mBets.end(), 0);
 
     std::valarray<float> payoffs(mNumPlayers);
-    for(int i=0; i<mBets.size(); i++){
+    for(int i=0; i<mNumPlayers; i++){
         payoffs[i] = -mBets[i];
     }
 
     for(auto win: winners){
-        payoffs[win] += pot;
+        payoffs[win] += pot / winners.size();
     }
-    
 
     return payoffs;
 };
 
 std::vector<int> State::winners(){
-    std::vector<int> scores;
-    int boardCard = mCards[mNumPlayers];
+    std::vector<int> winners;
+    int playersIn = std::count(mIn.begin(), mIn.end(), true);
+    int high = -1;
     for(int player=0; player<mNumPlayers; player++){
-        if(mCards[player] == boardCard){
-            int score = 5*4 + boardCard;
-            scores.push_back(score);
+        if(!mIn[player]){
+            continue;
         }
-        else{
-            int score = 4 * std::max(boardCard, mCards[player]) + std::min(boardCard, mCards[player]);
-            scores.push_back(score);
-        }
-    }
 
-    std::vector<int> winners;
-    int high = -1;
-    for(int i=0; i<scores.size();i++){
-        if(winners.size() == 0 || scores[i] > high){
-            winners = {i};
-            high = scores[i];
+        int score = playersIn == 1 ? 0 : State::score(player);
+        if(score > high){
+            winners = {player};
+            high = score;
+        }
+        else if(score == high){
+            winners.push_back(player);
         }
-        else if(scores[i] == high){
-            winners.push_back(i);
-        } 
     }
 
     return winners;
@@ -178,9 +224,13 @@ std::set<std::string> State::validActions(){
     std::set<std::string> actions;
     actions.insert("C");
     actions.insert("F");
-    if(mRaisesSoFar < mRaises){
-        int raiseSize = mRound == 0 ? 2 : 4;
-        actions.insert(std::to_string(raiseSize) + "R");
+
+    int raises = 0;
+    for(const auto &action: mHistory[mRound]){
+        raises += action.find("R") != std::string::npos;
+    }
+    if(raises < mSpec->mRaiseCap){
+        actions.insert(std::to_string(mSpec->mBetSizes[mRound]) + "R");
     }
     return actions;
 }
@@ -5,28 +5,61 @@
 #include <numeric>
 #include <valarray>
 #include <set>
+#include <stdexcept>
+
+// Rules of a Kuhn/Leduc style variant, as leduc/game.py's GameSpec. Cards
+// are rank * 4 + suit - 1 and handEval is "kuhn" or "leduc".
+struct GameSpec{
+    GameSpec(std::vector<int> ranks, std::vector<int> suits, int numPlayers,
+             std::vector<int> boardCards, std::vector<int> betSizes, int raiseCap,
+             int ante, std::string handEval);
+    std::vector<int> deck() const;
+    std::vector<std::vector<int>> deals() const;
+
+    std::vector<int> mRanks;
+    std::vector<int> mSuits;
+    int mNumPlayers;
+    std::vector<int> mBoardCards;
+    std::vector<int> mBetSizes;
+    int mRaiseCap;
+    int mAnte;
+    std::string mHandEval;
+
+    int mNumRounds;
+    std::vector<int> mBoardDealt;
+    int mNumCards;
+};
+
+GameSpec leducSpec(int numPlayers=2);
+
+// Follows leduc/state.py's GameState. The spec has to outlive the state.
 class State{
     public:
-        State(int numPlayers, int numRound, std::vector<int> cards, int numRaises);
+        State(const GameSpec &spec, std::vector<int> cards);
         State(const State &state, std::string action, bool search=false);
         ~State();
         std::string infoSet();
         bool isTerminal();
         std::valarray<float> payoff();
         std::vector<int> winners();
-        bool allCalledOrFolded();
+        std::vector<int> board();
+        int score(int player);
         std::set<std::string> validActions();
-        
+
+        const GameSpec *mSpec;
         std::vector<int> mCards;
         std::vector<int> mBets;
         std::vector<std::vector<std::string>> mHistory;
         std::vector<bool> mIn;
-        
+
         int mNumPlayers;
         int mTurn;
-        
+
         int mTotalRounds;
         int mRound;
-        int mRaises;
-        int mRaisesSoFar;
-};
\ No newline at end of file
+        int mToAct;
+        bool mTerminal;
+
+    private:
+        bool advance();
+};
@@ -0,0 +1,40 @@
+/*
+<%
+setup_pybind11(cfg)
+cfg['sources'] = ['MCCFRTrainer.cpp', 'State.cpp', 'InfoNode.cpp']
+cfg['dependencies'] = ['MCCFRTrainer.hpp', 'State.hpp', 'InfoNode.hpp']
+cfg['compiler_args'] = ['-std=c++17', '-O2']
+%>
+*/
+#include <pybind11/pybind11.h>
+#include <pybind11/stl.h>
+#include "MCCFRTrainer.hpp"
+
+namespace py = pybind11;
+
+PYBIND11_MODULE(_cfr, m){
+    m.doc() = "Python binding of the C++ MCCFR trainer";
+
+    py::class_<GameSpec>(m, "GameSpec")
+        .def(py::init<std::vector<int>, std::vector<int>, int, std::vector<int>,
+                      std::vector<int>, int, int, std::string>(),
+             py::arg("ranks"), py::arg("suits"), py::arg("numPlayers"), py::arg("boardCards"),
+             py::arg("betSizes"), py::arg("raiseCap"), py::arg("ante"), py::arg("handEval"))
+        .def_readonly("numCards", &GameSpec::mNumCards);
+
+    py::class_<InfoNode>(m, "InfoNode")
+        .def_readonly("regretSum", &InfoNode::regretSum)
+        .def_readonly("strategySum", &InfoNode::strategySum)
+        .def("getAverageStrategy", &InfoNode::getAverageStrategy);
+
+    py::class_<MCCFRTrainer>(m, "MCCFRTrainer")
+        .def(py::init<int>(), py::arg("numPlayers") = 2)
+        .def(py::init<GameSpec>(), py::arg("spec"))
+        .def("train", &MCCFRTrainer::train, py::arg("iterations"),
+             py::call_guard<py::gil_scoped_release>())
+        .def("expectedUtility", [](MCCFRTrainer &trainer){
+            std::valarray<float> utility = trainer.expectedUtility();
+            return std::vector<float>(std::begin(utility), std::end(utility));
+        })
+        .def_readonly("mNodeMap", &MCCFRTrainer::mNodeMap);
+}
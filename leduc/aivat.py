@@ -0,0 +1,110 @@
+"""AIVAT-style variance reduction. Every deal, board card and known action
+is corrected by its change in blueprint value, so the same confidence
+interval needs fewer hands. `Aivat.evaluate(states, known)` corrects
+logged hands.
+"""
+import numpy as np
+
+from copy import copy
+from leduc.game import LEDUC
+from leduc.chance import deal_table
+
+
+class Aivat:
+    """Variance reduced payoffs of finished hands.
+
+    `value` is the expected utility of every player at a history with all
+    cards known when everyone plays the reference blueprint. Every chance
+    event (the deal and each board card) and every action of a player in
+    `known` is corrected by the value it reached minus the value expected
+    before it. When every player is known the corrected payoff is the value
+    of the game. The corrections have zero mean, so corrected payoffs stay
+    unbiased as long as the known players really played the blueprint.
+    """
+    def __init__(self, node_map, game=LEDUC):
+        self.node_map = node_map
+        self.game = game
+        self.table = deal_table(game.deck(), game.num_cards)
+        self.values = {}
+        self.chance_values = {}
+
+    def strategy(self, state):
+        node = self.node_map[state.turn].get(state.info_set())
+        if node is None:
+            valid_actions = state.valid_actions()
+            return {action: 1 / len(valid_actions) for action in valid_actions}
+
+        return node.avg_strategy()
+
+    def value(self, state):
+        if state.terminal:
+            return state.utility()
+
+        key = (tuple(state.cards), str(state.history))
+        if key not in self.values:
+            self.values[key] = sum(prob * self.value(state.take(action, deep=True))
+                                   for action, prob in self.strategy(state).items())
+
+        return self.values[key]
+
+    def chance_value(self, state, revealed):
+        """Value of `state` averaged over every deal that agrees with its
+        first `revealed` cards."""
+        if revealed >= len(state.cards):
+            return self.value(state)
+
+        key = (tuple(state.cards[:revealed]), str(state.history))
+        if key not in self.chance_values:
+            fixed = {i: card for i, card in enumerate(state.cards[:revealed])}
+            deals = self.table.consistent(fixed)
+            new_state = copy(state)
+            value = np.zeros(self.game.num_players)
+            for i in deals:
+                new_state.cards = self.table.hand(i)
+                value += self.value(new_state)
+            self.chance_values[key] = value / len(deals)
+
+        return self.chance_values[key]
+
+    def revealed(self, state):
+        return self.game.num_players + self.game.board_dealt[state.round]
+
+    def correction(self, cards, actions, known):
+        """Sum of the corrections along a hand. Values are averaged over the
+        board cards not dealt yet, so an action that ends a round is
+        corrected before its board card is."""
+        state = self.game.new_state(cards)
+        correction = (self.chance_value(state, self.revealed(state)) -
+                      self.chance_value(state, 0))
+
+        for action in actions:
+            revealed = self.revealed(state)
+            if state.turn in known:
+                expected = sum(prob * self.chance_value(state.take(a, deep=True), revealed)
+                               for a, prob in self.strategy(state).items())
+                correction += (self.chance_value(state.take(action, deep=True), revealed) -
+                               expected)
+
+            new_state = state.take(action, deep=True)
+            if not new_state.terminal and new_state.round != state.round:
+                correction += (self.chance_value(new_state, self.revealed(new_state)) -
+                               self.chance_value(new_state, revealed))
+            state = new_state
+
+        return correction
+
+    def correct(self, state, known=None):
+        """Corrected payoffs of the finished hand `state`. `known` are the
+        seats that played the blueprint, everyone by default."""
+        if known is None:
+            known = range(self.game.num_players)
+
+        actions = [action for actions in state.history for action in actions]
+        return state.utility() - self.correction(state.cards, actions, set(known))
+
+    def evaluate(self, states, known=None):
+        """Raw and corrected payoffs of logged hands, both N x num_players."""
+        raw = np.array([state.utility() for state in states])
+        corrected = np.array([self.correct(state, known) for state in states])
+
+        return raw, corrected
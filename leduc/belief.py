@@ -0,0 +1,71 @@
+"""Public beliefs of `Pluribus`: a distribution over every deal given the
+public actions. An action reweights the deals by its blueprint
+probability with the actor's cards in the deal, a board card rules out
+the deals that disagree with it and off-tree actions change nothing.
+`Search(beliefs=...)` samples its deals from them.
+"""
+import numpy as np
+
+from copy import copy
+
+
+class Beliefs:
+    """Probability of every deal of `table` given the public actions seen so
+    far. Each action reweights the deals by the probability the actor's
+    policy gives it with the cards of that deal, and every board card dealt
+    rules out the deals that disagree with it. Actions the policy never
+    plays, such as off-tree bets, leave the beliefs as they are.
+    """
+    def __init__(self, table, num_players):
+        self.table = table
+        self.num_players = num_players
+        self._weights = None
+
+    @property
+    def weights(self):
+        if self._weights is None:
+            self.reset()
+        return self._weights
+
+    def reset(self):
+        self._weights = np.full(len(self.table), 1 / len(self.table))
+
+    def observe(self, state, action, strategy):
+        """Updates on `action` taken at `state`, `strategy(state)` being the
+        policy the actor is assumed to play."""
+        weights = self.weights
+        view = copy(state)
+        likelihood = np.zeros(len(weights))
+        for i in np.flatnonzero(weights):
+            view.cards = self.table.hand(i)
+            likelihood[i] = strategy(view).get(action, 0)
+
+        if (weights * likelihood).sum() > 0:
+            self.condition(weights * likelihood)
+
+        new_state = state.take(action, deep=True)
+        if not new_state.terminal and new_state.round != state.round:
+            self.reveal(new_state)
+
+    def reveal(self, state):
+        """Keeps the deals holding the board cards dealt by `state.round`."""
+        end = self.num_players + state.spec.board_dealt[state.round]
+        fixed = {i: state.cards[i] for i in range(self.num_players, end)}
+        mask = np.zeros(len(self.weights))
+        mask[self.table.consistent(fixed)] = 1
+        self.condition(self.weights * mask)
+
+    def condition(self, weights):
+        self._weights = weights / weights.sum()
+
+    def private(self, player):
+        """Marginal distribution of `player`'s private card."""
+        marginal = {}
+        for i in np.flatnonzero(self.weights):
+            card = self.table.hand(i)[player]
+            marginal[card] = marginal.get(card, 0) + float(self.weights[i])
+
+        return marginal
+
+    def sample(self):
+        return self.table.hand(np.random.choice(len(self.weights), p=self.weights))
@@ -0,0 +1,44 @@
+import sys
+import time
+
+from leduc.game import LEDUC
+from leduc.monte import learn
+from leduc.native import train, node_maps, coverage
+from leduc.util import expected_utility
+
+
+def value(node_map, action_map, game=LEDUC):
+    return expected_utility(game.deck(), game.num_cards, game.num_players,
+                            node_map, action_map, game=game)[0]
+
+
+def time_python(iterations, backend='python', game=LEDUC):
+    node_map = {i: {} for i in range(game.num_players)}
+    action_map = {i: {} for i in range(game.num_players)}
+    start = time.perf_counter()
+    learn(iterations, game.deck(), game.num_cards, node_map, action_map,
+          game=game, backend=backend)
+    return time.perf_counter() - start, node_map, action_map
+
+
+def time_native(iterations, game=LEDUC):
+    start = time.perf_counter()
+    trainer = train(iterations, game)
+    trained = time.perf_counter() - start
+    node_map, action_map = node_maps(trainer, game)
+    return trained, time.perf_counter() - start - trained, node_map, action_map
+
+
+if __name__ == '__main__':
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+
+    train(1)  # builds the extension
+    trained, converted, node_map, action_map = time_native(iterations)
+    matched, total = coverage(node_map)
+    print(f"C++: {iterations / trained:.0f} iterations/sec, "
+          f"player 0 value {value(node_map, action_map):.4f}, "
+          f"{converted:.2f}s to convert the node map, {matched} of {total} info sets")
+    for backend in ['python', 'numba']:
+        seconds, node_map, action_map = time_python(iterations, backend)
+        print(f"{backend}: {iterations / seconds:.0f} iterations/sec, "
+              f"player 0 value {value(node_map, action_map):.4f}")
@@ -0,0 +1,60 @@
+import os
+import sys
+import time
+import subprocess
+import tempfile
+
+TARGET = .1
+FIRST_ACTION = """
+import time
+start = time.perf_counter()
+import numpy
+numpy_time = time.perf_counter() - start
+from leduc.search import Pluribus
+pluribus = Pluribus.load({policy!r})
+pluribus.act(pluribus.root)
+print(time.perf_counter() - start, numpy_time)
+"""
+
+
+def build_policy(path, iterations=2000):
+    from leduc.monte import learn
+    from leduc.game import LEDUC
+    from leduc.policy import PolicyTable
+
+    node_map = {i: {} for i in range(2)}
+    action_map = {i: {} for i in range(2)}
+    learn(iterations, LEDUC.deck(), 3, node_map, action_map, game=LEDUC)
+    PolicyTable.from_blueprint(node_map).save(path)
+
+
+def time_to_first_action(policy, runs=5):
+    """Seconds from a fresh interpreter to the first blueprint action, as
+    (time spent in the agent, time of that spent importing numpy, wall
+    time of the whole process) per run."""
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    env = dict(os.environ, PYTHONPATH=root)
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        output = subprocess.run([sys.executable, '-c', FIRST_ACTION.format(policy=policy)],
+                                env=env, check=True, capture_output=True, text=True)
+        agent, numpy_time = map(float, output.stdout.split())
+        timings.append((agent, numpy_time, time.perf_counter() - start))
+
+    return timings
+
+
+if __name__ == '__main__':
+    policy = sys.argv[1] if len(sys.argv) > 1 else 'policy.bin'
+    if not os.path.exists(policy):
+        policy = os.path.join(tempfile.mkdtemp(), 'policy.bin')
+        build_policy(policy)
+
+    timings = time_to_first_action(os.path.abspath(policy))
+    agent, numpy_time, _ = min(timings)
+    process = min(t for _, _, t in timings)
+    print(f"time to first action: {agent * 1000:.1f} ms in the agent, of which "
+          f"{numpy_time * 1000:.1f} ms importing numpy, "
+          f"{process * 1000:.1f} ms including interpreter start")
+    print('OK' if agent < TARGET else f'SLOWER than the {TARGET * 1000:.0f} ms target')
@@ -0,0 +1,25 @@
+import sys
+import time
+import tempfile
+
+from leduc.game import LEDUC
+from leduc.monte import learn
+from leduc.store import regret_stores
+
+
+def iterations_per_second(node_map, iterations):
+    action_map = {i: {} for i in range(2)}
+    start = time.perf_counter()
+    learn(iterations, LEDUC.deck(), LEDUC.num_cards, node_map, action_map, game=LEDUC)
+    return iterations / (time.perf_counter() - start)
+
+
+if __name__ == '__main__':
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+
+    print(f"dict: {iterations_per_second({i: {} for i in range(2)}, iterations):.0f} iterations/sec")
+    # Leduc has 234 info sets per player
+    for cache_size in [1000, 250, 100, 25]:
+        stores = regret_stores(tempfile.mkdtemp(), 2, cache_size=cache_size)
+        rate = iterations_per_second(stores, iterations)
+        print(f"store, {cache_size} cached rows: {rate:.0f} iterations/sec, {stores[0]}")
@@ -1,17 +1,11 @@
 import numpy as np
 
-from itertools import permutations
+from leduc.game import game_for
+from leduc.chance import deal_table
 
 
-def exploitability(cards, num_cards, node_map, action_map):
-    if len(cards) > 4:
-        from leduc.state import Leduc as State
-        from leduc.hand_eval import leduc_eval as eval
-    else:
-        from leduc.state import State
-        from leduc.hand_eval import kuhn_eval as eval
-
-    public_states, start = build_tree(cards, len(node_map))
+def exploitability(cards, num_cards, node_map, action_map, game=None):
+    public_states, start = build_tree(cards, len(node_map), game=game)
     exploit = 0 
     for player in range(len(node_map)):
         v = expectimax(start, public_states, cards, player, node_map, 1)
@@ -20,15 +14,11 @@ def exploitability(cards, num_cards, node_map, action_map):
     return exploit/len(node_map)
 
 
-def build_tree(cards, num_players):
-    if len(cards) > 4:
-        from leduc.state import Leduc as State
-        from leduc.hand_eval import leduc_eval as eval
-    else:
-        from leduc.state import State
-        from leduc.hand_eval import kuhn_eval as eval
-    
-    state = State(cards, num_players, eval)
+def build_tree(cards, num_players, game=None):
+    if game is None:
+        game = game_for(cards, num_players)
+
+    state = game.new_state(cards)
     public_states = {} 
 
     traverse_public(state, public_states)
@@ -53,7 +43,7 @@ def traverse_public(state, public):
 def expectimax(public_state, state_map, cards, fixed, node_map, prob):
     if public_state.terminal:
         # normalize prob for everyone else
-        all_deals = [list(t) for t in set(permutations(cards, 2))]
+        all_deals = deal_table(cards, public_state.spec.num_cards).hands
         util = np.zeros(len(node_map)) 
         for deal in all_deals:
             public_state.cards = deal
@@ -1,11 +1,25 @@
-class Card:
-    """Inspired from pycfr card.py"""
+"""Cards as small ints, `rank * 4 + suit - 1`. `encode` and `decode` convert
+between cards and int8 arrays of codes, which `chance.DealTable.codes` and
+`hand_eval.leduc_scores` work on.
+"""
+import numpy as np
+
+
+class Card(int):
+    """Inspired from pycfr card.py
+
+    A card is the small int rank * 4 + suit - 1, so hashing, comparing and
+    dealing cards works on ints and numpy arrays of codes; the class only
+    adds `rank`, `suit` and the display string on top.
+    """
+    __slots__ = ()
     SUIT_STRING = {
         1: "s",
         2: "h",
         3: "d",
         4: "c"
     }
+    SUIT_CODE = {string: suit for suit, string in SUIT_STRING.items()}
     CARD_STRING = {
         2: "2",
         3: "3",
@@ -21,21 +35,39 @@ class Card:
         13: "K",
         14: "A"
     }
-    def __init__(self, rank, suit):
-        self.rank = rank
-        self.suit = suit
+    def __new__(cls, rank, suit):
+        suit = cls.SUIT_CODE.get(suit, suit)
+        return int.__new__(cls, rank * 4 + suit - 1)
+
+    @classmethod
+    def from_code(cls, code):
+        return int.__new__(cls, code)
+
+    @classmethod
+    def from_string(cls, string):
+        """The card displayed as `string`, e.g. 'Kh'."""
+        ranks = {value: rank for rank, value in cls.CARD_STRING.items()}
+        return cls(ranks[string[0].upper()], cls.SUIT_CODE[string[1].lower()])
+
+    @property
+    def rank(self):
+        return self >> 2
+
+    @property
+    def suit(self):
+        return (self & 3) + 1
 
     def __repr__(self):
         return '{}{}'.format(self.CARD_STRING[self.rank], self.SUIT_STRING[self.suit])
 
-    def __eq__(self, card):
-        return card.rank == self.rank
-
-    def __lt__(self, card):
-        return self.rank < card.rank
+    def __getnewargs__(self):
+        return (self.rank, self.suit)
 
-    def __hash__(self):
-        return hash(repr(self))
 
+def encode(cards):
+    """Card codes of `cards` as an int8 array."""
+    return np.array(cards, dtype=np.int8)
 
 
+def decode(codes):
+    return [Card.from_code(int(code)) for code in codes]
@@ -0,0 +1,94 @@
+import random
+import numpy as np
+
+from functools import lru_cache
+from itertools import permutations
+from leduc.card import encode
+from leduc.isomorphism import deal_classes
+
+
+class DealTable:
+    """Every ordered deal of `num_cards` cards from `cards`.
+
+    Deals are rows of card indices into `cards`, `codes` holds the same
+    rows as card codes. The permutation table and
+    the suit isomorphism classes are only built the first time they are
+    used, and tables are shared across the process through `deal_table`.
+    """
+    def __init__(self, cards, num_cards):
+        self.cards = list(cards)
+        self.num_cards = num_cards
+        self.index = {card: i for i, card in enumerate(self.cards)}
+        self._deals = None
+        self._codes = None
+        self._hands = None
+        self._classes = None
+        self._consistent = {}
+
+    def __len__(self):
+        return len(self.deals)
+
+    @property
+    def deals(self):
+        if self._deals is None:
+            self._deals = np.array(list(permutations(range(len(self.cards)), self.num_cards)),
+                                   dtype=np.int8).reshape(-1, self.num_cards)
+        return self._deals
+
+    @property
+    def codes(self):
+        if self._codes is None:
+            self._codes = encode(self.cards)[self.deals]
+        return self._codes
+
+    @property
+    def hands(self):
+        if self._hands is None:
+            self._hands = [[self.cards[i] for i in deal] for deal in self.deals]
+        return self._hands
+
+    def hand(self, i):
+        return self.hands[i]
+
+    def random_hand(self):
+        """A uniformly random deal, drawn without building the deal table
+        or importing numpy.random."""
+        return random.sample(self.cards, self.num_cards)
+
+    def sample(self, size=None):
+        return np.random.randint(len(self.deals), size=size)
+
+    def consistent(self, fixed):
+        """Indices of the deals holding `fixed[position]` at each position."""
+        key = tuple(sorted((position, self.index[card]) for position, card in fixed.items()))
+        if key not in self._consistent:
+            mask = np.ones(len(self.deals), dtype=bool)
+            for position, card in key:
+                mask &= self.deals[:, position] == card
+            self._consistent[key] = np.flatnonzero(mask)
+
+        return self._consistent[key]
+
+    def sample_consistent(self, fixed, size=None):
+        index = self.consistent(fixed)
+        return index[np.random.randint(len(index), size=size)]
+
+    def classes(self):
+        """Suit isomorphism classes as (canonical deals, weights, probabilities)."""
+        if self._classes is None:
+            hands, weights = deal_classes(self.cards, self.num_cards)
+            self._classes = (hands, weights, weights / weights.sum())
+        return self._classes
+
+    def sample_class(self, size=None):
+        _, _, probs = self.classes()
+        return np.random.choice(len(probs), size=size, p=probs)
+
+
+@lru_cache(maxsize=None)
+def _deal_table(cards, num_cards):
+    return DealTable(cards, num_cards)
+
+
+def deal_table(cards, num_cards):
+    return _deal_table(tuple(cards), num_cards)
@@ -0,0 +1,223 @@
+"""Checkpoints taken while `monte.learn` runs, with
+`learn(..., checkpoint=Checkpointer(path, action_path, every=N))`.
+`python search.py` trains its blueprint this way.
+"""
+import os
+import time
+import pickle
+import tempfile
+import threading
+
+
+def write_atomic(path, obj):
+    """Pickles `obj` into a temporary file next to `path`, fsyncs it and
+    renames it over `path`, so readers only ever see complete files."""
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp = tempfile.mkstemp(dir=directory, prefix=f'.{os.path.basename(path)}.',
+                               suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            pickle.dump(obj, f, protocol=pickle.HIGHEST_PROTOCOL)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+
+    if hasattr(os, 'O_DIRECTORY'):
+        dir_fd = os.open(directory, os.O_RDONLY | os.O_DIRECTORY)
+        try:
+            os.fsync(dir_fd)
+        finally:
+            os.close(dir_fd)
+
+
+def snapshot(node_map):
+    """Copy of the regret and strategy tables of `node_map`, cheap next to
+    pickling it."""
+    copied = {}
+    for player, nodes in node_map.items():
+        copied[player] = {}
+        for info_set, node in nodes.items():
+            new_node = node.__class__.__new__(node.__class__)
+            new_node.__dict__.update(node.__dict__)
+            new_node.actions = list(node.actions)
+            new_node.regret_sum = dict(node.regret_sum)
+            new_node.strategy_sum = dict(node.strategy_sum)
+            copied[player][info_set] = new_node
+
+    return copied
+
+
+def snapshot_actions(action_map):
+    return {player: {info_set: {key: list(value) if isinstance(value, list) else value
+                                for key, value in entry.items()}
+                     for info_set, entry in entries.items()}
+            for player, entries in action_map.items()}
+
+
+class Checkpointer:
+    """Writes the node and action maps to `path` and `action_path` every
+    `every` iterations of `leduc.monte.learn` without stopping it.
+
+    Where `os.fork` exists the writer is a forked child, which pickles the
+    maps from its copy-on-write view of memory while training goes on. A
+    checkpoint that comes due while the last child is still writing is
+    skipped. Elsewhere the maps are copied and handed to a writer thread
+    that only keeps the latest copy. Either way every file is replaced
+    atomically and `stalls` holds the seconds each checkpoint took away
+    from training.
+
+    Players whose nodes are a `leduc.store.RegretStore` are left out of the
+    pickle at `path`. Their stores are flushed and copied to
+    `store_path/<player>` before `save` returns, which `regret_stores`
+    reopens.
+    """
+    def __init__(self, path='blueprint.po', action_path='actions.po', every=10000,
+                 fork=None, store_path=None):
+        self.path = path
+        self.store_path = f'{path}.stores' if store_path is None else store_path
+        self.action_path = action_path
+        self.every = every
+        self.fork = hasattr(os, 'fork') if fork is None else fork
+        self.stalls = []
+        self.iteration = None
+        self.written = 0
+        self.skipped = 0
+        self.failed = 0
+
+        self.child = None
+        self.pending = None
+        self.busy = False
+        self.error = None
+        self.thread = None
+        self.condition = threading.Condition()
+
+    def save(self, node_map, action_map, iteration=None):
+        start = time.perf_counter()
+        stores = {player: nodes for player, nodes in node_map.items()
+                  if hasattr(nodes, 'checkpoint')}
+        for player, store in stores.items():
+            store.checkpoint(os.path.join(self.store_path, str(player)))
+        node_map = {player: nodes for player, nodes in node_map.items()
+                    if player not in stores}
+
+        if self.fork:
+            handed_off = self.save_fork(node_map, action_map)
+        else:
+            handed_off = self.save_thread(node_map, action_map)
+        if handed_off:
+            self.iteration = iteration
+
+        stall = time.perf_counter() - start
+        self.stalls.append(stall)
+        return stall
+
+    def save_fork(self, node_map, action_map):
+        if not self.poll():
+            self.skipped += 1
+            return False
+
+        pid = os.fork()
+        if pid == 0:
+            status = 0
+            try:
+                self.write(node_map, action_map)
+            except BaseException:
+                status = 1
+            finally:
+                os._exit(status)
+
+        self.child = pid
+        return True
+
+    def poll(self, block=False):
+        """Whether the last forked writer is done, reaping it if so."""
+        if self.child is None:
+            return True
+
+        pid, status = os.waitpid(self.child, 0 if block else os.WNOHANG)
+        if pid == 0:
+            return False
+
+        self.child = None
+        if os.waitstatus_to_exitcode(status) == 0:
+            self.written += 1
+        else:
+            self.failed += 1
+        return True
+
+    def save_thread(self, node_map, action_map):
+        maps = (snapshot(node_map), snapshot_actions(action_map))
+        with self.condition:
+            if self.pending is not None:
+                self.skipped += 1
+            self.pending = maps
+            self.condition.notify_all()
+
+        if self.thread is None:
+            self.thread = threading.Thread(target=self.run, daemon=True)
+            self.thread.start()
+        return True
+
+    def run(self):
+        while True:
+            with self.condition:
+                while self.pending is None:
+                    self.condition.wait()
+                node_map, action_map = self.pending
+                self.pending = None
+                self.busy = True
+
+            written, error = False, None
+            try:
+                self.write(node_map, action_map)
+                written = True
+            except OSError:
+                pass
+            except Exception as e:
+                error = e
+            finally:
+                with self.condition:
+                    self.busy = False
+                    if written:
+                        self.written += 1
+                    else:
+                        self.failed += 1
+                    if error is not None:
+                        self.error = error
+                    self.condition.notify_all()
+
+    def write(self, node_map, action_map):
+        write_atomic(self.path, node_map)
+        if self.action_path is not None:
+            write_atomic(self.action_path, action_map)
+
+    def wait(self):
+        """Blocks until the last checkpoint is on disk. Raises what the
+        writer thread failed with, other than an `OSError`, since then."""
+        if self.fork:
+            self.poll(block=True)
+            return
+
+        with self.condition:
+            while self.pending is not None or self.busy:
+                self.condition.wait()
+            error, self.error = self.error, None
+        if error is not None:
+            raise error
+
+    def stats(self):
+        return {'checkpoints': len(self.stalls), 'written': self.written,
+                'skipped': self.skipped, 'failed': self.failed,
+                'iteration': self.iteration,
+                'max_stall': max(self.stalls, default=0.),
+                'mean_stall': sum(self.stalls) / max(len(self.stalls), 1)}
+
+    def __repr__(self):
+        stats = self.stats()
+        return (f"{stats['written']} checkpoints written, {stats['skipped']} skipped, "
+                f"stall {1000 * stats['mean_stall']:.1f} ms mean, "
+                f"{1000 * stats['max_stall']:.1f} ms max")
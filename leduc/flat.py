@@ -0,0 +1,344 @@
+"""`backend='numba'` of both `learn` functions. The game is compiled into an
+info set table, a payoff table and the public tree, and regrets are kept
+in arrays. The traversals are compiled with Numba when it's installed and
+run as plain Python otherwise; either way they give the same node maps
+and random stream as the object engine for a fixed seed.
+"""
+import numpy as np
+
+from functools import lru_cache
+from tqdm import tqdm
+from leduc.node import Node, MNode
+from leduc.chance import deal_table
+
+try:
+    from numba import njit
+    from numba import _helperlib
+    NUMBA = True
+except ImportError:
+    NUMBA = False
+
+    def njit(*args, **kwargs):
+        if len(args) == 1 and callable(args[0]):
+            return args[0]
+        return lambda f: f
+
+# mirrors leduc.monte and leduc.sampling, which import this module lazily
+STRAT_INTERVAL = 100
+PRUNE_THRESH = 200
+DISCOUNT = 10
+LCFR_INTERVAL = 400
+REGRET_MIN = -300000
+
+
+class FlatGame:
+    """A game compiled into arrays for the array backend.
+
+    Deals are the suit isomorphism classes of `deal_table(cards, num_cards)`
+    and nodes the public tree of `game`. `infoset[d, n]` is the info set of
+    the player to act at node n of deal d, with valid actions
+    `actions[i, :num_actions[i]]` as columns of `game.compile().children`.
+    `payoff[d, n]` is the utility of terminal node n for deal d.
+    """
+    def __init__(self, game, cards, num_cards):
+        tree = game.compile()
+        self.game = game
+        self.table = deal_table(cards, num_cards)
+        hands, _, self.deal_probs = self.table.classes()
+
+        self.keys, self.valid = [], []
+        index = {}
+        self.infoset = np.full((len(hands), len(tree)), -1, dtype=np.int64)
+        self.payoff = np.zeros((len(hands), len(tree), game.num_players))
+        for d, hand in enumerate(hands):
+            stack = [game.new_state(hand)]
+            while stack:
+                state = stack.pop()
+                n = tree.node(state)
+                if state.terminal:
+                    self.payoff[d, n] = state.utility()
+                    continue
+
+                key = (state.turn, state.info_set())
+                if key not in index:
+                    index[key] = len(self.keys)
+                    self.keys.append(key)
+                    self.valid.append(state.valid_actions())
+                self.infoset[d, n] = index[key]
+
+                for action in state.valid_actions():
+                    stack.append(state.take(action, deep=True))
+
+        width = max(len(valid) for valid in self.valid)
+        self.actions = np.full((len(self.keys), width), -1, dtype=np.int64)
+        self.num_actions = np.array([len(valid) for valid in self.valid], dtype=np.int64)
+        for i, valid in enumerate(self.valid):
+            self.actions[i, :len(valid)] = [tree.action_index[a] for a in valid]
+
+        self.children = tree.children.astype(np.int64)
+        self.turn = tree.turn.astype(np.int64)
+
+    def tables(self, node_map):
+        """Regret and strategy sums of `node_map` as arrays."""
+        regret = np.zeros(self.actions.shape)
+        strategy_sum = np.zeros(self.actions.shape)
+        for i, (player, info_set) in enumerate(self.keys):
+            node = node_map[player].get(info_set)
+            if node is not None:
+                for j, action in enumerate(self.valid[i]):
+                    regret[i, j] = node.regret_sum[action]
+                    strategy_sum[i, j] = node.strategy_sum[action]
+
+        return regret, strategy_sum
+
+    def export(self, node_map, action_map, regret, strategy_sum, visited,
+               node_type=Node, entry=list):
+        """Writes the visited info sets back into `node_map`."""
+        for i in np.flatnonzero(visited):
+            player, info_set = self.keys[i]
+            valid = self.valid[i]
+            if info_set not in action_map[player]:
+                action_map[player][info_set] = entry(valid)
+            if info_set not in node_map[player]:
+                node_map[player][info_set] = node_type(valid)
+
+            node = node_map[player][info_set]
+            node.regret_sum = {a: float(regret[i, j]) for j, a in enumerate(valid)}
+            node.strategy_sum = {a: float(strategy_sum[i, j]) for j, a in enumerate(valid)}
+
+
+@lru_cache(maxsize=None)
+def _flat_game(game, cards, num_cards):
+    return FlatGame(game, cards, num_cards)
+
+
+def flat_game(game, cards, num_cards):
+    return _flat_game(game, tuple(cards), num_cards)
+
+
+def numba_state():
+    """Copies numpy's global random state into Numba's, so compiled code
+    draws the same numbers the Python engine would."""
+    if NUMBA:
+        ints, index = np.random.get_state()[1:3]
+        _helperlib.rnd_set_state(_helperlib.rnd_get_np_state_ptr(),
+                                 (index, [int(x) for x in ints]))
+
+
+def numpy_state():
+    if NUMBA:
+        index, ints = _helperlib.rnd_get_state(_helperlib.rnd_get_np_state_ptr())
+        np.random.set_state(('MT19937', np.array(ints, dtype=np.uint32), index))
+
+
+# Numba's on-disk cache cannot reload recursive functions or their callers (the
+# reloaded dispatcher segfaults), so only the leaf kernels below are cached.
+@njit(cache=True)
+def current_strategy(regret, k):
+    strategy = np.zeros(k)
+    norm_sum = 0.
+    for j in range(k):
+        if regret[j] > 0:
+            strategy[j] = regret[j]
+        norm_sum += strategy[j]
+
+    for j in range(k):
+        strategy[j] = strategy[j] / norm_sum if norm_sum > 0 else 1 / k
+
+    return strategy
+
+
+@njit(cache=True)
+def choose(probs):
+    """Same draw as `np.random.choice(len(probs), p=probs)`."""
+    cdf = np.cumsum(probs)
+    cdf /= cdf[-1]
+    sample = np.random.random()
+    choice = 0
+    while choice < len(cdf) - 1 and cdf[choice] <= sample:
+        choice += 1
+
+    return choice
+
+
+@njit
+def vanilla_cfr(d, n, probs, traverser, plus, children, turn, infoset, actions,
+                num_actions, payoff, regret, strategy_sum, visited):
+    if turn[n] < 0:
+        return payoff[d, n].copy()
+
+    player = turn[n]
+    i = infoset[d, n]
+    k = num_actions[i]
+    visited[i] = True
+    update = traverser < 0 or traverser == player
+
+    strategy = current_strategy(regret[i], k)
+    if update and probs[player] != 0:
+        for j in range(k):
+            strategy_sum[i, j] += strategy[j] * probs[player]
+
+    util = np.zeros(k)
+    node_util = np.zeros(len(probs))
+    for j in range(k):
+        new_probs = probs.copy()
+        new_probs[player] = probs[player] * strategy[j]
+        returned = vanilla_cfr(d, children[n, actions[i, j]], new_probs, traverser,
+                               plus, children, turn, infoset, actions, num_actions,
+                               payoff, regret, strategy_sum, visited)
+        util[j] = returned[player]
+        node_util += returned * strategy[j]
+
+    if not update:
+        return node_util
+
+    reach_prob = 1.
+    for p in range(len(probs)):
+        if p != player:
+            reach_prob *= probs[p]
+
+    for j in range(k):
+        regret[i, j] += (util[j] - node_util[player]) * reach_prob
+        if plus and regret[i, j] < 0:
+            regret[i, j] = 0.
+
+    return node_util
+
+
+@njit
+def external_cfr(d, n, traverser, prune, children, turn, infoset, actions,
+                 num_actions, payoff, regret, visited, counter):
+    if turn[n] < 0:
+        return payoff[d, n].copy()
+
+    counter[0] += 1
+    player = turn[n]
+    i = infoset[d, n]
+    k = num_actions[i]
+    visited[i] = True
+    strategy = current_strategy(regret[i], k)
+
+    if player == traverser:
+        util = np.zeros(k)
+        node_util = np.zeros(payoff.shape[2])
+        explored = np.ones(k, dtype=np.bool_)
+        for j in range(k):
+            if prune and regret[i, j] <= REGRET_MIN:
+                explored[j] = False
+            else:
+                returned = external_cfr(d, children[n, actions[i, j]], traverser, prune,
+                                        children, turn, infoset, actions, num_actions,
+                                        payoff, regret, visited, counter)
+                util[j] = returned[player]
+                node_util += returned * strategy[j]
+
+        for j in range(k):
+            if explored[j]:
+                regret[i, j] += util[j] - node_util[player]
+
+        return node_util
+
+    j = choose(strategy)
+    return external_cfr(d, children[n, actions[i, j]], traverser, prune, children,
+                        turn, infoset, actions, num_actions, payoff, regret,
+                        visited, counter)
+
+
+@njit
+def sample_strategy(d, n, traverser, children, turn, infoset, actions, num_actions,
+                    regret, strategy_sum, visited):
+    if turn[n] < 0:
+        return
+
+    player = turn[n]
+    i = infoset[d, n]
+    k = num_actions[i]
+    visited[i] = True
+    strategy = current_strategy(regret[i], k)
+
+    if player == traverser:
+        j = choose(strategy)
+        strategy_sum[i, j] += 1
+        sample_strategy(d, children[n, actions[i, j]], traverser, children, turn,
+                        infoset, actions, num_actions, regret, strategy_sum, visited)
+    else:
+        for j in range(k):
+            sample_strategy(d, children[n, actions[i, j]], traverser, children, turn,
+                            infoset, actions, num_actions, regret, strategy_sum, visited)
+
+
+@njit
+def external_learn(first, last, deal_probs, num_players, children, turn, infoset,
+                   actions, num_actions, payoff, regret, strategy_sum, visited,
+                   counter):
+    for t in range(first, last):
+        d = choose(deal_probs)
+        for player in range(num_players):
+            if t % STRAT_INTERVAL == 0:
+                sample_strategy(d, 0, player, children, turn, infoset, actions,
+                                num_actions, regret, strategy_sum, visited)
+
+            prune = False
+            if t > PRUNE_THRESH:
+                prune = np.random.random() >= .05
+            external_cfr(d, 0, player, prune, children, turn, infoset, actions,
+                         num_actions, payoff, regret, visited, counter)
+
+        if t < LCFR_INTERVAL and t % DISCOUNT == 0:
+            discounted = (t / DISCOUNT) / (t / DISCOUNT + 1)
+            regret *= discounted
+            strategy_sum *= discounted
+
+
+def learn_vanilla(iterations, cards, num_cards, node_map, action_map, game, mode,
+                  target=None, check_every=100):
+    """`leduc.vanilla.learn` over arrays, see there."""
+    from leduc.best_response import exploitability
+
+    flat = flat_game(game, cards, num_cards)
+    regret, strategy_sum = flat.tables(node_map)
+    visited = np.zeros(len(flat.keys), dtype=np.bool_)
+    num_players = len(node_map)
+    traversers = list(range(num_players)) if mode.alternating else [-1]
+
+    for t in tqdm(range(1, iterations + 1), desc="learning"):
+        d = flat.table.sample_class()
+        for traverser in traversers:
+            vanilla_cfr(d, 0, np.ones(num_players), traverser, mode.plus, flat.children,
+                        flat.turn, flat.infoset, flat.actions, flat.num_actions,
+                        flat.payoff, regret, strategy_sum, visited)
+
+        factors = mode.factors(t)
+        if factors is not None:
+            positive, negative, average = factors
+            regret *= np.where(regret > 0, positive, negative)
+            strategy_sum *= average
+
+        if target is not None and t % check_every == 0:
+            flat.export(node_map, action_map, regret, strategy_sum, visited)
+            if exploitability(cards, num_cards, node_map, action_map, game=game) <= target:
+                return t
+
+    flat.export(node_map, action_map, regret, strategy_sum, visited)
+    return iterations
+
+
+def learn_external(iterations, cards, num_cards, node_map, action_map, game, sampler):
+    """`leduc.monte.learn` with external sampling over arrays, see there."""
+    flat = flat_game(game, cards, num_cards)
+    regret, strategy_sum = flat.tables(node_map)
+    visited = np.zeros(len(flat.keys), dtype=np.bool_)
+    counter = np.zeros(1, dtype=np.int64)
+
+    numba_state()
+    external_learn(1, iterations + 1, flat.deal_probs, len(node_map), flat.children,
+                   flat.turn, flat.infoset, flat.actions, flat.num_actions, flat.payoff,
+                   regret, strategy_sum, visited, counter)
+    numpy_state()
+
+    flat.export(node_map, action_map, regret, strategy_sum, visited,
+                node_type=MNode, entry=lambda valid: {'actions': valid})
+    sampler.nodes += int(counter[0])
+    sampler.iterations += iterations
+
+    return sampler
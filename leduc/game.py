@@ -0,0 +1,179 @@
+"""Game rules. A `GameSpec` gives the deck, the number of players, the board
+cards and raise size of every round, the raise cap and the ante. `KUHN`,
+`KUHN_3P` and `LEDUC` are presets and `replace` derives variants, e.g.
+`LEDUC.replace(num_players=3, board_cards=(0, 1, 1), bet_sizes=(2, 4, 4))`,
+which `learn`, `expected_utility`, `exploitability` and `Pluribus` take as
+`game=`. `compile` returns the public betting tree as flat arrays.
+"""
+import numpy as np
+
+from leduc.card import Card
+from leduc.hand_eval import kuhn_eval, leduc_eval
+from leduc.state import GameState
+
+
+class GameSpec:
+    """Rules of a Kuhn/Leduc style poker variant.
+
+    `board_cards[r]` is the number of board cards dealt at the start of
+    round r and `bet_sizes[r]` the raise size allowed in that round, so
+    both have one entry per betting round. `raise_cap` is the number of
+    raises allowed in a round.
+    """
+    def __init__(self, ranks, suits=(1,), num_players=2, board_cards=(0,),
+                 bet_sizes=(1,), raise_cap=2, ante=1, hand_eval=None):
+        if len(board_cards) != len(bet_sizes):
+            raise ValueError("board_cards and bet_sizes need one entry per round")
+
+        self.ranks = tuple(ranks)
+        self.suits = tuple(suits)
+        self.num_players = num_players
+        self.board_cards = tuple(board_cards)
+        self.bet_sizes = tuple(bet_sizes)
+        self.raise_cap = raise_cap
+        self.ante = ante
+        self.num_rounds = len(bet_sizes)
+        self.board_dealt = tuple(np.cumsum(self.board_cards).tolist())
+        self.num_cards = num_players + self.board_dealt[-1]
+
+        if self.num_cards > len(self.ranks) * len(self.suits):
+            raise ValueError(f"A deck of {len(self.ranks) * len(self.suits)} cards "
+                             f"can't deal {self.num_cards} cards")
+
+        if hand_eval is None:
+            hand_eval = leduc_eval if self.board_dealt[-1] > 0 else kuhn_eval
+        self.hand_eval = hand_eval
+        self._tree = None
+
+    def key(self):
+        return (self.ranks, self.suits, self.num_players, self.board_cards,
+                self.bet_sizes, self.raise_cap, self.ante, self.hand_eval)
+
+    def __eq__(self, other):
+        return isinstance(other, GameSpec) and self.key() == other.key()
+
+    def __hash__(self):
+        return hash(self.key())
+
+    def __repr__(self):
+        return (f"GameSpec(ranks={self.ranks}, suits={self.suits}, "
+                f"num_players={self.num_players}, board_cards={self.board_cards}, "
+                f"bet_sizes={self.bet_sizes}, raise_cap={self.raise_cap}, "
+                f"ante={self.ante})")
+
+    def replace(self, **kwargs):
+        params = dict(ranks=self.ranks, suits=self.suits,
+                      num_players=self.num_players, board_cards=self.board_cards,
+                      bet_sizes=self.bet_sizes, raise_cap=self.raise_cap,
+                      ante=self.ante, hand_eval=self.hand_eval)
+        params.update(kwargs)
+
+        return GameSpec(**params)
+
+    def deck(self):
+        return [Card(rank, suit) for suit in self.suits for rank in self.ranks]
+
+    def new_state(self, cards):
+        return GameState(self, cards)
+
+    def compile(self):
+        if self._tree is None:
+            self._tree = PublicTree(self)
+
+        return self._tree
+
+
+class PublicTree:
+    """Public betting tree of a game compiled into flat arrays.
+
+    Nodes are numbered depth first from the root (node 0). `children[n, a]`
+    is the node reached by taking `actions[a]` at node n, or -1 when the
+    action isn't legal there; `turn` is -1 at terminal nodes.
+    """
+    def __init__(self, spec):
+        self.spec = spec
+        self.actions = ['F', 'C'] + [f'{size}R' for size in sorted(set(spec.bet_sizes))]
+        self.action_index = {action: i for i, action in enumerate(self.actions)}
+
+        turn, rounds, bets, folded, children, parent = [], [], [], [], [], []
+        self.history = []
+        self.index = {}
+
+        root = spec.new_state([None] * spec.num_cards)
+        stack = [(root, -1, -1)]
+        while stack:
+            state, parent_id, action_id = stack.pop()
+            node = len(self.history)
+            key = str(state.history)
+            self.index[key] = node
+            self.history.append(key)
+            turn.append(-1 if state.terminal else state.turn)
+            rounds.append(state.round)
+            bets.append([p.bets for p in state.players])
+            folded.append([p.folded for p in state.players])
+            children.append([-1] * len(self.actions))
+            parent.append(parent_id)
+            if parent_id >= 0:
+                children[parent_id][action_id] = node
+
+            if state.terminal:
+                continue
+
+            for action in reversed(state.valid_actions()):
+                stack.append((state.take(action, deep=True), node,
+                               self.action_index[action]))
+
+        self.turn = np.array(turn, dtype=np.int8)
+        self.round = np.array(rounds, dtype=np.int8)
+        self.bets = np.array(bets, dtype=float)
+        self.folded = np.array(folded, dtype=bool)
+        self.children = np.array(children, dtype=np.int32)
+        self.parent = np.array(parent, dtype=np.int32)
+        self.terminal = self.turn < 0
+
+    def __len__(self):
+        return len(self.history)
+
+    def node(self, state):
+        return self.index[str(state.history)]
+
+    def valid_actions(self, node):
+        return [self.actions[a] for a in np.flatnonzero(self.children[node] >= 0)]
+
+    def child(self, node, action):
+        return self.children[node, self.action_index[action]]
+
+    def utility(self, node, cards):
+        spec = self.spec
+        players_in = np.flatnonzero(~self.folded[node])
+
+        if len(players_in) == 1:
+            winners = players_in
+        else:
+            board = cards[spec.num_players:spec.num_players + spec.board_dealt[self.round[node]]]
+            hand_scores = [spec.hand_eval(cards[i], board) for i in players_in]
+            high_score = max(hand_scores)
+            winners = [i for i, score in zip(players_in, hand_scores)
+                       if score == high_score]
+
+        payoffs = -self.bets[node].copy()
+        payoffs[winners] += self.bets[node].sum() / len(winners)
+
+        return payoffs
+
+
+def game_for(cards, num_players):
+    ranks = sorted({card.rank for card in cards}, reverse=True)
+    suits = sorted({card.suit for card in cards})
+
+    if len(cards) > 4:
+        return GameSpec(ranks, suits, num_players, board_cards=(0, 1),
+                        bet_sizes=(2, 4))
+
+    return GameSpec(ranks, suits, num_players, raise_cap=1)
+
+
+KUHN = GameSpec(ranks=(14, 13, 12), raise_cap=1)
+KUHN_3P = GameSpec(ranks=(14, 13, 12, 11), num_players=3, raise_cap=1)
+LEDUC = GameSpec(ranks=(14, 13, 12), suits=(1, 2), board_cards=(0, 1),
+                 bet_sizes=(2, 4))
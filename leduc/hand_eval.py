@@ -1,10 +1,24 @@
+import numpy as np
+
+
 def kuhn_eval(card, public):
-    return card.rank
+    return card >> 2
 
 def leduc_eval(hole_card, board):
-    cards = [hole_card] + board
+    rank = hole_card >> 2
+    ranks = [card >> 2 for card in board]
+
+    if rank in ranks:
+        return 15*14 + rank
+
+    return 14 * max(rank, *ranks) + min(rank, *ranks)
 
-    if cards.count(hole_card) > 1:
-        return 15*14 + hole_card.rank
+def leduc_scores(holes, boards):
+    """`leduc_eval` over an array of hole card codes and the matching rows
+    of board card codes."""
+    ranks = np.asarray(holes, dtype=np.int64) >> 2
+    board_ranks = np.asarray(boards).reshape(len(ranks), -1) >> 2
+    all_ranks = np.column_stack([ranks, board_ranks])
 
-    return 14 * max(cards).rank + min(cards).rank
+    return np.where((board_ranks == ranks[:, None]).any(axis=1), 15*14 + ranks,
+                    14 * all_ranks.max(axis=1) + all_ranks.min(axis=1))
@@ -0,0 +1,241 @@
+"""Audits logged hands instead of playing them:
+
+    python -m leduc.history OUT_DIR HISTORY...
+
+replays every hand against `blueprint.po` and writes one JSON line per
+decision of the agent's seat. History files hold one hand per line, as
+JSON, `{"id": 7, "cards": ["Ks", "Qh", "As"], "actions": [["C", "2R", "C"],
+["C", "C"]], "agent": 0}`, or as text, `Ks Qh As | C 2R C | C C`.
+"""
+import os
+import sys
+import json
+import time
+
+from copy import copy, deepcopy
+from multiprocessing import Pool
+from leduc.card import Card
+from leduc.game import LEDUC
+from leduc.belief import Beliefs
+from leduc.chance import deal_table
+from leduc.lbr import LocalBestResponse
+from leduc.merge import load
+from leduc.subgame import SubgameCache, fingerprint
+from leduc.search import SEARCH_ITERATIONS
+
+_worker = {}
+
+
+def parse_hand(line, number):
+    """A logged hand, either a JSON object with `cards`, `actions` (a list
+    per round) and optionally `id` and `agent`, or a text line of the cards
+    then each round's actions, e.g. `Ks Qh As | C 2R C | C C`. Raises
+    ValueError when the line isn't one."""
+    line = line.strip()
+    try:
+        if line.startswith('{'):
+            hand = json.loads(line)
+            cards, rounds = hand['cards'], hand['actions']
+            hand_id, agent = hand.get('id', number), hand.get('agent')
+        else:
+            cards, *rounds = line.split('|')
+            cards, rounds = cards.split(), [actions.split() for actions in rounds]
+            hand_id, agent = number, None
+
+        return {'id': hand_id, 'cards': [Card.from_string(card) for card in cards],
+                'actions': [action for actions in rounds for action in actions],
+                'agent': agent}
+    except (KeyError, IndexError, TypeError, AttributeError) as e:
+        raise ValueError(f"Line {number} isn't a hand: {line}") from e
+
+
+def read_lines(path):
+    """Numbered lines of a history file, skipping blank and # lines."""
+    with open(path) as f:
+        for number, line in enumerate(f):
+            if line.strip() and not line.lstrip().startswith('#'):
+                yield number, line
+
+
+def read_hands(path):
+    """Streams the hands of a history file."""
+    for number, line in read_lines(path):
+        yield parse_hand(line, number)
+
+
+class Auditor:
+    """Replays logged hands and reports each decision of the `agent` seat.
+
+    A decision holds the blueprint strategy, the search strategy when
+    `search` is set, and the expected value of the chosen action and of
+    the best one. Values are estimated like `leduc.lbr` does, by playing
+    on with the blueprint over deals drawn from the range the other seats'
+    actions leave, the same deals for every action. Searches run
+    from the start of the round like `Pluribus` and at most `cache_size`
+    solutions are kept, so memory stays bounded however many hands go by.
+    """
+    def __init__(self, node_map, action_map=None, game=LEDUC, agent=0, search=False,
+                 cache_size=256, iterations=SEARCH_ITERATIONS):
+        self.lbr = LocalBestResponse(node_map, game, rollout='blueprint')
+        self.node_map = node_map
+        self.action_map = action_map
+        self.game = game
+        self.agent = agent
+        self.search = search
+        self.iterations = iterations
+        self.cache = SubgameCache(max_size=cache_size)
+        self.version = fingerprint(node_map) if search else None
+
+    @property
+    def table(self):
+        return deal_table(self.game.deck(), self.game.num_cards)
+
+    def decisions(self, hand):
+        """Decisions of the agent in `hand`, raises ValueError when the
+        logged cards or actions aren't a valid hand."""
+        cards = hand['cards']
+        if len(cards) != self.game.num_cards or len(set(cards)) != len(cards) or \
+                not set(cards) <= set(self.game.deck()):
+            raise ValueError(f"Hand {hand['id']} doesn't deal {self.game.num_cards} "
+                             f"distinct cards of the deck: {cards}")
+        agent = self.agent if hand['agent'] is None else hand['agent']
+        if agent not in range(self.game.num_players):
+            raise ValueError(f"Hand {hand['id']} has no seat {agent}")
+
+        state = self.game.new_state(cards)
+        beliefs, root = None, None
+        if self.search:
+            beliefs = Beliefs(self.table, self.game.num_players)
+            root = (deepcopy(state), copy(beliefs))
+
+        decisions = []
+        history = []
+        for action in hand['actions']:
+            if state.terminal:
+                raise ValueError(f"Hand {hand['id']} goes on after it ended")
+            if action not in state.valid_actions():
+                raise ValueError(f"Hand {hand['id']}: {action} isn't valid at "
+                                 f"{state.info_set()}")
+
+            if state.turn == agent:
+                decisions.append(self.decision(hand, state, action, history, root))
+            else:
+                history.append((state, action))
+
+            if self.search:
+                beliefs.observe(state, action, self.lbr.strategy)
+            current = state.round
+            state = state.take(action, deep=True)
+            if self.search and state.round != current and not state.terminal:
+                root = (deepcopy(state), copy(beliefs))
+
+        return decisions
+
+    def decision(self, hand, state, action, history, root):
+        values = self.lbr.action_values(state, state.turn, history)
+        decision = {'hand': hand['id'], 'player': state.turn, 'info_set': state.info_set(),
+                    'action': action,
+                    'blueprint': {a: float(p) for a, p in self.lbr.strategy(state).items()},
+                    'ev': float(values[action]), 'best_ev': float(max(values.values()))}
+        if self.search:
+            decision['search'] = self.search_strategy(state, *root)
+
+        return decision
+
+    def search_strategy(self, state, root, beliefs):
+        from leduc.monte import Search
+
+        key = self.cache.key(root, (), self.version)
+        solution = self.cache.get(key)
+        if solution is None:
+            search = Search(root, self.node_map, self.action_map, self.game.deck(),
+                            self.game.num_cards, iterations=self.iterations,
+                            warm_start=self.cache.nearest(key), beliefs=beliefs)
+            solution = search.search()
+            self.cache.put(key, solution)
+
+        node = solution[state.turn].get(state.info_set())
+        strategy = node.avg_strategy() if node is not None else self.lbr.strategy(state)
+        return {a: float(p) for a, p in strategy.items()}
+
+
+class AuditResult:
+    """Counts of every audited file as (path, hands, decisions, errors)."""
+    def __init__(self, files, seconds):
+        self.files = files
+        self.seconds = seconds
+
+    @property
+    def hands(self):
+        return sum(f[1] for f in self.files)
+
+    @property
+    def decisions(self):
+        return sum(f[2] for f in self.files)
+
+    @property
+    def errors(self):
+        return sum(f[3] for f in self.files)
+
+    def hands_per_second(self):
+        return self.hands / max(self.seconds, 1e-9)
+
+    def __repr__(self):
+        return (f"{self.hands} hands, {self.decisions} decisions and {self.errors} invalid "
+                f"hands in {len(self.files)} files, {self.hands_per_second():.0f} hands/sec")
+
+
+def init_worker(blueprint, kwargs):
+    _worker['auditor'] = Auditor(*load(blueprint), **kwargs)
+
+
+def audit_file(path, out):
+    """Writes the decisions of every hand of `path` to `out` as JSON lines,
+    one hand at a time."""
+    auditor = _worker['auditor']
+    hands = decisions = errors = 0
+    with open(out, 'w') as f:
+        for number, line in read_lines(path):
+            try:
+                records = auditor.decisions(parse_hand(line, number))
+            except ValueError:
+                errors += 1
+                continue
+
+            for record in records:
+                f.write(json.dumps(record) + '\n')
+            hands += 1
+            decisions += len(records)
+
+    return path, hands, decisions, errors
+
+
+def audit_path(path, out_dir):
+    name = os.path.splitext(os.path.basename(path))[0]
+    return os.path.join(out_dir, f'{name}.audit.jsonl')
+
+
+def audit(paths, blueprint, out_dir, workers=1, **kwargs):
+    """Audits every history file of `paths` into `out_dir`, one file per
+    task over `workers` processes. `blueprint` is a (node_map, action_map)
+    pair or a pair of paths to their pickles, `kwargs` go to `Auditor`."""
+    os.makedirs(out_dir, exist_ok=True)
+    tasks = [(path, audit_path(path, out_dir)) for path in paths]
+
+    start = time.perf_counter()
+    if workers == 1:
+        init_worker(blueprint, kwargs)
+        files = [audit_file(*task) for task in tasks]
+    else:
+        with Pool(workers, initializer=init_worker, initargs=(blueprint, kwargs)) as pool:
+            files = pool.starmap(audit_file, tasks, chunksize=1)
+
+    return AuditResult(files, time.perf_counter() - start)
+
+
+if __name__ == '__main__':
+    if len(sys.argv) < 3:
+        print("Usage: python -m leduc.history OUT_DIR HISTORY [HISTORY ...]")
+        sys.exit(1)
+
+    print(audit(sys.argv[2:], ('blueprint.po', 'actions.po'), sys.argv[1], workers=4))
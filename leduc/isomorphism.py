@@ -0,0 +1,60 @@
+import numpy as np
+
+from functools import lru_cache
+from itertools import permutations
+from leduc.card import Card
+
+
+@lru_cache(maxsize=None)
+def canonicalize(cards, suits):
+    """Relabels suits in order of first appearance, so that deals or views
+    that only differ by a permutation of suits map to the same cards."""
+    mapping = {}
+    canonical = []
+    for card in cards:
+        if card.suit not in mapping:
+            mapping[card.suit] = suits[len(mapping)]
+        canonical.append(Card(card.rank, mapping[card.suit]))
+
+    return tuple(canonical)
+
+
+def canonical_view(state, player):
+    cards = (state.cards[player],) + tuple(state.board())
+    return canonicalize(cards, state.spec.suits)
+
+
+def deal_classes(cards, num_cards):
+    """Deals of `num_cards` ordered cards grouped into suit isomorphism
+    classes. Returns one canonical deal per class and the number of deals
+    in each class. Suits are only interchangeable when every suit holds the
+    same ranks, otherwise every deal is its own class."""
+    suits = tuple(sorted({card.suit for card in cards}))
+    ranks = sorted({card.rank for card in cards}, reverse=True)
+
+    if len(cards) != len(suits) * len(ranks) or len(set(cards)) != len(cards):
+        deals = [list(deal) for deal in permutations(cards, num_cards)]
+        return deals, np.ones(len(deals))
+
+    deals, weights = [], []
+    _extend([], 0, 1, ranks, suits, num_cards, deals, weights)
+
+    return deals, np.array(weights, dtype=float)
+
+
+def _extend(deal, used, weight, ranks, suits, num_cards, deals, weights):
+    if len(deal) == num_cards:
+        deals.append(deal)
+        weights.append(weight)
+        return
+
+    for i, suit in enumerate(suits[:used + 1]):
+        new_suit = i == used
+        for rank in ranks:
+            card = Card(rank, suit)
+            if card in deal:
+                continue
+
+            _extend(deal + [card], used + new_suit,
+                    weight * (len(suits) - used if new_suit else 1),
+                    ranks, suits, num_cards, deals, weights)
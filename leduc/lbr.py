@@ -0,0 +1,211 @@
+"""Local best response, for exploitability where exact best response is too
+slow, such as 3+ player games or larger decks. The result of
+`local_best_response` is a lower bound in the units of
+`best_response.exploitability`, with its 95% interval. No deal table is
+built, so a decision costs the same however many deals the game has.
+`python -m leduc.lbr [hands]` runs it on `blueprint.po`.
+"""
+import sys
+import time
+import pickle
+import numpy as np
+
+from copy import copy
+from multiprocessing import Pool
+from leduc.game import LEDUC
+
+ROLLOUTS = ('call', 'blueprint')
+RANGE_SIZE = 100
+NUM_ROLLOUTS = 20
+
+
+def sample_action(strategy, rng):
+    actions = list(strategy)
+    probs = np.array(list(strategy.values()))
+    return actions[rng.choice(len(actions), p=probs / probs.sum())]
+
+
+class LocalBestResponse:
+    """Local best response to a blueprint played by every other seat.
+
+    At each of its decisions the exploiter draws `range_size` holdings of
+    the cards it can't see and weights each by the probability the
+    blueprint gives the opponents' actions so far with those cards. Every
+    action is valued on the same `num_rollouts` deals drawn from that range,
+    by playing one trajectory on with the `rollout` policy, 'call' to check
+    or call down or 'blueprint', against the blueprint. A decision costs the
+    same however many deals the game has, so it runs on 3+ player games and
+    larger decks. Since it's a best response restricted to one decision at
+    a time, what it wins is a lower bound on the exploitability of the
+    blueprint. Every draw comes from `rng`.
+    """
+    def __init__(self, node_map, game=LEDUC, rollout='call', range_size=RANGE_SIZE,
+                 num_rollouts=NUM_ROLLOUTS, seed=None):
+        if rollout not in ROLLOUTS:
+            raise ValueError(f"Unknown rollout {rollout}, choose from {list(ROLLOUTS)}")
+
+        self.node_map = node_map
+        self.game = game
+        self.rollout = rollout
+        self.range_size = range_size
+        self.num_rollouts = num_rollouts
+        self.deck = game.deck()
+        self.rng = np.random.default_rng(seed)
+
+    def strategy(self, state):
+        node = self.node_map[state.turn].get(state.info_set())
+        if node is None:
+            valid_actions = state.valid_actions()
+            return {action: 1 / len(valid_actions) for action in valid_actions}
+
+        return node.avg_strategy()
+
+    def rollout_strategy(self, state, player):
+        if state.turn != player or self.rollout == 'blueprint':
+            return self.strategy(state)
+        return {'C': 1.}
+
+    def rollout_value(self, state, player):
+        """Utility of `player` on one trajectory from `state`, playing the
+        rollout policy against the blueprint."""
+        while not state.terminal:
+            state.take(sample_action(self.rollout_strategy(state, player), self.rng))
+
+        return state.utility()[player]
+
+    def sample_range(self, state, player, history):
+        """`range_size` deals that agree with the cards `player` sees at
+        `state`, and their likelihood given the opponents' `history` of
+        (state, action) pairs."""
+        num_players = self.game.num_players
+        end = num_players + state.spec.board_dealt[state.round]
+        hidden_positions = [p for p in range(num_players) if p != player]
+        hidden_positions += list(range(end, len(state.cards)))
+        seen = {state.cards[player]} | set(state.cards[num_players:end])
+        hidden = [card for card in self.deck if card not in seen]
+
+        deals = []
+        weights = np.ones(self.range_size)
+        for i in range(self.range_size):
+            cards = list(state.cards)
+            drawn = self.rng.choice(len(hidden), len(hidden_positions), replace=False)
+            for position, j in zip(hidden_positions, drawn):
+                cards[position] = hidden[j]
+            deals.append(cards)
+
+            for past, action in history:
+                view = copy(past)
+                view.cards = cards
+                weights[i] *= self.strategy(view).get(action, 0)
+                if weights[i] == 0:
+                    break
+
+        if weights.sum() == 0:
+            weights[:] = 1
+        return deals, weights / weights.sum()
+
+    def action_values(self, state, player, history):
+        """Mean rollout value of each action over deals drawn from the
+        opponents' range."""
+        deals, weights = self.sample_range(state, player, history)
+        drawn = self.rng.choice(len(deals), self.num_rollouts, p=weights)
+        view = copy(state)
+        values = {}
+        for action in state.valid_actions():
+            total = 0
+            for i in drawn:
+                view.cards = deals[i]
+                total += self.rollout_value(view.take(action, deep=True), player)
+            values[action] = total / self.num_rollouts
+
+        return values
+
+    def play(self, deal, player):
+        """What the exploiter in seat `player` wins on `deal`."""
+        state = self.game.new_state(deal)
+        history = []
+        while not state.terminal:
+            if state.turn == player:
+                values = self.action_values(state, player, history)
+                action = max(values, key=values.get)
+            else:
+                action = sample_action(self.strategy(state), self.rng)
+                history.append((state, action))
+            state = state.take(action, deep=True)
+
+        return state.utility()[player]
+
+    def deal(self):
+        drawn = self.rng.choice(len(self.deck), self.game.num_cards, replace=False)
+        return [self.deck[i] for i in drawn]
+
+
+class LbrResult:
+    """Winnings of the exploiter in every seat of `num_deals` sampled deals,
+    a (deals, seats) array, in chips per hand."""
+    def __init__(self, values, seconds):
+        self.values = values
+        self.seconds = seconds
+
+    @property
+    def hands(self):
+        return self.values.size
+
+    def seat_values(self):
+        return self.values.mean(axis=0)
+
+    def exploitability(self):
+        """Mean over seats of what the exploiter wins, comparable to
+        `leduc.best_response.exploitability`."""
+        return self.values.mean()
+
+    def confidence(self, z=1.96):
+        """Half width of the confidence interval of `exploitability`. Seats
+        of the same deal are averaged first since they aren't independent."""
+        per_deal = self.values.mean(axis=1)
+        if len(per_deal) < 2:
+            return np.inf
+
+        return z * per_deal.std(ddof=1) / np.sqrt(len(per_deal))
+
+    def __repr__(self):
+        seats = ', '.join(f'{value:+.3f}' for value in self.seat_values())
+        return (f"exploitability >= {self.exploitability():.3f} +/- {self.confidence():.3f} "
+                f"chips/hand (seats {seats})\n"
+                f"{self.hands} hands, {self.hands / self.seconds:.0f} hands/sec")
+
+
+def lbr_worker(lbr, num_deals, seed):
+    lbr.rng = np.random.default_rng(seed)
+    deals = [lbr.deal() for _ in range(num_deals)]
+    return np.array([[lbr.play(deal, player) for player in range(lbr.game.num_players)]
+                     for deal in deals])
+
+
+def local_best_response(node_map, hands, game=LEDUC, rollout='call', workers=1,
+                        seed=None, range_size=RANGE_SIZE, num_rollouts=NUM_ROLLOUTS):
+    """Plays the exploiter against `node_map` in every seat of `hands`
+    sampled deals, split over `workers` processes."""
+    lbr = LocalBestResponse(node_map, game, rollout, range_size, num_rollouts)
+    seeds = np.random.SeedSequence(seed).generate_state(workers)
+    splits = [len(split) for split in np.array_split(np.arange(hands), workers)]
+
+    start = time.perf_counter()
+    if workers == 1:
+        values = lbr_worker(lbr, hands, seeds[0])
+    else:
+        with Pool(workers) as pool:
+            values = np.concatenate(pool.starmap(lbr_worker, [
+                (lbr, n, s) for n, s in zip(splits, seeds) if n > 0]))
+
+    return LbrResult(values, time.perf_counter() - start)
+
+
+if __name__ == '__main__':
+    hands = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+
+    with open('blueprint.po', 'rb') as f:
+        node_map = pickle.load(f)
+
+    for rollout in ROLLOUTS:
+        print(rollout, local_best_response(node_map, hands, rollout=rollout, workers=4))
@@ -0,0 +1,278 @@
+"""Plays policies against each other without prompts.
+`python -m leduc.match [hands]` pits the blueprint against uniform random
+and always-call opponents. `play_match` plays every deal once per seating,
+batches each policy's decisions across tables, can spread the deals over
+worker processes and reports mbb/hand with 95% confidence intervals and
+hands/sec. With `aivat=Aivat(node_map, game)` and `known=[i]`, `i` being
+the seat playing that blueprint, the win rates are AIVAT corrected.
+"""
+import sys
+import time
+import pickle
+import numpy as np
+
+from itertools import permutations
+from multiprocessing import Pool
+from leduc.game import LEDUC
+from leduc.chance import deal_table
+from leduc.policy import PolicyTable, state_key
+from leduc.aivat import Aivat
+
+
+class Policy:
+    """Plays many tables at once. `strategy` returns an action vocabulary
+    and an N x A matrix of probabilities for N states, invalid actions are
+    masked out by `act`."""
+    name = None
+
+    def strategy(self, states):
+        raise NotImplementedError
+
+    def act(self, states):
+        actions, probs = self.strategy(states)
+        valid_actions = [state.valid_actions() for state in states]
+        valid = np.array([[a in valid for a in actions] for valid in valid_actions],
+                         dtype=bool).reshape(probs.shape)
+        probs = np.where(valid, probs, 0)
+
+        cumulative = probs.cumsum(axis=1)
+        threshold = np.random.random((len(states), 1)) * cumulative[:, -1:]
+        choice = (cumulative <= threshold).sum(axis=1)
+
+        # fall back to uniform where the policy has nothing for a state
+        return [actions[c] if c < len(actions) else
+                valid[np.random.randint(len(valid))]
+                for c, valid in zip(choice, valid_actions)]
+
+    def __repr__(self):
+        return self.name
+
+
+class UniformPolicy(Policy):
+    name = 'uniform'
+    actions = ['F', 'C', '1R', '2R', '4R']
+
+    def strategy(self, states):
+        return self.actions, np.ones((len(states), len(self.actions)))
+
+
+class CallPolicy(Policy):
+    name = 'call'
+
+    def strategy(self, states):
+        return ['C'], np.ones((len(states), 1))
+
+
+class BlueprintPolicy(Policy):
+    name = 'blueprint'
+
+    def __init__(self, blueprint):
+        if not isinstance(blueprint, PolicyTable):
+            blueprint = PolicyTable.from_blueprint(blueprint)
+        self.table = blueprint
+
+    def strategy(self, states):
+        return self.table.actions, self.table.lookup([state_key(s) for s in states])
+
+
+class ServerPolicy(Policy):
+    """Blueprint served by a `leduc.server.PolicyServer`."""
+    name = 'server'
+
+    def __init__(self, address, authkey):
+        self.address = address
+        self.authkey = authkey
+        self.client = None
+
+    def strategy(self, states):
+        if self.client is None:
+            from leduc.server import PolicyClient
+            self.client = PolicyClient(self.address, self.authkey)
+
+        return self.client.actions, self.client.strategy_states([(s, None) for s in states])
+
+    def __getstate__(self):
+        return {'address': self.address, 'authkey': self.authkey, 'client': None}
+
+
+class SearchPolicy(Policy):
+    """Blueprint refined by subgame search. One search is run per public
+    state and reused by every table and private card that reaches it."""
+    name = 'search'
+
+    def __init__(self, blueprint, action_map, game=LEDUC, sampler='external'):
+        self.blueprint = blueprint
+        self.action_map = action_map
+        self.game = game
+        self.sampler = sampler
+        self.searched = {}
+
+    def strategy(self, states):
+        from leduc.monte import Search
+
+        actions = ['F', 'C'] + [f'{size}R' for size in sorted(set(self.game.bet_sizes))]
+        probs = np.zeros((len(states), len(actions)))
+        for i, state in enumerate(states):
+            public = str(state.history)
+            if public not in self.searched:
+                search = Search(state, self.blueprint, self.action_map, self.game.deck(),
+                                self.game.num_cards, sampler=self.sampler)
+                self.searched[public] = search.search()
+
+            node = self.searched[public][state.turn].get(state.info_set())
+            if node is not None:
+                for action, prob in node.avg_strategy().items():
+                    if action in actions:
+                        probs[i, actions.index(action)] = prob
+
+        return actions, probs
+
+
+class MatchResult:
+    """Payoffs of every hand of a match as a (deals, seatings, policies)
+    array. Every deal is replayed once per seating of the policies, win
+    rates are in milli big blinds per hand with the ante as the big blind.
+    With `corrected` payoffs (see `leduc.aivat`) win rates and confidence
+    intervals are computed from those instead of the raw payoffs."""
+    def __init__(self, policies, payoffs, seconds, ante=1, corrected=None):
+        self.policies = policies
+        self.raw = payoffs
+        self.payoffs = payoffs if corrected is None else corrected
+        self.seconds = seconds
+        self.ante = ante
+
+    @property
+    def hands(self):
+        return self.payoffs.shape[0] * self.payoffs.shape[1]
+
+    def hands_per_second(self):
+        return self.hands / self.seconds
+
+    def win_rate(self):
+        return 1000 * self.payoffs.mean(axis=(0, 1)) / self.ante
+
+    def variance(self, raw=False):
+        """Variance of the win rate of a deal. Seatings of the same deal are
+        averaged first since they aren't independent."""
+        payoffs = self.raw if raw else self.payoffs
+        per_deal = 1000 * payoffs.mean(axis=1) / self.ante
+        if len(per_deal) < 2:
+            return np.full(len(self.policies), np.inf)
+
+        return per_deal.var(axis=0, ddof=1)
+
+    def confidence(self, z=1.96):
+        """Half width of the confidence interval of `win_rate`."""
+        return z * np.sqrt(self.variance() / self.payoffs.shape[0])
+
+    def __repr__(self):
+        rows = [f'{policy}: {rate:+.1f} +/- {ci:.1f} mbb/hand' for policy, rate, ci in
+                zip(self.policies, self.win_rate(), self.confidence())]
+        rows.append(f'{self.hands} hands, {self.hands_per_second():.0f} hands/sec')
+        if self.payoffs is not self.raw:
+            reduction = self.variance(raw=True).sum() / max(self.variance().sum(), 1e-12)
+            rows.append(f'variance reduced {reduction:.1f}x')
+
+        return '\n'.join(rows)
+
+
+def play_tables(policies, game, deals, aivat=None, known=()):
+    """Plays every seating of `policies` on each deal, one table per hand,
+    querying each policy once per step for all the tables waiting on it.
+    Returns the raw payoffs and the payoffs corrected by `aivat`, where
+    `known` are the policies playing its blueprint."""
+    seatings = list(permutations(range(len(policies))))
+    states, seats = [], []
+    for deal in deals:
+        for seating in seatings:
+            states.append(game.new_state(deal))
+            seats.append(seating)
+
+    active = [i for i, state in enumerate(states) if not state.terminal]
+    while active:
+        for p, policy in enumerate(policies):
+            waiting = [i for i in active if seats[i][states[i].turn] == p]
+            if not waiting:
+                continue
+
+            actions = policy.act([states[i] for i in waiting])
+            for i, action in zip(waiting, actions):
+                states[i].take(action)
+
+        active = [i for i in active if not states[i].terminal]
+
+    payoffs = np.zeros((len(deals), len(seatings), len(policies)))
+    corrected = np.zeros(payoffs.shape)
+    for i, (state, seating) in enumerate(zip(states, seats)):
+        utility = state.utility()
+        if aivat is not None:
+            known_seats = [seat for seat, p in enumerate(seating) if p in known]
+            corrected_utility = aivat.correct(state, known_seats)
+        else:
+            corrected_utility = utility
+
+        for seat, p in enumerate(seating):
+            payoffs[i // len(seatings), i % len(seatings), p] = utility[seat]
+            corrected[i // len(seatings), i % len(seatings), p] = corrected_utility[seat]
+
+    return payoffs, corrected
+
+
+def play_worker(policies, game, num_deals, tables, seed, aivat=None, known=()):
+    np.random.seed(seed)
+    table = deal_table(game.deck(), game.num_cards)
+    num_seatings = len(list(permutations(range(len(policies)))))
+    per_batch = max(tables // num_seatings, 1)
+
+    payoffs, corrected = [], []
+    for start in range(0, num_deals, per_batch):
+        index = table.sample(min(per_batch, num_deals - start))
+        raw, fixed = play_tables(policies, game, [table.hand(i) for i in index],
+                                 aivat, known)
+        payoffs.append(raw)
+        corrected.append(fixed)
+
+    return np.concatenate(payoffs), np.concatenate(corrected)
+
+
+def play_match(policies, hands, game=LEDUC, tables=512, workers=1, seed=None,
+               aivat=None, known=()):
+    """Plays at least `hands` hands between `policies`, one per seat of
+    `game`, over `tables` concurrent tables in each of `workers` processes.
+    Pass an `Aivat` evaluator and the indices of the policies playing its
+    blueprint to report variance reduced win rates."""
+    if len(policies) != game.num_players:
+        raise ValueError(f"{game.num_players} players need as many policies, "
+                         f"got {len(policies)}")
+
+    num_seatings = len(list(permutations(range(len(policies)))))
+    num_deals = -(-hands // num_seatings)
+    seeds = np.random.SeedSequence(seed).generate_state(workers)
+    splits = [len(split) for split in np.array_split(np.arange(num_deals), workers)]
+
+    start = time.perf_counter()
+    if workers == 1:
+        payoffs, corrected = play_worker(policies, game, num_deals, tables, seeds[0],
+                                         aivat, known)
+    else:
+        with Pool(workers) as pool:
+            results = pool.starmap(play_worker, [
+                (policies, game, n, tables, s, aivat, known)
+                for n, s in zip(splits, seeds) if n > 0])
+        payoffs = np.concatenate([raw for raw, _ in results])
+        corrected = np.concatenate([fixed for _, fixed in results])
+
+    return MatchResult(policies, payoffs, time.perf_counter() - start, game.ante,
+                       corrected if aivat is not None else None)
+
+
+if __name__ == '__main__':
+    hands = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+
+    with open('blueprint.po', 'rb') as f:
+        node_map = pickle.load(f)
+
+    blueprint = BlueprintPolicy(node_map)
+    aivat = Aivat(node_map)
+    for opponent in [UniformPolicy(), CallPolicy()]:
+        print(play_match([blueprint, opponent], hands, workers=4, aivat=aivat, known=[0]))
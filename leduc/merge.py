@@ -0,0 +1,101 @@
+"""Combines blueprints trained separately by adding up their regret and
+strategy sums. `python -m leduc.merge OUT_DIR RUN_DIR...` merges the
+`blueprint.po`/`actions.po` files that `search.py` writes in each run
+directory.
+"""
+import os
+import sys
+import pickle
+
+from leduc.node import Node, MNode
+from leduc.checkpoint import write_atomic
+
+
+def merge_nodes(existing, node, weight=1):
+    """Node holding the sums of `existing` plus `weight` times those of
+    `node` over the union of their actions."""
+    node_type = MNode if isinstance(existing if existing is not None else node, MNode) else Node
+    if existing is None:
+        actions = list(node.actions)
+        regret_sum, strategy_sum = {}, {}
+    else:
+        actions = list(existing.actions) + [a for a in node.actions if a not in existing.actions]
+        regret_sum = dict(existing.regret_sum.items())
+        strategy_sum = dict(existing.strategy_sum.items())
+
+    merged = node_type(actions)
+    merged.regret_sum = {a: regret_sum.get(a, 0) + weight * node.regret_sum.get(a, 0)
+                         for a in actions}
+    merged.strategy_sum = {a: strategy_sum.get(a, 0) + weight * node.strategy_sum.get(a, 0)
+                           for a in actions}
+    return merged
+
+
+def entry_actions(entry):
+    """Actions of an `action_map` entry, a plain list as `leduc.vanilla`
+    stores them or a dict with an 'actions' key as `leduc.monte` does."""
+    return entry if isinstance(entry, list) else entry['actions']
+
+
+def merge_into(node_map, action_map, other_nodes, other_actions, weight=1):
+    """Adds `weight` times one blueprint into `node_map` and `action_map` in
+    place. Info sets are unioned and so are the actions of each one, new
+    entries keep the shape they were stored in."""
+    for player, nodes in other_nodes.items():
+        target = node_map.setdefault(player, {})
+        for info_set, node in nodes.items():
+            target[info_set] = merge_nodes(target.get(info_set), node, weight)
+
+    for player, entries in other_actions.items():
+        target = action_map.setdefault(player, {})
+        for info_set, entry in entries.items():
+            if info_set not in target:
+                target[info_set] = (list(entry) if isinstance(entry, list)
+                                    else dict(entry, actions=list(entry['actions'])))
+                continue
+
+            actions = entry_actions(target[info_set])
+            actions.extend(a for a in entry_actions(entry) if a not in actions)
+
+
+def load(blueprint):
+    if isinstance(blueprint[0], str):
+        with open(blueprint[0], 'rb') as f:
+            node_map = pickle.load(f)
+        with open(blueprint[1], 'rb') as f:
+            action_map = pickle.load(f)
+        return node_map, action_map
+
+    return blueprint
+
+
+def merge(blueprints, weights=None, node_map=None, action_map=None):
+    """Merges (node_map, action_map) pairs, or pairs of paths to pickles
+    like the ones `search.py` writes, weighting the sums of the k-th by
+    `weights[k]`. Inputs are loaded one at a time and may come from a
+    generator, so only the merged blueprint and one input are in memory;
+    pass `leduc.store.regret_stores` as `node_map` to bound that too."""
+    node_map = {} if node_map is None else node_map
+    action_map = {} if action_map is None else action_map
+    for k, blueprint in enumerate(blueprints):
+        other_nodes, other_actions = load(blueprint)
+        weight = 1 if weights is None else weights[k]
+        merge_into(node_map, action_map, other_nodes, other_actions, weight)
+        del other_nodes, other_actions
+
+    return node_map, action_map
+
+
+if __name__ == '__main__':
+    if len(sys.argv) < 3:
+        print("Usage: python -m leduc.merge OUT_DIR RUN_DIR [RUN_DIR ...]")
+        sys.exit(1)
+
+    out, runs = sys.argv[1], sys.argv[2:]
+    os.makedirs(out, exist_ok=True)
+    node_map, action_map = merge((os.path.join(run, 'blueprint.po'),
+                                  os.path.join(run, 'actions.po')) for run in runs)
+    write_atomic(os.path.join(out, 'blueprint.po'), node_map)
+    write_atomic(os.path.join(out, 'actions.po'), action_map)
+    print(f"Merged {len(runs)} runs into {sum(len(nodes) for nodes in node_map.values())} "
+          f"info sets in {out}")
@@ -3,58 +3,96 @@ import json
 import numpy as np
 
 from copy import deepcopy
-from itertools import permutations
 from tqdm import tqdm
 from leduc.best_response import exploitability
 from leduc.node import MNode as Node
-from leduc.card import Card
 from leduc.hand_eval import leduc_eval
 from leduc.util import expected_utility, bias
+from leduc.sampling import ExternalSampler, get_sampler
+from leduc.game import game_for, LEDUC
+from leduc.isomorphism import canonical_view, canonicalize
+from leduc.chance import deal_table
+from leduc.subgame import public_history, extends, root_history, subgame
 
 STRAT_INTERVAL = 100
 PRUNE_THRESH = 200
 DISCOUNT = 10
 LCFR_INTERVAL = 400
-REGRET_MIN = -300000
-
-
-def learn(iterations, cards, num_cards, node_map, action_map):
-    if len(cards) > 4:
-        from leduc.state import Leduc as State
-        from leduc.hand_eval import leduc_eval as eval
-    else:
-        from leduc.state import State
-        from leduc.hand_eval import kuhn_eval as eval
-
-    all_combos = [list(t) for t in set(permutations(cards, num_cards))]
+CONTINUATIONS = ["NULL", "F", "C", "4R"]
+
+
+def learn(iterations, cards, num_cards, node_map, action_map,
+          sampler='external', game=None, backend='python', checkpoint=None):
+    """Runs `iterations` of MCCFR with `sampler` over the deals of `cards`
+    and returns the sampler. `backend='numba'` runs external sampling on
+    flat arrays, see `leduc.flat`. A `checkpoint` writes the maps every
+    `checkpoint.every` iterations and at the end, see `leduc.checkpoint`,
+    and `node_map` may hold a `leduc.store.RegretStore` per player."""
+    if game is None:
+        game = game_for(cards, len(node_map))
+
+    sampler = get_sampler(sampler)
+    if backend == 'numba':
+        if sampler.name != 'external':
+            raise ValueError("The numba backend only runs external sampling")
+
+        from leduc.flat import learn_external
+        learn_external(iterations, cards, num_cards, node_map, action_map,
+                       game, sampler)
+        if checkpoint is not None:
+            checkpoint.save(node_map, action_map, iterations)
+            checkpoint.wait()
+        return sampler
+    elif backend != 'python':
+        raise ValueError(f"Unknown backend {backend}, choose from ['python', 'numba']")
+
+    table = deal_table(cards, num_cards)
     num_players = len(node_map)
     for i in tqdm(range(1, iterations + 1), desc="learning"):
-        card = np.random.choice(len(all_combos))
-        for player in range(num_players):
-            state = State(all_combos[card], num_players, eval)
-            if i % STRAT_INTERVAL == 0:
-                update_strategy(player, state, node_map, action_map)
-
-            if i > PRUNE_THRESH:
-                chance = np.random.rand()
-                if chance < .05:
-                    accumulate_regrets(player, state, node_map, action_map)
+        for deal in sampler.deals(table, num_players):
+            for player in range(num_players):
+                state = game.new_state(deal)
+                if i % STRAT_INTERVAL == 0:
+                    update_strategy(player, state, node_map, action_map)
+
+                if i > PRUNE_THRESH:
+                    chance = np.random.rand()
+                    if chance < .05:
+                        sampler.accumulate_regrets(player, state, node_map,
+                                                   action_map)
+                    else:
+                        sampler.accumulate_regrets(player, state, node_map,
+                                                   action_map, prune=True)
                 else:
-                    accumulate_regrets(player, state, node_map, action_map,
-                                       prune=True)
-            else:
-                accumulate_regrets(player, state, node_map, action_map)
+                    sampler.accumulate_regrets(player, state, node_map,
+                                               action_map)
+        sampler.iterations += 1
 
         if i < LCFR_INTERVAL and i % DISCOUNT == 0:
             discounted = (i/DISCOUNT)/(i/(DISCOUNT) + 1)
             for player in node_map:
                 player_nodes = node_map[player]
+                if hasattr(player_nodes, 'scale'):
+                    player_nodes.scale(discounted)
+                    continue
+
                 for key, node in player_nodes.items():
                     node.regret_sum = {key: value * discounted for
                                        key, value in node.regret_sum.items()}
                     node.strategy_sum = {key: value * discounted for
                                          key, value in node.strategy_sum.items()}
 
+        if checkpoint is not None and i % checkpoint.every == 0:
+            checkpoint.save(node_map, action_map, i)
+
+    if checkpoint is not None:
+        if checkpoint.iteration != iterations:
+            checkpoint.wait()
+            checkpoint.save(node_map, action_map, iterations)
+        checkpoint.wait()
+
+    return sampler
+
 
 def update_strategy(traverser, state, node_map, action_map):
     if state.terminal:
@@ -90,56 +128,18 @@ def update_strategy(traverser, state, node_map, action_map):
 
 
 def accumulate_regrets(traverser, state, node_map, action_map, prune=False):
-    if state.terminal:
-        util = state.utility()
-        return util
-
-    turn = state.turn
-    info_set = state.info_set()
-
-    if info_set not in action_map[turn]:
-        action_map[turn][info_set] = {'actions': state.valid_actions()}
-
-    valid_actions = action_map[turn][info_set]['actions']
+    return ExternalSampler().accumulate_regrets(traverser, state, node_map,
+                                                action_map, prune=prune)
 
-    if info_set not in node_map[turn]:
-        node_map[turn][info_set] = Node(valid_actions)
-
-    node = node_map[turn][info_set]
-    strategy = node.strategy()
-
-    if turn == traverser:
-        util = {a: 0 for a in valid_actions}
-        node_util = np.zeros(len(node_map))
-        explored = set(valid_actions)
-
-        for action in valid_actions:
-            if prune is True and node.regret_sum[action] <= REGRET_MIN:
-                explored.remove(action)
-            else:
-                new_state = state.take(action, deep=True)
-                returned = accumulate_regrets(traverser, new_state, node_map,
-                                              action_map, prune=prune)
-
-                util[action] = returned[turn]
-                node_util += returned * strategy[action]
-
-        for action in explored:
-            regret = util[action] - node_util[turn]
-            node.regret_sum[action] += regret
-
-        return node_util
-
-    else:
-        actions = list(strategy.keys())
-        probs = list(strategy.values())
-        random_action = actions[np.random.choice(len(actions), p=probs)]
-        new_state = state.take(random_action, deep=True)
-        return accumulate_regrets(traverser, new_state, node_map, action_map,
-                                  prune=prune)
 
 class Search:
-    def __init__(self, state, blueprint, actions, cards, num_cards):                                  
+    """Re-solves the subgame below `state` against the blueprint and returns
+    its nodes. A `warm_start` solution below the same root seeds the nodes,
+    and a seeded search runs `warm_iterations`. Deals are drawn from
+    `beliefs` if given, else by `sampler`."""
+    def __init__(self, state, blueprint, actions, cards, num_cards,
+                 sampler='external', iterations=1000, warm_start=None, beliefs=None,
+                 warm_iterations=None):
         self.blueprint = blueprint
         self.action_map = actions
         self.cards = cards
@@ -147,32 +147,51 @@ class Search:
         self.num_players = len(blueprint)
 
         self.state = state
-        self.all_combos = [list(t) for t in set(permutations(self.cards, self.num_cards))]
+        self.table = deal_table(self.cards, self.num_cards)
+        self.consistent = {}
+        self.scheme = sampler
+        self.sampler = None
+        self.iterations = iterations
+        self.warm_start = warm_start
+        self.warm_iterations = warm_iterations
+        self.beliefs = beliefs
 
     def search(self):
 
         starting_state = deepcopy(self.state)
-        node_map = deepcopy(self.blueprint)
+        node_map = deepcopy(subgame(self.blueprint, root_history(self.state)))
         action_map = deepcopy(self.action_map)
+        iterations = self.iterations
+        if self.warm_start is not None and self.seed(node_map, action_map):
+            if self.warm_iterations is not None:
+                iterations = self.warm_iterations
+        self.widen(node_map, action_map)
 
         continuations = {i: {} for i in range(len(node_map))}
+        self.sampler = get_sampler(self.scheme)
 
-        for i in tqdm(range(1, 1001), desc="searching"):
-            card_choice = np.random.choice(len(self.all_combos))
-            starting_state.cards = self.all_combos[card_choice]
-            for player in range(self.num_players):
-                if i % STRAT_INTERVAL == 0:
-                    self.update_strategy_search(player, starting_state, node_map, action_map, continuations)
-
-                if i > PRUNE_THRESH:
-                    chance = np.random.rand()
-                    if chance < .05:
-                        self.accumulate_regrets_search(player, starting_state, node_map, action_map, continuations)
+        for i in tqdm(range(1, iterations + 1), desc="searching"):
+            if self.beliefs is None:
+                deals = self.sampler.deals(self.table, self.num_players)
+            else:
+                deals = [self.beliefs.sample()]
+
+            for deal in deals:
+                starting_state.cards = deal
+                for player in range(self.num_players):
+                    if i % STRAT_INTERVAL == 0:
+                        self.update_strategy_search(player, starting_state, node_map, action_map, continuations)
+
+                    if i > PRUNE_THRESH:
+                        chance = np.random.rand()
+                        if chance < .05:
+                            self.accumulate_regrets_search(player, starting_state, node_map, action_map, continuations)
+                        else:
+                            self.accumulate_regrets_search(player, starting_state, node_map, action_map,
+                                                           continuations, prune=True)
                     else:
-                        self.accumulate_regrets_search(player, starting_state, node_map, action_map,
-                                                       continuations, prune=True)
-                else:
-                    self.accumulate_regrets_search(player, starting_state, node_map, action_map, continuations)
+                        self.accumulate_regrets_search(player, starting_state, node_map, action_map, continuations)
+            self.sampler.iterations += 1
 
             if i < LCFR_INTERVAL and i % DISCOUNT == 0:
                 discounted = (i/DISCOUNT)/(i/(DISCOUNT) + 1)
@@ -185,6 +204,34 @@ class Search:
                                             key, value in node.strategy_sum.items()}
         return node_map 
 
+    def widen(self, node_map, action_map):
+        """Gives copied nodes the actions injected into `action_map` since
+        they were trained."""
+        for player, nodes in node_map.items():
+            for info_set, node in nodes.items():
+                valid_actions = action_map[player].get(info_set, {}).get('actions')
+                if valid_actions is None:
+                    continue
+
+                node.actions = list(valid_actions)
+                for action in valid_actions:
+                    node.regret_sum.setdefault(action, 0)
+                    node.strategy_sum.setdefault(action, 0)
+
+    def seed(self, node_map, action_map):
+        """Copies the matching `warm_start` nodes into `node_map` and returns
+        how many were copied."""
+        root = root_history(self.state)
+        seeded = 0
+        for player, nodes in self.warm_start.items():
+            for info_set, node in nodes.items():
+                valid_actions = action_map[player].get(info_set, {}).get('actions')
+                if (valid_actions is not None and set(valid_actions) == set(node.actions)
+                        and extends(public_history(info_set), root)):
+                    node_map[player][info_set] = deepcopy(node)
+                    seeded += 1
+        return seeded
+
 
     def update_strategy_search(self, traverser, state, node_map, action_map, continuation, leaf=False):
         if state.terminal:
@@ -200,7 +247,7 @@ class Search:
 
         if leaf is True:
             if info_set not in continuation[turn]:
-                continuation[turn][info_set] = Node([i for i in range(4)])
+                continuation[turn][info_set] = Node(CONTINUATIONS)
 
             node = continuation[turn][info_set]
         else:
@@ -216,9 +263,9 @@ class Search:
             probs = list(strategy.values())
             random_action = actions[np.random.choice(len(actions), p=probs)]
             node.strategy_sum[random_action] += 1
-            new_state = state.take(random_action, deep=True)
 
             if leaf is False:
+                new_state = state.take(random_action, deep=True)
                 self.update_strategy_search(traverser, new_state, node_map, action_map, continuation,
                                     leaf=new_state.round!=state.round)
 
@@ -231,69 +278,45 @@ class Search:
 
 
     def accumulate_regrets_search(self, traverser, state, node_map, action_map, continuations, prune=False, leaf=False):
-        if state.terminal:
-            util = state.utility()
-            return util
+        if leaf is True and not state.terminal:
+            return self.leaf_value(traverser, state, action_map, continuations)
+
+        self.sampler = get_sampler(self.sampler or self.scheme,
+                                   leaf=lambda traverser, state: self.leaf_value(
+                                       traverser, state, action_map, continuations))
 
+        return self.sampler.accumulate_regrets(traverser, state, node_map, action_map,
+                                               prune=prune)
+
+    def leaf_value(self, traverser, state, action_map, continuations):
         turn = state.turn
         info_set = state.info_set()
 
         if info_set not in action_map[turn]:
             action_map[turn][info_set] = {'actions': state.valid_actions()}
 
-        valid_actions = action_map[turn][info_set]['actions']
-        if 'fixed' in valid_actions:
-            valid_actions = [action_map[turn][info_set]['fixed']]
+        if info_set not in continuations[turn]:
+            continuations[turn][info_set] = Node(CONTINUATIONS)
 
-        if leaf is True:
-            if info_set not in continuations[turn]:
-                continuations[turn][info_set] = Node(["NULL", "F", "C", "4R"])
-
-            node = continuations[turn][info_set]
-            valid_actions = ["NULL", "F", "C", "4R"]
-        else:
-            if info_set not in node_map[turn]:
-                node_map[turn][info_set] = Node(valid_actions)
-
-            node = node_map[turn][info_set]
+        if turn != traverser:
+            return self.rollout(traverser, state, "NULL")
 
+        node = continuations[turn][info_set]
         strategy = node.strategy()
 
-        if turn == traverser:
-            util = {a: 0 for a in valid_actions}
-            node_util = np.zeros(len(node_map))
-            explored = set(valid_actions)
-
-            for action in valid_actions:
-                if prune is True and leaf is False and node.regret_sum[action] <= REGRET_MIN:
-                    explored.remove(action)
-                else:
-                    if leaf is True:
-                        returned = self.rollout(traverser, state, action)
-                    else:
-                        new_state = state.take(action, deep=True)
-                        returned = self.accumulate_regrets_search(traverser, new_state, node_map, action_map, continuations,
-                                                                  prune=prune, leaf=new_state.round!=state.round) 
-                    util[action] = returned[turn]
-                    node_util += returned * strategy[action]
-
-            for action in explored:
-                regret = util[action] - node_util[turn]
-                node.regret_sum[action] += regret
+        util = {a: 0 for a in CONTINUATIONS}
+        node_util = np.zeros(len(continuations))
+        for action in CONTINUATIONS:
+            returned = self.rollout(traverser, state, action)
+            util[action] = returned[turn]
+            node_util += returned * strategy[action]
 
-            return node_util
+        for action in CONTINUATIONS:
+            regret = util[action] - node_util[turn]
+            node.regret_sum[action] += regret
 
-        else:
-            if leaf is True:
-                return self.rollout(traverser, state, "NULL") 
+        return node_util
 
-                
-            actions = list(strategy.keys())
-            probs = list(strategy.values())
-            random_action = actions[np.random.choice(len(actions), p=probs)]
-            new_state = state.take(random_action, deep=True)
-            return self.accumulate_regrets_search(traverser, new_state, node_map, action_map, continuations,
-                                                  prune=prune, leaf=new_state.round!=state.round)
     def rollout(self, player, state, contin_strat):
         node_map = self.blueprint
         action_map = self.action_map
@@ -301,17 +324,33 @@ class Search:
         util = np.zeros(len(node_map))
         starting_state = deepcopy(state)
 
-        indistinguishable_states = [combo for combo in self.all_combos if combo[player] == state.cards[player]] 
+        indistinguishable_states, probs = self.consistent_deals(player, state)
 
         num_rollouts = 5
         for _ in range(num_rollouts):
-            card_choice = np.random.choice(len(indistinguishable_states))
+            card_choice = np.random.choice(len(indistinguishable_states), p=probs)
             starting_state.cards = indistinguishable_states[card_choice]
 
             util += self.playout(player, contin_strat, starting_state, node_map, action_map)
 
         return util / num_rollouts
 
+    def consistent_deals(self, player, state):
+        view = canonical_view(state, player)
+        key = (player, view)
+        if key not in self.consistent:
+            start = self.num_players
+            end = start + len(view) - 1
+            suits = state.spec.suits
+            deals, weights, _ = self.table.classes()
+            index = [i for i, deal in enumerate(deals) if
+                     canonicalize((deal[player],) + tuple(deal[start:end]), suits) == view]
+            weights = weights[index]
+            self.consistent[key] = ([deals[i] for i in index],
+                                    weights / weights.sum())
+
+        return self.consistent[key]
+
     def playout(self, player, contin_strat, hand, node_map, action_map):
         if hand.terminal:
             utility = hand.utility()
@@ -337,8 +376,8 @@ if __name__ == '__main__':
     num_players = 2
     node_map = {i: {} for i in range(num_players)}
     action_map = {i: {} for i in range(num_players)}
-    cards = [Card(14, 1), Card(13, 1), Card(12, 1), Card(14, 2), Card(13, 2), Card(12, 2)]
-    learn(50000, cards, 3, node_map, action_map)
+    cards = LEDUC.deck()
+    learn(50000, cards, 3, node_map, action_map, game=LEDUC)
 
     for player in node_map:
         print(f"Player {player}")
@@ -348,5 +387,5 @@ if __name__ == '__main__':
             print(f"{info_set}: {avg_strat}")
         
 
-    util = expected_utility(cards, 3, 2, node_map, action_map)
+    util = expected_utility(cards, 3, 2, node_map, action_map, game=LEDUC)
     print(util)
\ No newline at end of file
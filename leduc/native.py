@@ -0,0 +1,88 @@
+"""The C++ MCCFR trainer in cfr/, bound with pybind11 and compiled by
+cppimport on first use. cfr/State.cpp plays the `GameSpec` rules, so
+`node_maps` turns the trained nodes into a blueprint for `Search`,
+`Pluribus` or `PolicyTable` covering every info set.
+`python -m leduc.bench_native [iterations]` trains the same game with it
+and both Python backends.
+"""
+import os
+import sys
+
+from leduc.node import MNode
+from leduc.game import LEDUC
+from leduc.chance import deal_table
+from leduc.hand_eval import kuhn_eval, leduc_eval
+
+# F, C, then the raise, as `GameState.valid_actions` lists them
+ACTION_ORDER = {'F': 0, 'C': 1}
+CFR_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'cfr')
+
+
+def load_extension():
+    """Imports the binding of the C++ trainer in cfr/, compiling it with
+    cppimport the first time or whenever its sources change."""
+    import cppimport
+    if CFR_DIR not in sys.path:
+        sys.path.append(CFR_DIR)
+    return cppimport.imp_from_filepath(os.path.join(CFR_DIR, '_cfr.cpp'), '_cfr')
+
+
+def cpp_spec(game=LEDUC):
+    """`game` as the `GameSpec` of the C++ engine, which only knows the
+    `kuhn_eval` and `leduc_eval` hand evaluators."""
+    evals = {kuhn_eval: 'kuhn', leduc_eval: 'leduc'}
+    if game.hand_eval not in evals:
+        raise ValueError(f"The C++ engine has no {game.hand_eval.__name__}")
+
+    return load_extension().GameSpec(list(game.ranks), list(game.suits), game.num_players,
+                                     list(game.board_cards), list(game.bet_sizes),
+                                     game.raise_cap, game.ante, evals[game.hand_eval])
+
+
+def train(iterations, game=LEDUC):
+    trainer = load_extension().MCCFRTrainer(cpp_spec(game))
+    trainer.train(iterations)
+    return trainer
+
+
+def info_set_states(game=LEDUC):
+    """One state per info set of `game`, the first reached by walking the
+    tree of every deal."""
+    seen = {i: set() for i in range(game.num_players)}
+    for hand in deal_table(game.deck(), game.num_cards).hands:
+        stack = [game.new_state(hand)]
+        while stack:
+            state = stack.pop()
+            if state.terminal:
+                continue
+
+            stack.extend(state.take(action, deep=True) for action in state.valid_actions())
+            info_set = state.info_set()
+            if info_set not in seen[state.turn]:
+                seen[state.turn].add(info_set)
+                yield state
+
+
+def node_maps(trainer, game=LEDUC):
+    """The trained C++ node map as a `leduc.monte` blueprint. cfr/State.cpp
+    follows `GameState` and keys its nodes by `GameState.info_set`, so the
+    nodes are copied over as they are."""
+    node_map = {i: {} for i in range(game.num_players)}
+    action_map = {i: {} for i in range(game.num_players)}
+
+    for player, cpp_nodes in trainer.mNodeMap.items():
+        for info_set, cpp_node in cpp_nodes.items():
+            valid_actions = sorted(cpp_node.regretSum, key=lambda a: ACTION_ORDER.get(a, 2))
+            node = MNode(valid_actions)
+            node.regret_sum = {a: cpp_node.regretSum[a] for a in valid_actions}
+            node.strategy_sum = {a: cpp_node.strategySum[a] for a in valid_actions}
+            node_map[player][info_set] = node
+            action_map[player][info_set] = {'actions': valid_actions}
+
+    return node_map, action_map
+
+
+def coverage(node_map, game=LEDUC):
+    """Number of info sets of `game` that `node_map` holds and the total."""
+    states = list(info_set_states(game))
+    return sum(state.info_set() in node_map[state.turn] for state in states), len(states)
@@ -17,8 +17,9 @@ class Node:
             num_valid = len(actions)
             strat = {key: 1/num_valid for key in actions}
 
-        self.strategy_sum = {key: value + strat[key] * weight for key, value
-                             in self.strategy_sum.items()}
+        if weight:
+            for key in actions:
+                self.strategy_sum[key] += strat[key] * weight
 
         return strat
 
@@ -0,0 +1,230 @@
+"""MCCFR sampling schemes, picked by name with the `sampler` argument of
+`monte.learn` and `Search`: `external` (default), `outcome`, `chance` or
+`public_chance`. `nodes_per_iteration()` reports the work per iteration.
+"""
+import numpy as np
+
+from leduc.node import MNode as Node
+
+REGRET_MIN = -300000
+
+
+def lookup(state, node_map, action_map):
+    turn = state.turn
+    info_set = state.info_set()
+
+    if info_set not in action_map[turn]:
+        action_map[turn][info_set] = {'actions': state.valid_actions()}
+
+    valid_actions = action_map[turn][info_set]['actions']
+    if 'fixed' in action_map[turn][info_set]:
+        valid_actions = [action_map[turn][info_set]['fixed']]
+
+    if info_set not in node_map[turn]:
+        node_map[turn][info_set] = Node(valid_actions)
+
+    return node_map[turn][info_set], valid_actions
+
+
+class Sampler:
+    """Base class for the MCCFR sampling schemes.
+
+    A sampler picks the deals played on an iteration and walks the tree
+    for one traverser. Deals are drawn from suit isomorphism classes,
+    weighted by their size. `leaf` is an optional callable
+    `(traverser, state)` returning a utility vector, used by depth limited
+    search at the start of a new round.
+    """
+    name = None
+
+    def __init__(self, leaf=None):
+        self.leaf = leaf
+        self.nodes = 0
+        self.iterations = 0
+
+    def deals(self, table, num_players):
+        hands, _, _ = table.classes()
+        return [hands[table.sample_class()]]
+
+    def accumulate_regrets(self, traverser, state, node_map, action_map,
+                           prune=False):
+        raise NotImplementedError
+
+    def is_leaf(self, state, new_state):
+        return (self.leaf is not None and not new_state.terminal and
+                new_state.round != state.round)
+
+    def nodes_per_iteration(self):
+        return self.nodes / max(self.iterations, 1)
+
+    def __repr__(self):
+        return f'{self.name}: {self.nodes_per_iteration():.1f} nodes/iteration'
+
+
+class ExternalSampler(Sampler):
+    """Full width at the traverser, one sampled action at everyone else."""
+    name = 'external'
+
+    def accumulate_regrets(self, traverser, state, node_map, action_map,
+                           prune=False):
+        if state.terminal:
+            return state.utility()
+
+        self.nodes += 1
+        turn = state.turn
+        node, valid_actions = lookup(state, node_map, action_map)
+        strategy = node.strategy()
+
+        if turn == traverser:
+            util = {a: 0 for a in valid_actions}
+            node_util = np.zeros(len(node_map))
+            explored = set(valid_actions)
+
+            for action in valid_actions:
+                if prune is True and node.regret_sum[action] <= REGRET_MIN:
+                    explored.remove(action)
+                else:
+                    returned = self.child(traverser, state, action, node_map,
+                                          action_map, prune)
+                    util[action] = returned[turn]
+                    node_util += returned * strategy[action]
+
+            for action in explored:
+                regret = util[action] - node_util[turn]
+                node.regret_sum[action] += regret
+
+            return node_util
+
+        actions = list(strategy.keys())
+        probs = list(strategy.values())
+        random_action = actions[np.random.choice(len(actions), p=probs)]
+        return self.child(traverser, state, random_action, node_map,
+                          action_map, prune)
+
+    def child(self, traverser, state, action, node_map, action_map, prune):
+        new_state = state.take(action, deep=True)
+        if self.is_leaf(state, new_state):
+            return self.leaf(traverser, new_state)
+
+        return self.accumulate_regrets(traverser, new_state, node_map,
+                                       action_map, prune=prune)
+
+
+class OutcomeSampler(Sampler):
+    """Samples a single trajectory, exploring at the traverser with epsilon."""
+    name = 'outcome'
+
+    def __init__(self, leaf=None, epsilon=.6):
+        super().__init__(leaf)
+        self.epsilon = epsilon
+
+    def accumulate_regrets(self, traverser, state, node_map, action_map,
+                           prune=False):
+        util, _ = self.sample(traverser, state, node_map, action_map, 1, 1)
+        return util
+
+    def sample(self, traverser, state, node_map, action_map, reach, sample_prob):
+        if state.terminal:
+            return state.utility()[traverser] / sample_prob, 1
+
+        self.nodes += 1
+        turn = state.turn
+        node, valid_actions = lookup(state, node_map, action_map)
+        strategy = node.strategy()
+
+        probs = np.array([strategy[a] for a in valid_actions])
+        if turn == traverser:
+            sample_probs = (self.epsilon / len(valid_actions) +
+                            (1 - self.epsilon) * probs)
+        else:
+            sample_probs = probs
+
+        choice = np.random.choice(len(valid_actions), p=sample_probs)
+        new_state = state.take(valid_actions[choice], deep=True)
+        new_sample_prob = sample_prob * sample_probs[choice]
+        new_reach = reach if turn == traverser else reach * probs[choice]
+
+        if self.is_leaf(state, new_state):
+            util = self.leaf(traverser, new_state)[traverser] / new_sample_prob
+            tail = 1
+        else:
+            util, tail = self.sample(traverser, new_state, node_map, action_map,
+                                     new_reach, new_sample_prob)
+
+        if turn == traverser:
+            weight = util * reach * tail
+            for i, action in enumerate(valid_actions):
+                if i == choice:
+                    node.regret_sum[action] += weight * (1 - probs[choice])
+                else:
+                    node.regret_sum[action] -= weight * probs[choice]
+
+        return util, tail * probs[choice]
+
+
+class ChanceSampler(Sampler):
+    """Samples the deal and walks the full betting tree for it."""
+    name = 'chance'
+
+    def accumulate_regrets(self, traverser, state, node_map, action_map,
+                           prune=False):
+        probs = np.ones(len(node_map))
+        return self.traverse(traverser, state, node_map, action_map, probs)
+
+    def traverse(self, traverser, state, node_map, action_map, probs):
+        if state.terminal:
+            return state.utility()
+
+        self.nodes += 1
+        turn = state.turn
+        node, valid_actions = lookup(state, node_map, action_map)
+        strategy = node.strategy()
+
+        util = {a: 0 for a in valid_actions}
+        node_util = np.zeros(len(node_map))
+        for action in valid_actions:
+            new_state = state.take(action, deep=True)
+            if self.is_leaf(state, new_state):
+                returned = self.leaf(traverser, new_state)
+            else:
+                new_probs = probs.copy()
+                new_probs[turn] *= strategy[action]
+                returned = self.traverse(traverser, new_state, node_map,
+                                         action_map, new_probs)
+
+            util[action] = returned[turn]
+            node_util += returned * strategy[action]
+
+        if turn == traverser:
+            reach_prob = np.prod(np.delete(probs, turn))
+            for action in valid_actions:
+                regret = util[action] - node_util[turn]
+                node.regret_sum[action] += regret * reach_prob
+
+        return node_util
+
+
+class PublicChanceSampler(ChanceSampler):
+    """Samples the board and enumerates every private deal consistent with it."""
+    name = 'public_chance'
+
+    def deals(self, table, num_players):
+        deal = table.hand(table.sample())
+        board = {i: card for i, card in enumerate(deal) if i >= num_players}
+        return [table.hand(i) for i in table.consistent(board)]
+
+
+SAMPLERS = {sampler.name: sampler for sampler in
+            [ExternalSampler, OutcomeSampler, ChanceSampler, PublicChanceSampler]}
+
+
+def get_sampler(sampler, leaf=None):
+    if isinstance(sampler, Sampler):
+        if leaf is not None:
+            sampler.leaf = leaf
+        return sampler
+
+    if sampler not in SAMPLERS:
+        raise ValueError(f"Unknown sampler {sampler}, choose from {list(SAMPLERS)}")
+
+    return SAMPLERS[sampler](leaf=leaf)
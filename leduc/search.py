@@ -1,30 +1,158 @@
-import glob
+import os
+import random
 import pickle
-import numpy as np
 from copy import deepcopy
 
-from leduc.card import Card
 from leduc.node import MNode as Node
-from leduc.monte import learn, Search
-from itertools import permutations
-from leduc.state import Leduc as State
-from leduc.hand_eval import leduc_eval as eval
+from leduc.game import game_for, LEDUC
+from leduc.chance import deal_table
+from leduc.policy import PolicyTable
+from leduc.subgame import SubgameCache, fingerprint
+from leduc.belief import Beliefs
+from leduc.translation import translate
+
+SEARCH_ITERATIONS = 1000
+WARM_ITERATIONS = 250
 
 
 class Pluribus:
-    def __init__(self, node_map, action_map, cards, num_cards):
-        self.blueprint = node_map
-        self.action_map = action_map
+    """Plays the blueprint and searches at the end of each round.
 
-        self.all_combos = [list(t) for t in set(permutations(cards, num_cards))]
-        card = np.random.choice(len(self.all_combos))
-        self.root = State(self.all_combos[card], len(node_map), eval) 
+    `node_map` and `action_map` may be None when a `policy` table is given,
+    they are then only unpickled from `paths` the first time a search runs.
+    Solved subgames are kept in `cache`, a search that misses it starts from
+    the nearest cached solution, with fewer iterations when it seeded any
+    node. `beliefs` follow the public actions under the blueprint and
+    searches sample deals from them.
+    Off-tree raises are translated onto the blueprint's raises, and only
+    searched when the translation error is above `threshold`.
+    """
+    def __init__(self, node_map, action_map, cards, num_cards, game=None,
+                 policy=None, paths=('blueprint.po', 'actions.po'), cache=None,
+                 version=None, threshold=.25):
+        self._blueprint = node_map
+        self._action_map = action_map
+        self.policy = policy
+        self.paths = paths
+        self.cards = cards
+        if game is None:
+            game = game_for(cards, len(node_map) if node_map is not None else 2)
+        self.game = game
+        self.node_map = None
+        self.frozen = {}
+        self.cache = cache if cache is not None else SubgameCache()
+        self._version = version
+        self.injected = set()
+        self.threshold = threshold
+        self.translations = {}
 
+        self.table = deal_table(cards, num_cards)
+        self.beliefs = Beliefs(self.table, self.game.num_players)
+        self.root = self.game.new_state(self.table.random_hand())
 
-    def play(self):
-        self.node_map = deepcopy(self.blueprint)
-        actions = self.action_map
+    @classmethod
+    def load(cls, policy='policy.bin', blueprint='blueprint.po',
+             actions='actions.po', game=LEDUC, cache=None):
+        """Starts from a table written by `PolicyTable.save`."""
+        return cls(None, None, game.deck(), game.num_cards, game=game,
+                   policy=PolicyTable.load(policy), paths=(blueprint, actions),
+                   cache=cache)
+
+    @property
+    def blueprint(self):
+        if self._blueprint is None:
+            with open(self.paths[0], 'rb') as f:
+                self._blueprint = pickle.load(f)
+        return self._blueprint
+
+    @property
+    def action_map(self):
+        if self._action_map is None:
+            with open(self.paths[1], 'rb') as f:
+                self._action_map = pickle.load(f)
+            self.freeze()
+        return self._action_map
+
+    @property
+    def version(self):
+        if self._version is None:
+            self._version = fingerprint(self.blueprint)
+        return self._version
+
+    def freeze(self):
+        for (turn, info_set), (valid_actions, action) in self.frozen.items():
+            self._action_map[turn].setdefault(
+                info_set, {'actions': valid_actions})['frozen'] = action
+
+    def strategy(self, state):
+        turn = state.turn
+        info_set = state.info_set()
+        if self.node_map is not None and info_set in self.node_map[turn]:
+            return self.node_map[turn][info_set].avg_strategy()
+
+        return self.blueprint_strategy(state)
+
+    def blueprint_strategy(self, state):
+        """Average blueprint strategy at `state`, uniform where the
+        blueprint has no node. Never loads or changes the blueprint when a
+        `policy` table is given."""
+        turn = state.turn
+        info_set = state.info_set()
+        node = None
+        if self.policy is not None:
+            strategy = self.policy.strategy(turn, info_set)
+            if strategy:
+                return strategy
+        else:
+            node = self.blueprint[turn].get(info_set)
+
+        if node is None:
+            node = Node(state.valid_actions())
+        return node.avg_strategy()
+
+    def observe(self, state, action):
+        self.beliefs.observe(state, action, self.blueprint_strategy)
+
+    def act(self, state):
+        strategy = self.strategy(state)
+        return random.choices(list(strategy.keys()), weights=list(strategy.values()))[0]
+
+    def solve(self, state):
+        """Solution of the subgame below `state`, searched on a cache miss."""
+        from leduc.monte import Search
+
+        key = self.cache.key(state, self.injected, self.version)
+        solution = self.cache.get(key)
+        if solution is None:
+            search = Search(state, self.blueprint, self.action_map, self.cards,
+                            len(state.cards), iterations=SEARCH_ITERATIONS,
+                            warm_start=self.cache.nearest(key), beliefs=self.beliefs,
+                            warm_iterations=WARM_ITERATIONS)
+            solution = search.search()
+            self.cache.put(key, solution)
+
+        return solution
+
+    def abstract_state(self, state):
+        """`state` with every translated raise replaced by the raise it was
+        mapped onto, the state the blueprint and searches see."""
+        abstract = self.game.new_state(state.cards)
+        actions = [action for round_actions in state.history for action in round_actions]
+        for i, action in enumerate(actions):
+            abstract.take(self.translations.get(i, action))
 
+        return abstract
+
+    def reset(self):
+        """Forgets the searches, beliefs and translations of the last hand
+        and deals a new one."""
+        self.node_map = None
+        self.beliefs.reset()
+        self.translations = {}
+        self.root = self.game.new_state(self.table.random_hand())
+
+    def play(self):
+        self.reset()
 
         pluribus = 0
         state = deepcopy(self.root)
@@ -32,7 +160,7 @@ class Pluribus:
             player_turn = state.turn
 
             if player_turn == pluribus:
-                self.pluribus_turn(state, self.node_map, actions, cards)
+                self.pluribus_turn(state)
 
             else:
                 while True:
@@ -42,7 +170,7 @@ class Pluribus:
                     else:
                         print("Please choose a valid action (F, C, $R)")
 
-                self.opponent_turn(action, state, self.blueprint, actions, cards)
+                self.opponent_turn(action, state)
 
         payout = state.utility()
         print(f"Game state {state}")
@@ -53,83 +181,98 @@ class Pluribus:
             print(f"You won {payout[1]} chips")
         else:
             print(f"There was a tie!")
-            
-                 
-    def pluribus_turn(self, state, blueprint, action_map, cards):
-        info_set = state.info_set()
-        turn = state.turn
-        if info_set not in action_map[turn]:
-            action_map[turn][info_set] = {'actions': state.valid_actions()}
-
-        valid_actions = action_map[turn][info_set]['actions']
-        if state.info_set() not in blueprint[state.turn]:
-            blueprint[state.turn][state.info_set()] = Node(valid_actions)
 
-        node = blueprint[state.turn][state.info_set()]
-        strategy = node.avg_strategy()
 
-        actions = list(strategy.keys())
-        probs = list(strategy.values())
-
-        sampled = actions[np.random.choice(len(actions), p=probs)]
+    def pluribus_turn(self, state):
+        abstract = self.abstract_state(state)
+        sampled = self.act(abstract)
         print(f"Pluribus played {sampled}")
 
-        action_map[state.turn][state.info_set()]['frozen'] = sampled
+        self.frozen[(abstract.turn, abstract.info_set())] = (abstract.valid_actions(), sampled)
+        if self._action_map is not None:
+            self.freeze()
 
+        self.observe(abstract, sampled)
         state.take(sampled)
+        abstract.take(sampled)
+
+        self.check_round(abstract, self.root)
 
-        self.check_round(state, self.root, blueprint, action_map, cards)    
 
+    def opponent_turn(self, action, state):
+        abstract = self.abstract_state(state)
+        translated, searched = action, False
+        valid_actions = list(self.blueprint_strategy(abstract))
+        if action not in valid_actions:
+            translated, error = translate(abstract, action, valid_actions)
+            if error <= self.threshold:
+                print(f"***Translated {action} to {translated}***")
+                self.translations[sum(len(h) for h in state.history)] = translated
+            else:
+                translated, searched = action, True
+                self.inject(abstract, action)
 
-    def opponent_turn(self, action, state, blueprint, actions, cards):
-        node_map = None
+        self.observe(abstract, translated)
         state.take(action)
-        info_set = state.info_set()
+        abstract.take(translated)
+
+        if searched:
+            print("***Action not found, finding strategy to counter***")
+            self.node_map = self.solve(self.root)
+
+        self.check_round(abstract, self.root)
+
+    def inject(self, state, action):
+        """Adds `action` to the info sets of the player to act at the public
+        state of `state`."""
+        actions = self.action_map
         turn = state.turn
+        info_set = state.info_set()
         if info_set not in actions[turn]:
             actions[turn][info_set] = {'actions': state.valid_actions()}
 
-        if action not in actions[turn][info_set]['actions']:
-            for info_set in actions[state.turn]:
-                if str(state) in info_set:
-                    actions[state.turn][info_set]['actions'].append(action) 
+        for info_set in actions[turn]:
+            if info_set.endswith(f' {state}') and action not in actions[turn][info_set]['actions']:
+                actions[turn][info_set]['actions'].append(action)
+        self.injected.add((str(state), action))
 
-            search = Search(self.root, blueprint, actions, cards, len(state.cards))
-            print("***Action not found, finding strategy to counter***")
-            self.node_map = search.search()
 
-        self.check_round(state, self.root, node_map if node_map is not None else blueprint,
-                    actions, cards)
-                    
-
-    def check_round(self, next_state, state, blueprint, actions, cards):
+    def check_round(self, next_state, state):
         if next_state.round > state.round:
-            self.root = next_state
-            search = Search(next_state, blueprint, actions, cards, len(state.cards))
+            self.root = deepcopy(next_state)
             print("***Reached end of round, updating strategy***")
-            new_strat = search.search()
-            self.node_map = new_strat
+            self.node_map = self.solve(self.root)
 
 
 if __name__ == "__main__":
-    if not glob.glob('blueprint.po'):
-        num_players = 2
-        node_map = {i: {} for i in range(num_players)}
-        action_map = {i: {} for i in range(num_players)}
-        cards = [Card(14, 1), Card(13, 1), Card(12, 1), Card(14, 2), Card(13, 2), Card(12, 2)]
-        learn(50000, cards, 3, node_map, action_map)
-        with open('blueprint.po', 'wb') as f:
-            pickle.dump(node_map, f)
-        with open('actions.po', 'wb') as f:
-            pickle.dump(action_map, f)
+    if os.path.exists('policy.bin'):
+        pluribus = Pluribus.load(cache=SubgameCache(path='subgames.po'))
 
     else:
-        with open('blueprint.po', 'rb') as f:
-            node_map = pickle.load(f)
+        if not os.path.exists('blueprint.po'):
+            from leduc.monte import learn
+            from leduc.checkpoint import Checkpointer
+
+            num_players = 2
+            node_map = {i: {} for i in range(num_players)}
+            action_map = {i: {} for i in range(num_players)}
+            checkpoint = Checkpointer('blueprint.po', 'actions.po', every=10000)
+            learn(50000, LEDUC.deck(), 3, node_map, action_map, game=LEDUC,
+                  checkpoint=checkpoint)
+            print(checkpoint)
+
+        else:
+            with open('blueprint.po', 'rb') as f:
+                node_map = pickle.load(f)
+
+            with open('actions.po', 'rb') as f:
+                action_map = pickle.load(f)
 
-        with open('actions.po', 'rb') as f:
-            action_map = pickle.load(f)
+        PolicyTable.from_blueprint(node_map).save('policy.bin')
+        pluribus = Pluribus(node_map, action_map, LEDUC.deck(), 3, game=LEDUC,
+                            cache=SubgameCache(path='subgames.po'))
 
-    cards = [Card(14, 1), Card(13, 1), Card(12, 1), Card(14, 2), Card(13, 2), Card(12, 2)]
-    pluribus = Pluribus(node_map, action_map, cards, 3)
-    pluribus.play()
\ No newline at end of file
+    try:
+        pluribus.play()
+    finally:
+        pluribus.cache.close()
@@ -0,0 +1,265 @@
+"""Serves a blueprint to many tables from one process:
+
+    python -m leduc.server [socket path|port]
+
+prints a random authkey for `PolicyClient(address, authkey)`, and the
+socket is only accessible to its owner. Concurrent `strategy` and
+`strategy_states` requests are answered in one batched lookup over
+`client.actions`; `search` runs a subgame search on the server and
+`stats` reports latency and throughput.
+"""
+import os
+import sys
+import time
+import queue
+import pickle
+import tempfile
+import threading
+import numpy as np
+
+from multiprocessing import AuthenticationError
+from multiprocessing.connection import Listener, Client
+from leduc.policy import PolicyTable, state_key
+
+
+def listen(address, authkey):
+    """`Listener` on `address`, a Unix socket there is only readable and
+    writable by its owner."""
+    listener = Listener(address, authkey=authkey)
+    if isinstance(listener.address, str) and not listener.address.startswith('\0'):
+        os.chmod(listener.address, 0o600)
+    return listener
+
+
+class PolicyServer:
+    """Serves one in-memory blueprint to many tables over a local socket.
+
+    `address` is a Unix socket path or a `('localhost', port)` pair. Clients
+    authenticate with `authkey`, random per server unless given, because
+    requests are unpickled. Lookups from concurrent connections are queued
+    and answered in batches with a single gather over the policy matrix;
+    searches run on the thread of the connection that asked for them.
+    """
+    def __init__(self, node_map, action_map=None, cards=None, num_cards=None,
+                 address=None, authkey=None, max_batch=4096, max_wait=0):
+        self.node_map = node_map
+        self.action_map = action_map
+        self.cards = cards
+        self.num_cards = num_cards
+        self.table = PolicyTable.from_blueprint(node_map)
+        self.authkey = os.urandom(32) if authkey is None else authkey
+        self.listener = listen(address, self.authkey)
+        self.address = self.listener.address
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+
+        self.queue = queue.Queue()
+        self.lock = threading.Lock()
+        self.closed = threading.Event()
+        self.counters = {'requests': 0, 'keys': 0, 'batches': 0, 'searches': 0,
+                         'latency': 0., 'max_latency': 0.}
+        self.started = time.perf_counter()
+
+    def start(self):
+        threading.Thread(target=self.accept, daemon=True).start()
+        threading.Thread(target=self.batch, daemon=True).start()
+        return self
+
+    def serve_forever(self):
+        self.start()
+        self.closed.wait()
+
+    def close(self):
+        if self.closed.is_set():
+            return
+
+        self.closed.set()
+        try:
+            Client(self.address, authkey=self.authkey).close()
+        except OSError:
+            pass
+        self.listener.close()
+        self.queue.put(None)
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def accept(self):
+        while not self.closed.is_set():
+            try:
+                conn = self.listener.accept()
+            except AuthenticationError:
+                continue
+            except OSError:
+                break
+            threading.Thread(target=self.handle, args=(conn,), daemon=True).start()
+
+    def handle(self, conn):
+        with conn:
+            while not self.closed.is_set():
+                try:
+                    request = conn.recv()
+                except (EOFError, OSError):
+                    break
+
+                received = time.perf_counter()
+                try:
+                    op = request.get('op')
+                    if op == 'strategy':
+                        self.queue.put((conn, self.table.rows(request['keys']), received))
+                    elif op == 'states':
+                        keys = [state_key(state, card) for state, card in request['pairs']]
+                        self.queue.put((conn, self.table.rows(keys), received))
+                    elif op == 'search':
+                        self.reply(conn, self.search(request), received)
+                    elif op == 'actions':
+                        conn.send({'actions': self.table.actions})
+                    elif op == 'stats':
+                        conn.send(self.stats())
+                    else:
+                        conn.send({'error': f"Unknown op {op}"})
+                except Exception as e:
+                    try:
+                        conn.send({'error': repr(e)})
+                    except OSError:
+                        break
+
+    def batch(self):
+        while True:
+            item = self.queue.get()
+            if item is None:
+                break
+
+            items = [item]
+            size = len(item[1])
+            deadline = time.perf_counter() + self.max_wait
+            while size < self.max_batch:
+                try:
+                    timeout = deadline - time.perf_counter()
+                    if timeout > 0:
+                        item = self.queue.get(timeout=timeout)
+                    else:
+                        item = self.queue.get_nowait()
+                except queue.Empty:
+                    break
+
+                if item is None:
+                    self.queue.put(None)
+                    break
+                items.append(item)
+                size += len(item[1])
+
+            rows = np.concatenate([rows for _, rows, _ in items])
+            probs = self.table.probs[rows]
+
+            start = 0
+            for conn, rows, received in items:
+                end = start + len(rows)
+                self.reply(conn, {'probs': probs[start:end]}, received, len(rows))
+                start = end
+
+            with self.lock:
+                self.counters['batches'] += 1
+
+    def search(self, request):
+        from leduc.monte import Search
+
+        state = request['state']
+        search = Search(state, self.node_map, self.action_map, self.cards,
+                        self.num_cards, sampler=request.get('sampler', 'external'))
+        node_map = search.search()
+        node = node_map[state.turn].get(state.info_set())
+
+        with self.lock:
+            self.counters['searches'] += 1
+
+        return {'strategy': node.avg_strategy() if node is not None else {}}
+
+    def reply(self, conn, message, received, keys=0):
+        try:
+            conn.send(message)
+        except OSError:
+            return
+
+        latency = time.perf_counter() - received
+        with self.lock:
+            self.counters['requests'] += 1
+            self.counters['keys'] += keys
+            self.counters['latency'] += latency
+            self.counters['max_latency'] = max(self.counters['max_latency'], latency)
+
+    def stats(self):
+        with self.lock:
+            stats = dict(self.counters)
+
+        uptime = time.perf_counter() - self.started
+        stats['uptime'] = uptime
+        stats['mean_latency'] = stats['latency'] / max(stats['requests'], 1)
+        stats['mean_batch'] = stats['keys'] / max(stats['batches'], 1)
+        stats['requests_per_second'] = stats['requests'] / uptime
+        stats['keys_per_second'] = stats['keys'] / uptime
+
+        return stats
+
+
+class PolicyClient:
+    def __init__(self, address, authkey):
+        self.conn = Client(address, authkey=authkey)
+        self.actions = self.request({'op': 'actions'})['actions']
+
+    def request(self, message):
+        self.conn.send(message)
+        reply = self.conn.recv()
+        if 'error' in reply:
+            raise ValueError(reply['error'])
+
+        return reply
+
+    def strategy(self, keys):
+        """N x len(actions) matrix of probabilities for (player, info set) keys."""
+        return self.request({'op': 'strategy', 'keys': list(keys)})['probs']
+
+    def strategy_states(self, pairs):
+        """Same as `strategy` for (public state, private card) pairs."""
+        return self.request({'op': 'states', 'pairs': list(pairs)})['probs']
+
+    def search(self, state, sampler='external'):
+        return self.request({'op': 'search', 'state': state,
+                             'sampler': sampler})['strategy']
+
+    def stats(self):
+        return self.request({'op': 'stats'})
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+if __name__ == '__main__':
+    from leduc.game import LEDUC
+
+    if len(sys.argv) > 1:
+        address = sys.argv[1]
+    else:
+        address = os.path.join(tempfile.mkdtemp(prefix='pluribus-'), 'policy.sock')
+    if address.isnumeric():
+        address = ('localhost', int(address))
+
+    with open('blueprint.po', 'rb') as f:
+        node_map = pickle.load(f)
+    with open('actions.po', 'rb') as f:
+        action_map = pickle.load(f)
+
+    server = PolicyServer(node_map, action_map, LEDUC.deck(), LEDUC.num_cards,
+                          address=address)
+    print(f"Serving {len(server.table)} info sets on {server.address}, "
+          f"authkey {server.authkey.hex()}")
+    server.serve_forever()
@@ -1,6 +1,7 @@
 import numpy as np
 
 from copy import copy, deepcopy
+from leduc.isomorphism import canonical_view
 
 
 class Player:
@@ -195,3 +196,86 @@ class Leduc(State):
                 return ['F', 'C', '2R']
             else:
                 return ['F', 'C', '4R']
+
+
+class GameState(State):
+    def __init__(self, spec, cards):
+        super().__init__(cards, spec.num_players, spec.hand_eval)
+        self.spec = spec
+        self.num_rounds = spec.num_rounds
+        for p in self.players:
+            p.bets = spec.ante
+        self.history = [[] for _ in range(self.num_rounds)]
+        self.to_act = self.num_players
+
+    def __copy__(self):
+        new_state = GameState.__new__(GameState)
+        new_state.__dict__.update(self.__dict__)
+        new_state.players = [copy(p) for p in self.players]
+        new_state.history = [list(h) for h in self.history]
+
+        return new_state
+
+    def board(self):
+        start = self.num_players
+        return self.cards[start:start + self.spec.board_dealt[self.round]]
+
+    def info_set(self):
+        hole_card, *board = canonical_view(self, self.turn)
+        board = ''.join(str(card) for card in board)
+
+        return f"{hole_card} |{board}| {str(self)}"
+
+    def is_terminal(self):
+        num_in = self.num_players - sum([p.folded for p in self.players])
+
+        if num_in == 1:
+            return True
+
+        if 'R' in self.history[self.round][-1]:
+            self.to_act = num_in - 1
+        else:
+            self.to_act -= 1
+
+        if self.to_act == 0:
+            if self.round == self.num_rounds - 1:
+                return True
+
+            self.round += 1
+            self.to_act = num_in
+            self.turn = 0
+            for p in self.players:
+                p.raised = False
+        else:
+            self.turn = (self.turn + 1) % self.num_players
+
+        while self.players[self.turn].folded:
+            self.turn = (self.turn + 1) % self.num_players
+
+        return False
+
+    def utility(self):
+        players_in = [i for i, p in enumerate(self.players) if p.folded is False]
+
+        if len(players_in) == 1:
+            winners = players_in
+        else:
+            board = self.board()
+            hand_scores = [self.eval(self.cards[i], board) for i in players_in]
+            high_score = max(hand_scores)
+            winners = [i for i, score in zip(players_in, hand_scores)
+                       if score == high_score]
+
+        pot = sum(self.players)
+        payoffs = np.array([-p.bets for p in self.players], dtype=float)
+        payoffs[winners] += pot / len(winners)
+
+        return payoffs
+
+    def valid_actions(self):
+        num_raises_so_far = sum(['R' in action for action in self.history[self.round]])
+
+        if num_raises_so_far >= self.spec.raise_cap:
+            return ['F', 'C']
+
+        return ['F', 'C', f'{self.spec.bet_sizes[self.round]}R']
@@ -0,0 +1,356 @@
+"""Regrets on disk for games that don't fit in memory.
+`regret_stores(path, num_players, cache_size=...)` gives a node map of one
+`RegretStore` per player, which `learn`, the samplers and `Search` use
+unchanged; the action map stays in memory. `python -m leduc.bench_store`
+shows the throughput as the cache shrinks below the working set.
+"""
+import os
+import json
+import shutil
+import struct
+import hashlib
+import numpy as np
+
+from collections import OrderedDict
+from collections.abc import MutableMapping
+from leduc.node import MNode
+
+LOAD = .7
+REGRET, STRATEGY = 0, 1
+
+
+def key_hash(info_set):
+    digest = hashlib.blake2b(info_set.encode(), digest_size=8).digest()
+    return int.from_bytes(digest, 'little') or 1
+
+
+class RowView(MutableMapping):
+    """Regret or strategy sums of a `RowNode`, read from and written to the
+    row of its info set."""
+    def __init__(self, node, field):
+        self.node = node
+        self.field = field
+
+    def __getitem__(self, action):
+        store = self.node.store
+        return float(store.sums[store.row(self.node.info_set), self.field,
+                                self.node.position[action]])
+
+    def __setitem__(self, action, value):
+        store = self.node.store
+        store.sums[store.row(self.node.info_set), self.field,
+                   self.node.position[action]] = value
+
+    def __delitem__(self, action):
+        raise TypeError("Rows have a fixed set of actions")
+
+    def __iter__(self):
+        return iter(self.node.actions)
+
+    def __len__(self):
+        return len(self.node.actions)
+
+    def items(self):
+        store = self.node.store
+        values = store.sums[store.row(self.node.info_set), self.field, :len(self.node.actions)]
+        return list(zip(self.node.actions, values.tolist()))
+
+    def __repr__(self):
+        return repr(dict(self.items()))
+
+
+class RowNode(MNode):
+    """`MNode` whose sums live in a `RegretStore` row. Copies and pickles
+    are plain `MNode`s."""
+    def __init__(self, store, info_set, actions):
+        self.store = store
+        self.info_set = info_set
+        self.actions = actions
+        self.position = {action: j for j, action in enumerate(actions)}
+
+    @property
+    def regret_sum(self):
+        return RowView(self, REGRET)
+
+    @regret_sum.setter
+    def regret_sum(self, values):
+        self.store.assign(self.info_set, REGRET, [values[a] for a in self.actions])
+
+    @property
+    def strategy_sum(self):
+        return RowView(self, STRATEGY)
+
+    @strategy_sum.setter
+    def strategy_sum(self, values):
+        self.store.assign(self.info_set, STRATEGY, [values[a] for a in self.actions])
+
+    def detach(self):
+        node = MNode(list(self.actions))
+        node.regret_sum = dict(self.regret_sum.items())
+        node.strategy_sum = dict(self.strategy_sum.items())
+        return node
+
+    def __deepcopy__(self, memo):
+        return self.detach()
+
+    def __reduce__(self):
+        return self.detach().__reduce__()
+
+
+class RegretStore(MutableMapping):
+    """One player's info sets in an open addressing hash table memory mapped
+    from `path`, usable wherever a `node_map[player]` dict is.
+
+    Every row has room for `width` actions. At most `cache_size` rows are
+    held in memory; the least recently used one is evicted and written back
+    to the table with up to `batch` other evicted rows at once. Nodes are
+    `RowNode` views that go through the cache on every access, so they stay
+    valid after their row is evicted. The table doubles once more than
+    `LOAD` of its slots are taken, and keys are appended to a log next to
+    it. `flush` writes everything back, a store reopened on the same path
+    picks up where it left off, and `checkpoint` copies the flushed files.
+    """
+    def __init__(self, path, cache_size=100000, width=8, capacity=1024, batch=1024):
+        os.makedirs(path, exist_ok=True)
+        self.path = path
+        self.cache_size = cache_size
+        self.batch = batch
+
+        meta = {'width': width, 'capacity': capacity, 'size': 0, 'actions': []}
+        if os.path.exists(self.file('meta.json')):
+            with open(self.file('meta.json')) as f:
+                meta = json.load(f)
+        self.width = meta['width']
+        self.capacity = meta['capacity']
+        self.size = meta['size']
+        self.actions = meta['actions']
+        self.codes = {action: i for i, action in enumerate(self.actions)}
+
+        self.dtype = np.dtype([('hash', '<u8'), ('key', '<i8'), ('actions', 'i1', self.width),
+                               ('sums', '<f8', (2, self.width))])
+        self.table = self.open_table(self.file('table.bin'), self.capacity)
+        self.keys = os.open(self.file('keys.bin'), os.O_RDWR | os.O_CREAT | os.O_APPEND)
+
+        self.sums = np.zeros((cache_size, 2, self.width))
+        self.slots = np.full(cache_size, -1, dtype=np.int64)
+        self.row_actions = [None] * cache_size
+        self.cached = OrderedDict()
+        self.free = list(range(cache_size - 1, -1, -1))
+        self.pending = {}
+        self.hits = 0
+        self.misses = 0
+
+    def file(self, name):
+        return os.path.join(self.path, name)
+
+    def open_table(self, path, capacity):
+        mode = 'r+' if os.path.exists(path) else 'w+'
+        return np.memmap(path, dtype=self.dtype, mode=mode, shape=(capacity,))
+
+    def read_key(self, offset):
+        length, = struct.unpack('<I', os.pread(self.keys, 4, offset))
+        return os.pread(self.keys, length, offset + 4).decode()
+
+    def find(self, info_set, h, table=None):
+        """Slot of `info_set` and whether it's there, else the free slot it
+        would take."""
+        table = self.table if table is None else table
+        hashes, keys = table['hash'], table['key']
+        mask = len(table) - 1
+        i = h & mask
+        while True:
+            slot_hash = int(hashes[i])
+            if slot_hash == 0:
+                return i, False
+            if slot_hash == h and self.read_key(int(keys[i])) == info_set:
+                return i, True
+            i = (i + 1) & mask
+
+    def __contains__(self, info_set):
+        if info_set in self.cached:
+            return True
+        return self.find(info_set, key_hash(info_set))[1]
+
+    def __getitem__(self, info_set):
+        index = self.row(info_set)
+        return RowNode(self, info_set, self.row_actions[index])
+
+    def __setitem__(self, info_set, node):
+        actions = list(node.actions)
+        if len(actions) > self.width:
+            raise ValueError(f"{info_set} has {len(actions)} actions, "
+                             f"the store has room for {self.width}")
+
+        regret = [node.regret_sum[a] for a in actions]
+        strategy = [node.strategy_sum[a] for a in actions]
+        if info_set not in self:
+            self.insert(info_set)
+
+        slot = self.slot(info_set)
+        codes = np.full(self.width, -1, dtype=np.int8)
+        for j, action in enumerate(actions):
+            if action not in self.codes:
+                self.codes[action] = len(self.actions)
+                self.actions.append(action)
+            codes[j] = self.codes[action]
+        self.table['actions'][slot] = codes
+
+        index = self.row(info_set)
+        self.row_actions[index] = actions
+        self.sums[index] = 0
+        self.sums[index, REGRET, :len(actions)] = regret
+        self.sums[index, STRATEGY, :len(actions)] = strategy
+
+    def __delitem__(self, info_set):
+        raise TypeError("RegretStore doesn't delete rows")
+
+    def __iter__(self):
+        """Info sets in the order they were added."""
+        offset, end = 0, os.fstat(self.keys).st_size
+        while offset < end:
+            key = self.read_key(offset)
+            yield key
+            offset += 4 + len(key.encode())
+
+    def __len__(self):
+        return self.size
+
+    def slot(self, info_set):
+        slot, found = self.find(info_set, key_hash(info_set))
+        if not found:
+            raise KeyError(info_set)
+        return slot
+
+    def insert(self, info_set):
+        if self.size + 1 > LOAD * self.capacity:
+            self.grow()
+
+        h = key_hash(info_set)
+        slot, _ = self.find(info_set, h)
+        data = info_set.encode()
+        offset = os.lseek(self.keys, 0, os.SEEK_END)
+        os.write(self.keys, struct.pack('<I', len(data)) + data)
+
+        self.table['hash'][slot] = h
+        self.table['key'][slot] = offset
+        self.table['sums'][slot] = 0
+        self.size += 1
+
+    def row(self, info_set):
+        """Index of the cached row of `info_set`, fetched if needed."""
+        index = self.cached.get(info_set)
+        if index is not None:
+            self.hits += 1
+            self.cached.move_to_end(info_set)
+            return index
+
+        self.misses += 1
+        slot = self.slot(info_set)
+        index = self.free.pop() if self.free else self.evict()
+        if slot in self.pending:
+            self.sums[index] = self.pending.pop(slot)
+        else:
+            self.sums[index] = self.table['sums'][slot]
+
+        codes = self.table['actions'][slot]
+        self.row_actions[index] = [self.actions[c] for c in codes if c >= 0]
+        self.slots[index] = slot
+        self.cached[info_set] = index
+        return index
+
+    def assign(self, info_set, field, values):
+        index = self.row(info_set)
+        self.sums[index, field, :len(values)] = values
+
+    def evict(self):
+        _, index = self.cached.popitem(last=False)
+        self.pending[int(self.slots[index])] = self.sums[index].copy()
+        if len(self.pending) >= self.batch:
+            self.write_back()
+        return index
+
+    def write_back(self):
+        if not self.pending:
+            return
+
+        slots = np.array(sorted(self.pending), dtype=np.int64)
+        self.table['sums'][slots] = np.stack([self.pending[s] for s in slots])
+        self.pending.clear()
+
+    def flush(self):
+        """Writes the pending and cached rows, the table and the metadata."""
+        self.write_back()
+        index = np.fromiter(self.cached.values(), dtype=np.int64)
+        if len(index):
+            self.table['sums'][self.slots[index]] = self.sums[index]
+        self.table.flush()
+        self.write_meta()
+
+    def checkpoint(self, path):
+        """Flushes the store and copies its files to `path`, which opens as
+        a store of its own. A copy already at `path` is only replaced once
+        the new one is complete."""
+        self.flush()
+        tmp, old = f'{path}.tmp', f'{path}.old'
+        for directory in (tmp, old):
+            if os.path.exists(directory):
+                shutil.rmtree(directory)
+
+        os.makedirs(tmp)
+        for name in ('table.bin', 'keys.bin', 'meta.json'):
+            shutil.copyfile(self.file(name), os.path.join(tmp, name))
+            with open(os.path.join(tmp, name), 'rb') as f:
+                os.fsync(f.fileno())
+
+        if os.path.exists(path):
+            os.replace(path, old)
+        os.replace(tmp, path)
+        if os.path.exists(old):
+            shutil.rmtree(old)
+
+    def write_meta(self):
+        with open(self.file('meta.json'), 'w') as f:
+            json.dump({'width': self.width, 'capacity': self.capacity, 'size': self.size,
+                       'actions': self.actions}, f)
+
+    def grow(self):
+        self.flush()
+        capacity = 2 * self.capacity
+        path = self.file('table.new')
+        if os.path.exists(path):
+            os.remove(path)
+        table = self.open_table(path, capacity)
+
+        for i in np.flatnonzero(self.table['hash']):
+            row = self.table[i]
+            slot, _ = self.find(None, int(row['hash']), table)
+            table[slot] = row
+        table.flush()
+
+        del self.table
+        os.replace(path, self.file('table.bin'))
+        self.table = self.open_table(self.file('table.bin'), capacity)
+        self.capacity = capacity
+        for info_set, index in self.cached.items():
+            self.slots[index] = self.slot(info_set)
+        self.write_meta()
+
+    def scale(self, factor):
+        """Multiplies every regret and strategy sum by `factor`."""
+        self.write_back()
+        self.table['sums'] *= factor
+        self.sums *= factor
+
+    def close(self):
+        self.flush()
+        os.close(self.keys)
+
+    def __repr__(self):
+        return (f"RegretStore({self.path!r}: {self.size} rows, {len(self.cached)} cached, "
+                f"{self.hits / max(self.hits + self.misses, 1):.0%} hits)")
+
+
+def regret_stores(path, num_players, **kwargs):
+    """A node map of one `RegretStore` per player under `path`."""
+    return {player: RegretStore(os.path.join(path, str(player)), **kwargs)
+            for player in range(num_players)}
@@ -0,0 +1,149 @@
+"""Searches of `Pluribus`, cached in a bounded LRU `SubgameCache`. Keys are
+the public history at the search root with its board, canonical under
+suit isomorphism, the off-tree actions injected below it and a
+fingerprint of the blueprint; entries only hold the solved subgame. A hit
+skips the search and a miss warm starts it from the cached solution whose
+root shares the most actions. With `path=` the cache is loaded from disk
+and written atomically every `save_every` inserts and on `close()`.
+"""
+import os
+import ast
+import pickle
+import hashlib
+
+from collections import OrderedDict
+from leduc.checkpoint import write_atomic
+from leduc.isomorphism import canonicalize
+
+
+def public_history(info_set):
+    """Public action history of an info set key, one list per round."""
+    return ast.literal_eval(info_set.split('| ', 1)[1])
+
+
+def extends(history, root):
+    """Whether the public `history` is `root` or comes after it."""
+    if len(history) < len(root):
+        return False
+
+    last = len(root) - 1
+    return history[:last] == root[:last] and history[last][:len(root[last])] == root[last]
+
+
+def root_history(state):
+    return state.history[:state.round + 1]
+
+
+def subgame(node_map, root):
+    """Nodes of `node_map` at or below the public history `root`."""
+    return {player: {info_set: node for info_set, node in nodes.items()
+                     if extends(public_history(info_set), root)}
+            for player, nodes in node_map.items()}
+
+
+def fingerprint(node_map):
+    """Short digest of a blueprint's average strategy sums, used as its version."""
+    digest = hashlib.sha1()
+    for player in sorted(node_map):
+        for info_set in sorted(node_map[player]):
+            strategy_sum = sorted(node_map[player][info_set].strategy_sum.items())
+            digest.update(f'{player}{info_set}{strategy_sum}'.encode())
+
+    return digest.hexdigest()[:16]
+
+
+class SubgameCache:
+    """Solved subgames keyed by the public history and board at the search
+    root, the off-tree actions injected below it and the blueprint version.
+    Boards are canonical under suit isomorphism, like the info sets of the
+    solutions. Beyond `max_size` entries the least recently used one is
+    dropped. With a `path` the cache is loaded from it and written back
+    atomically after every `save_every` inserts and on `close`."""
+    def __init__(self, max_size=256, path=None, save_every=16):
+        self.max_size = max_size
+        self.path = path
+        self.save_every = save_every
+        self.entries = OrderedDict()
+        self.unsaved = 0
+        self.hits = 0
+        self.misses = 0
+
+        if path is not None and os.path.exists(path):
+            with open(path, 'rb') as f:
+                self.entries = pickle.load(f)
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __contains__(self, key):
+        return key in self.entries
+
+    @staticmethod
+    def key(state, injected=(), version=None):
+        """`injected` are (public history, action) pairs added to the
+        action map, only those below the root of `state` are kept."""
+        root = root_history(state)
+        injected = sorted((history, action) for history, action in injected
+                          if extends(ast.literal_eval(history), root))
+        num_players = state.spec.num_players
+        board = state.cards[num_players:num_players + state.spec.board_dealt[state.round]]
+        board = canonicalize(tuple(board), state.spec.suits)
+
+        return str(root), ''.join(str(card) for card in board), tuple(injected), version
+
+    def get(self, key):
+        if key not in self.entries:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        self.entries.move_to_end(key)
+        return self.entries[key]
+
+    def put(self, key, solution):
+        self.entries[key] = solution
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_size:
+            self.entries.popitem(last=False)
+
+        if self.path is not None:
+            self.unsaved += 1
+            if self.unsaved >= self.save_every:
+                self.save()
+
+    def nearest(self, key):
+        """Cached solution of the same blueprint and board whose root is an
+        ancestor or descendant of the root of `key` and shares the most
+        actions with it, the most recent on ties. Solutions of sibling roots
+        hold no nodes below `key` and are never returned."""
+        root, board, _, version = key
+        actions = [a for round_actions in ast.literal_eval(root) for a in round_actions]
+
+        best, shared = None, -1
+        for (other, other_board, _, other_version), solution in reversed(self.entries.items()):
+            if other_version != version or other_board != board:
+                continue
+
+            other = [a for round_actions in ast.literal_eval(other) for a in round_actions]
+            common = 0
+            while common < min(len(actions), len(other)) and actions[common] == other[common]:
+                common += 1
+            if common == min(len(actions), len(other)) and common > shared:
+                best, shared = solution, common
+
+        return best
+
+    def save(self):
+        write_atomic(self.path, self.entries)
+        self.unsaved = 0
+
+    def close(self):
+        """Writes the inserts not saved yet."""
+        if self.path is not None and self.unsaved:
+            self.save()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
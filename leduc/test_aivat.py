@@ -0,0 +1,53 @@
+import numpy as np
+
+from leduc.aivat import Aivat
+from leduc.match import play_match, BlueprintPolicy
+from leduc.test_policy import kuhn_blueprint
+from leduc.chance import deal_table
+from leduc.game import KUHN, LEDUC
+from leduc.monte import learn
+
+np.random.seed(0)
+
+
+def self_play(policy, game, hands):
+    table = deal_table(game.deck(), game.num_cards)
+    states = []
+    for i in table.sample(hands):
+        state = game.new_state(table.hand(i))
+        while not state.terminal:
+            state.take(policy.act([state])[0])
+        states.append(state)
+
+    return states
+
+
+def test_known_players():
+    node_map = {i: {} for i in range(2)}
+    action_map = {i: {} for i in range(2)}
+    learn(300, LEDUC.deck(), 3, node_map, action_map, game=LEDUC)
+    aivat = Aivat(node_map, game=LEDUC)
+
+    states = self_play(BlueprintPolicy(node_map), LEDUC, 200)
+    raw, corrected = aivat.evaluate(states)
+    value = aivat.chance_value(LEDUC.new_state(states[0].cards), 0)
+
+    assert raw.var(axis=0).min() > 1
+    assert np.allclose(corrected, value, atol=1e-4), (corrected[:5], value)
+
+    _, partial = aivat.evaluate(states, known=[0])
+    assert partial.var(axis=0).max() < raw.var(axis=0).min()
+
+
+def test_match_variance():
+    node_map, _ = kuhn_blueprint(1000)
+    aivat = Aivat(node_map, game=KUHN)
+    policies = [BlueprintPolicy(node_map), BlueprintPolicy(node_map)]
+
+    result = play_match(policies, 20000, game=KUHN, seed=0, aivat=aivat, known=[0])
+
+    assert np.all(result.variance() < result.variance(raw=True) / 1.5), result
+    assert abs(result.win_rate()[0]) < 2 * result.confidence()[0], result
+
+    result = play_match(policies, 2000, game=KUHN, seed=0, aivat=aivat, known=[0, 1])
+    assert np.all(result.variance() < 1e-6), result
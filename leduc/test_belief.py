@@ -0,0 +1,55 @@
+import numpy as np
+import pytest
+
+from leduc.belief import Beliefs
+from leduc.chance import deal_table
+from leduc.game import KUHN, LEDUC
+from leduc.monte import Search
+from leduc.test_policy import kuhn_blueprint
+
+
+def always_raise(state):
+    """Bets only with the ace."""
+    if state.cards[state.turn].rank == 14:
+        return {'C': 0, '1R': 1}
+    return {'C': 1, '1R': 0}
+
+
+def test_observe():
+    beliefs = Beliefs(deal_table(KUHN.deck(), 2), 2)
+    state = KUHN.new_state(KUHN.deck()[:2])
+
+    beliefs.observe(state, '1R', always_raise)
+    assert beliefs.private(0) == pytest.approx({card: 1 for card in KUHN.deck()
+                                                if card.rank == 14})
+    assert sum(beliefs.private(1).values()) == pytest.approx(1)
+
+    before = beliefs.weights.copy()
+    beliefs.observe(state.take('1R', deep=True), '4R', always_raise)
+    assert np.array_equal(beliefs.weights, before)
+
+
+def test_reveal():
+    table = deal_table(LEDUC.deck(), 3)
+    beliefs = Beliefs(table, 2)
+    state = LEDUC.new_state(table.hand(0))
+    state.take('C')
+
+    beliefs.observe(state, 'C', lambda state: {'C': 1})
+    board = state.cards[2]
+    assert all(table.hand(i)[2] == board for i in np.flatnonzero(beliefs.weights))
+    for _ in range(10):
+        assert beliefs.sample()[2] == board
+
+
+def test_search_subgame():
+    node_map, action_map = kuhn_blueprint()
+    state = KUHN.new_state(KUHN.deck()[:2])
+    state.take('C')
+
+    beliefs = Beliefs(deal_table(KUHN.deck(), 2), 2)
+    solved = Search(state, node_map, action_map, KUHN.deck(), 2, iterations=50,
+                    beliefs=beliefs).search()
+
+    assert all("[['C'" in info_set for player in solved for info_set in solved[player])
+    assert len(solved[0]) < len(node_map[0])
@@ -0,0 +1,32 @@
+import pickle
+import numpy as np
+
+from copy import deepcopy
+from leduc.card import Card, encode, decode
+from leduc.chance import deal_table
+from leduc.game import LEDUC
+from leduc.hand_eval import leduc_eval, leduc_scores
+
+
+def test_codes():
+    card = Card(13, 2)
+    assert card == 13 * 4 + 1 and card.rank == 13 and card.suit == 2
+    assert repr(card) == 'Kh' and f'{card}' == 'Kh'
+    assert Card(14, 's') == Card(14, 1)
+    assert Card.from_code(int(card)) == card and repr(Card.from_code(int(card))) == 'Kh'
+    assert Card(12, 4) < Card(13, 1)
+    assert len({Card(14, 1), Card(14, 1), Card(14, 2)}) == 2
+
+    cards = LEDUC.deck()
+    assert decode(encode(cards)) == cards
+    assert all(isinstance(c, Card) for c in pickle.loads(pickle.dumps(cards)))
+    assert repr(deepcopy(cards)) == repr(cards)
+
+
+def test_scores():
+    table = deal_table(LEDUC.deck(), LEDUC.num_cards)
+    codes = table.codes
+    assert [decode(row) for row in codes[:10]] == table.hands[:10]
+
+    scores = leduc_scores(codes[:, 0], codes[:, 2])
+    assert np.array_equal(scores, [leduc_eval(hand[0], [hand[2]]) for hand in table.hands])
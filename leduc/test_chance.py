@@ -0,0 +1,50 @@
+import numpy as np
+
+from itertools import permutations
+from leduc.chance import deal_table
+from leduc.game import LEDUC
+from leduc.card import Card
+
+
+def test_memoized():
+    cards = LEDUC.replace(ranks=(14, 13, 12, 11)).deck()
+    table = deal_table(cards, 3)
+
+    assert deal_table(list(cards), 3) is table
+    assert deal_table(cards, 2) is not table
+    assert table._deals is None and table._classes is None
+
+
+def test_deals():
+    cards = LEDUC.deck()
+    table = deal_table(cards, 3)
+
+    assert len(table) == 120 and table.deals.dtype == np.int8
+    assert sorted(map(tuple, table.hands)) == sorted(permutations(cards, 3))
+
+    np.random.seed(0)
+    samples = table.sample(1200)
+    counts = np.bincount(samples, minlength=len(table))
+    assert counts.min() > 0, counts
+
+
+def test_consistent():
+    cards = LEDUC.deck()
+    table = deal_table(cards, 3)
+    fixed = {0: Card(14, 1), 2: Card(13, 2)}
+
+    index = table.consistent(fixed)
+
+    assert len(index) == 4, index
+    assert all(table.hand(i)[0] == Card(14, 1) and table.hand(i)[2] == Card(13, 2)
+               for i in index)
+    assert table.sample_consistent(fixed) in index
+
+
+def test_classes():
+    table = deal_table(LEDUC.deck(), 3)
+    hands, weights, probs = table.classes()
+
+    assert len(hands) == 60 and weights.sum() == 120, len(hands)
+    assert np.isclose(probs.sum(), 1)
+    assert 0 <= table.sample_class() < len(hands)
@@ -0,0 +1,93 @@
+import os
+import pickle
+import pytest
+import threading
+
+from leduc.checkpoint import Checkpointer, write_atomic, snapshot
+from leduc.game import KUHN
+from leduc.monte import learn
+from leduc.store import regret_stores
+from leduc.test_policy import kuhn_blueprint
+
+
+def test_write_atomic(tmp_path):
+    path = tmp_path / 'blueprint.po'
+    write_atomic(str(path), {'a': 1})
+    write_atomic(str(path), {'a': 2})
+
+    with open(path, 'rb') as f:
+        assert pickle.load(f) == {'a': 2}
+    assert os.listdir(tmp_path) == ['blueprint.po']
+
+
+def test_snapshot():
+    node_map, _ = kuhn_blueprint()
+    copied = snapshot(node_map)
+    info_set, node = next(iter(node_map[0].items()))
+    before = dict(node.regret_sum)
+    node.regret_sum[node.actions[0]] += 100
+
+    assert copied[0][info_set].regret_sum == before
+    assert type(copied[0][info_set]) is type(node)
+
+
+@pytest.mark.parametrize('fork', [True, False])
+def test_learn_checkpoint(tmp_path, fork):
+    if fork and not hasattr(os, 'fork'):
+        pytest.skip("No os.fork")
+
+    checkpoint = Checkpointer(str(tmp_path / 'blueprint.po'), str(tmp_path / 'actions.po'),
+                              every=100, fork=fork)
+    node_map = {i: {} for i in range(2)}
+    action_map = {i: {} for i in range(2)}
+    learn(250, KUHN.deck(), 2, node_map, action_map, game=KUHN, checkpoint=checkpoint)
+
+    with open(tmp_path / 'blueprint.po', 'rb') as f:
+        saved = pickle.load(f)
+    with open(tmp_path / 'actions.po', 'rb') as f:
+        assert pickle.load(f) == action_map
+
+    for player in node_map:
+        for info_set, node in node_map[player].items():
+            assert saved[player][info_set].strategy_sum == node.strategy_sum
+
+    stats = checkpoint.stats()
+    assert stats['checkpoints'] == 3 and stats['iteration'] == 250
+    assert stats['written'] + stats['skipped'] == 3 and stats['failed'] == 0
+    assert stats['max_stall'] < 1
+
+
+def test_writer_error(tmp_path):
+    checkpoint = Checkpointer(str(tmp_path / 'blueprint.po'), str(tmp_path / 'actions.po'),
+                              fork=False)
+    node_map, action_map = kuhn_blueprint()
+    checkpoint.save(node_map, {0: {'info': {'actions': threading.Lock()}}})
+    with pytest.raises(TypeError):
+        checkpoint.wait()
+
+    checkpoint.save(node_map, action_map)
+    checkpoint.wait()
+    assert checkpoint.stats()['failed'] == 1 and checkpoint.stats()['written'] == 1
+
+
+@pytest.mark.parametrize('fork', [True, False])
+def test_store_checkpoint(tmp_path, fork):
+    if fork and not hasattr(os, 'fork'):
+        pytest.skip("No os.fork")
+
+    checkpoint = Checkpointer(str(tmp_path / 'blueprint.po'), str(tmp_path / 'actions.po'),
+                              every=100, fork=fork)
+    stores = regret_stores(str(tmp_path / 'train'), 2, cache_size=4)
+    action_map = {i: {} for i in range(2)}
+    learn(250, KUHN.deck(), 2, stores, action_map, game=KUHN, checkpoint=checkpoint)
+
+    saved = regret_stores(checkpoint.store_path, 2)
+    for player, store in stores.items():
+        assert list(saved[player]) == list(store)
+        for info_set, node in store.items():
+            assert saved[player][info_set].regret_sum == dict(node.regret_sum.items())
+            assert saved[player][info_set].strategy_sum == dict(node.strategy_sum.items())
+
+    with open(tmp_path / 'actions.po', 'rb') as f:
+        assert pickle.load(f) == action_map
+    assert checkpoint.stats()['failed'] == 0
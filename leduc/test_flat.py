@@ -0,0 +1,60 @@
+import numpy as np
+import pytest
+
+from leduc import vanilla, monte
+from leduc.flat import flat_game
+from leduc.game import KUHN, LEDUC
+
+
+def train(module, backend, game, iterations, **kwargs):
+    np.random.seed(7)
+    node_map = {i: {} for i in range(game.num_players)}
+    action_map = {i: {} for i in range(game.num_players)}
+    module.learn(iterations, game.deck(), game.num_cards, node_map, action_map,
+                 game=game, backend=backend, **kwargs)
+
+    return node_map, action_map, np.random.random()
+
+
+def assert_same(python, flat):
+    assert python[1] == flat[1]
+    assert python[2] == flat[2], "random streams diverged"
+    for player in python[0]:
+        assert python[0][player].keys() == flat[0][player].keys()
+        for info_set, node in python[0][player].items():
+            other = flat[0][player][info_set]
+            assert type(node) is type(other)
+            for action in node.actions:
+                assert np.isclose(node.regret_sum[action], other.regret_sum[action],
+                                  rtol=1e-9, atol=1e-9), info_set
+                assert np.isclose(node.strategy_sum[action], other.strategy_sum[action],
+                                  rtol=1e-9, atol=1e-9), info_set
+
+
+@pytest.mark.parametrize('mode', list(vanilla.MODES))
+def test_vanilla_backend(mode):
+    assert_same(train(vanilla, 'python', KUHN, 300, mode=mode),
+                train(vanilla, 'numba', KUHN, 300, mode=mode))
+
+
+@pytest.mark.parametrize('game', [KUHN, LEDUC])
+def test_external_backend(game):
+    assert_same(train(monte, 'python', game, 500),
+                train(monte, 'numba', game, 500))
+
+
+def test_flat_game():
+    flat = flat_game(LEDUC, LEDUC.deck(), 3)
+
+    assert flat is flat_game(LEDUC, LEDUC.deck(), 3)
+    assert flat.infoset.shape == (len(flat.deal_probs), len(LEDUC.compile()))
+    assert np.all((flat.infoset >= 0) == (flat.turn >= 0)[None])
+    assert np.allclose(flat.payoff.sum(axis=2), 0)
+
+
+def test_unknown_backend():
+    with pytest.raises(ValueError):
+        train(vanilla, 'cython', KUHN, 1)
+
+    with pytest.raises(ValueError):
+        train(monte, 'numba', KUHN, 1, sampler='outcome')
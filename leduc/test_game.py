@@ -0,0 +1,108 @@
+import numpy as np
+import pytest
+
+from leduc.game import GameSpec, KUHN, LEDUC, game_for
+from leduc.state import Leduc, State
+from leduc.hand_eval import leduc_eval, kuhn_eval
+from leduc.monte import learn
+from leduc.card import Card
+
+
+def compare(spec_state, legacy_state):
+    assert spec_state.terminal == legacy_state.terminal, legacy_state
+    assert [p.bets for p in spec_state.players] == [p.bets for p in legacy_state.players]
+    if spec_state.terminal:
+        assert np.array_equal(spec_state.utility(), legacy_state.utility()), legacy_state
+        return 1
+
+    assert spec_state.turn == legacy_state.turn, legacy_state
+    assert spec_state.round == legacy_state.round, legacy_state
+    assert spec_state.valid_actions() == legacy_state.valid_actions(), legacy_state
+
+    return sum(compare(spec_state.take(action, deep=True),
+                       legacy_state.take(action, deep=True))
+               for action in legacy_state.valid_actions())
+
+
+def test_matches_legacy_games():
+    cards = LEDUC.deck()
+    terminals = compare(LEDUC.new_state(cards), Leduc(cards, 2, leduc_eval))
+    assert terminals == LEDUC.compile().terminal.sum(), terminals
+
+    cards = KUHN.deck()
+    terminals = compare(KUHN.new_state(cards), State(cards, 2, kuhn_eval))
+    assert terminals == KUHN.compile().terminal.sum(), terminals
+
+
+def test_board_is_hidden_until_dealt():
+    cards = [Card(14, 1), Card(13, 1), Card(12, 2)]
+    state = LEDUC.new_state(cards)
+
+    assert state.info_set() == "As || [[]]", state.info_set()
+
+    state.take('C')
+    state.take('C')
+
+    assert state.info_set() == "As |Qh| [['C', 'C'], []]", state.info_set()
+
+
+def test_game_for():
+    assert game_for(LEDUC.deck(), 2) == LEDUC
+    assert game_for(KUHN.deck(), 2) == KUHN
+    assert game_for(KUHN.deck(), 3) == KUHN.replace(num_players=3)
+
+
+def test_spec_validation():
+    with pytest.raises(ValueError):
+        GameSpec(ranks=(14, 13), num_players=3)
+
+    with pytest.raises(ValueError):
+        GameSpec(ranks=(14, 13, 12), board_cards=(0, 1), bet_sizes=(2,))
+
+
+def test_public_tree():
+    tree = LEDUC.compile()
+
+    assert tree is LEDUC.compile()
+    assert tree.valid_actions(0) == ['F', 'C', '2R'], tree.valid_actions(0)
+
+    node = tree.child(tree.child(0, 'C'), 'C')
+    assert tree.round[node] == 1 and tree.valid_actions(node) == ['F', 'C', '4R']
+
+    np.random.seed(0)
+    deck = LEDUC.deck()
+    for _ in range(20):
+        cards = [deck[i] for i in np.random.choice(len(deck), 3, replace=False)]
+        state = LEDUC.new_state(cards)
+        while not state.terminal:
+            actions = state.valid_actions()
+            state.take(actions[np.random.choice(len(actions))])
+
+        assert np.array_equal(tree.utility(tree.node(state), cards), state.utility())
+
+
+def test_larger_variant():
+    spec = LEDUC.replace(ranks=(14, 13, 12, 11), num_players=3,
+                         board_cards=(0, 1, 1), bet_sizes=(2, 4, 4))
+    state = spec.new_state(spec.deck()[:spec.num_cards])
+
+    state.take('F')
+    state.take('C')
+
+    assert state.round == 0 and state.turn == 2, state
+
+    state.take('C')
+
+    assert state.round == 1 and state.turn == 1, state
+    assert len(state.board()) == 1, state.board()
+
+    state.take('4R')
+    state.take('4R')
+
+    assert state.valid_actions() == ['F', 'C'], state.valid_actions()
+
+    node_map = {i: {} for i in range(spec.num_players)}
+    action_map = {i: {} for i in range(spec.num_players)}
+    learn(50, spec.deck(), spec.num_cards, node_map, action_map, game=spec)
+
+    assert all(len(nodes) > 0 for nodes in node_map.values()), node_map
@@ -0,0 +1,72 @@
+import json
+import pytest
+import numpy as np
+
+from leduc.game import KUHN
+from leduc.history import parse_hand, Auditor, audit
+from leduc.test_policy import kuhn_blueprint
+
+
+def test_parse():
+    text = parse_hand('Ks Qh As | C 2R C | C C', 3)
+    line = parse_hand(json.dumps({'id': 'a', 'cards': ['Ks', 'Qh', 'As'],
+                                  'actions': [['C', '2R', 'C'], ['C', 'C']], 'agent': 1}), 0)
+    assert text['cards'] == line['cards'] and text['actions'] == line['actions']
+    assert text['id'] == 3 and text['agent'] is None
+    assert line['id'] == 'a' and line['agent'] == 1
+    assert repr(text['cards']) == '[Ks, Qh, As]'
+
+    for line in ['Xx As | C C', '{"cards": ["Ks", "As"]}', '{"cards": 3, "actions": []}']:
+        with pytest.raises(ValueError):
+            parse_hand(line, 0)
+
+
+def test_decisions():
+    node_map, action_map = kuhn_blueprint()
+    auditor = Auditor(node_map, action_map, game=KUHN)
+
+    decisions = auditor.decisions(parse_hand('Ks As | C 1R C', 0))
+    assert [d['action'] for d in decisions] == ['C', 'C']
+    for d in decisions:
+        assert np.isclose(sum(d['blueprint'].values()), 1)
+        assert d['ev'] <= d['best_ev'] + 1e-9
+
+    assert len(auditor.decisions(parse_hand('Ks As | C 1R C', 0) | {'agent': 1})) == 1
+
+    for line in ['Ks | C C', 'Ks Ks | C C', 'Ks 2s | C C']:
+        with pytest.raises(ValueError):
+            auditor.decisions(parse_hand(line, 0))
+    with pytest.raises(ValueError):
+        auditor.decisions(parse_hand('Ks As | C C', 0) | {'agent': 2})
+
+
+def test_audit(tmp_path):
+    node_map, action_map = kuhn_blueprint()
+    histories = []
+    for k in range(2):
+        path = tmp_path / f'hands{k}.txt'
+        path.write_text('# logged hands\nKs As | C C\nXx As | C C\nQs Ks | 1R F\n'
+                        'As Qs | C C C\n')
+        histories.append(str(path))
+
+    result = audit(histories, (node_map, action_map), str(tmp_path / 'out'), workers=2,
+                   game=KUHN)
+    assert result.hands == 4 and result.errors == 4 and result.decisions == 4
+    assert 'hands/sec' in repr(result)
+
+    lines = (tmp_path / 'out' / 'hands0.audit.jsonl').read_text().splitlines()
+    assert [json.loads(line)['info_set'] for line in lines] == [
+        record['info_set'] for hand in [parse_hand('Ks As | C C', 0), parse_hand('Qs Ks | 1R F', 0)]
+        for record in Auditor(node_map, action_map, game=KUHN).decisions(hand)]
+
+
+def test_audit_bug(tmp_path, monkeypatch):
+    node_map, action_map = kuhn_blueprint()
+    path = tmp_path / 'hands.txt'
+    path.write_text('Ks As | C C\n')
+
+    def broken(*args):
+        raise KeyError('bug')
+    monkeypatch.setattr(Auditor, 'decision', broken)
+    with pytest.raises(KeyError):
+        audit([str(path)], (node_map, action_map), str(tmp_path / 'out'), game=KUHN)
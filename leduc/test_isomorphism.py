@@ -0,0 +1,48 @@
+import numpy as np
+
+from collections import Counter
+from itertools import permutations
+from leduc.isomorphism import canonicalize, deal_classes
+from leduc.game import LEDUC
+from leduc.card import Card
+
+
+def test_canonicalize():
+    suits = (1, 2, 3, 4)
+
+    assert canonicalize((Card(13, 3), Card(13, 1)), suits) == (Card(13, 1), Card(13, 2))
+    assert canonicalize((Card(13, 2), Card(12, 2)), suits) == (Card(13, 1), Card(12, 1))
+
+
+def test_deal_classes():
+    deck = LEDUC.replace(suits=(1, 2, 3)).deck()
+
+    for num_cards in [2, 3]:
+        deals, weights = deal_classes(deck, num_cards)
+        counts = Counter(canonicalize(deal, (1, 2, 3)) for deal in permutations(deck, num_cards))
+
+        assert weights.sum() == sum(counts.values()), weights.sum()
+        assert len(deals) == len(counts), len(deals)
+        assert all(counts[tuple(deal)] == weight for deal, weight in zip(deals, weights))
+
+
+def test_uneven_deck():
+    cards = [Card(14, 1), Card(13, 1), Card(14, 2)]
+    deals, weights = deal_classes(cards, 2)
+
+    assert len(deals) == 6 and weights.sum() == 6, deals
+
+
+def test_info_sets_ignore_suits():
+    cards = [Card(13, 2), Card(12, 1), Card(13, 1)]
+    swapped = [Card(13, 1), Card(12, 2), Card(13, 2)]
+    state = LEDUC.new_state(cards)
+    other = LEDUC.new_state(swapped)
+
+    for action in ['C', 'C']:
+        assert state.info_set() == other.info_set(), state.info_set()
+        state.take(action)
+        other.take(action)
+
+    assert state.info_set() == "Ks |Kh| [['C', 'C'], []]", state.info_set()
+    assert np.array_equal(state.utility(), other.utility())
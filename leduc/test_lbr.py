@@ -0,0 +1,57 @@
+import pytest
+import numpy as np
+
+from leduc.game import KUHN, KUHN_3P, LEDUC
+from leduc.lbr import LocalBestResponse, local_best_response
+from leduc.test_policy import kuhn_blueprint
+
+
+def test_lbr():
+    uniform = local_best_response({0: {}, 1: {}}, 1000, game=KUHN, seed=0,
+                                  range_size=20, num_rollouts=10)
+    assert uniform.values.shape == (1000, 2)
+    assert uniform.exploitability() - uniform.confidence() > 0
+
+    node_map, _ = kuhn_blueprint(2000)
+    trained = local_best_response(node_map, 1000, game=KUHN, seed=0,
+                                  range_size=20, num_rollouts=10)
+    assert trained.exploitability() < uniform.exploitability()
+
+
+def test_three_players():
+    result = local_best_response({i: {} for i in range(3)}, 100, game=KUHN_3P,
+                                 rollout='blueprint', seed=0)
+    assert result.values.shape == (100, 3)
+    assert result.exploitability() > 0
+
+
+def test_workers():
+    result = local_best_response({0: {}, 1: {}}, 101, game=KUHN, workers=2, seed=0)
+    assert result.values.shape == (101, 2)
+
+
+def test_unknown_rollout():
+    with pytest.raises(ValueError):
+        LocalBestResponse({0: {}, 1: {}}, KUHN, rollout='fold')
+
+
+def test_large_game():
+    game = LEDUC.replace(ranks=range(2, 15), suits=(1, 2, 3, 4), num_players=3,
+                         board_cards=(0, 1), bet_sizes=(2, 4))
+    result = local_best_response({i: {} for i in range(3)}, 20, game=game, seed=0,
+                                 range_size=20, num_rollouts=10)
+    assert result.values.shape == (20, 3)
+    assert np.isfinite(result.exploitability())
+
+
+def test_global_rng():
+    np.random.seed(3)
+    before = np.random.random()
+    np.random.seed(3)
+    first = local_best_response({0: {}, 1: {}}, 50, game=KUHN, seed=0, range_size=10,
+                                num_rollouts=5)
+    assert np.random.random() == before
+
+    second = local_best_response({0: {}, 1: {}}, 50, game=KUHN, seed=0, range_size=10,
+                                 num_rollouts=5)
+    assert np.array_equal(first.values, second.values)
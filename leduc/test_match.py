@@ -0,0 +1,54 @@
+import numpy as np
+import pytest
+
+from leduc.match import (play_match, play_tables, BlueprintPolicy, CallPolicy,
+                         UniformPolicy, SearchPolicy)
+from leduc.test_policy import kuhn_blueprint
+from leduc.game import KUHN, LEDUC
+from leduc.card import Card
+
+
+def test_play_tables():
+    deals = [[Card(14, 1), Card(13, 1)], [Card(12, 1), Card(14, 1)]]
+    payoffs, corrected = play_tables([CallPolicy(), CallPolicy()], KUHN, deals)
+
+    assert payoffs.shape == (2, 2, 2)
+    assert np.array_equal(payoffs[0], [[1, -1], [-1, 1]]), payoffs
+    assert np.array_equal(payoffs[1], [[-1, 1], [1, -1]]), payoffs
+    assert np.array_equal(payoffs, corrected)
+
+
+def test_match():
+    node_map, _ = kuhn_blueprint(1000)
+    blueprint = BlueprintPolicy(node_map)
+
+    result = play_match([blueprint, UniformPolicy()], 20000, game=KUHN, seed=0)
+
+    assert result.hands >= 20000 and result.hands_per_second() > 0
+    assert np.allclose(result.win_rate().sum(), 0)
+    assert result.win_rate()[0] - result.confidence()[0] > 0, result
+
+    parallel = play_match([blueprint, blueprint], 2000, game=KUHN, workers=2, seed=0)
+    assert parallel.hands == 2000
+    assert abs(parallel.win_rate()[0]) < parallel.confidence()[0] * 2, parallel
+
+
+def test_three_players():
+    node_map = {i: {} for i in range(3)}
+    result = play_match([BlueprintPolicy(node_map), CallPolicy(), UniformPolicy()], 600,
+                        game=KUHN.replace(num_players=3, ranks=(14, 13, 12, 11)), seed=0)
+
+    assert result.payoffs.shape == (100, 6, 3)
+    assert np.allclose(result.win_rate().sum(), 0)
+
+    with pytest.raises(ValueError):
+        play_match([CallPolicy(), CallPolicy()], 10, game=LEDUC.replace(num_players=3))
+
+
+def test_search_policy():
+    node_map, action_map = kuhn_blueprint(200)
+    policy = SearchPolicy(node_map, action_map, game=KUHN)
+    result = play_match([policy, CallPolicy()], 20, game=KUHN, tables=20, seed=0)
+
+    assert result.hands == 20
+    assert 0 < len(policy.searched) <= 4, policy.searched.keys()
@@ -0,0 +1,66 @@
+import pickle
+import numpy as np
+
+from leduc import vanilla
+from leduc.game import KUHN
+from leduc.merge import merge
+from leduc.node import MNode
+from leduc.store import regret_stores
+from leduc.test_policy import kuhn_blueprint
+
+
+def test_merge(tmp_path):
+    runs = [kuhn_blueprint(100) for _ in range(2)]
+    node_map, action_map = merge(runs, weights=[1, .5])
+
+    for player in node_map:
+        assert node_map[player].keys() == runs[0][0][player].keys() | runs[1][0][player].keys()
+        for info_set, node in node_map[player].items():
+            for action in node.actions:
+                expected = sum(weight * run[0][player][info_set].regret_sum[action]
+                               for weight, run in zip([1, .5], runs)
+                               if info_set in run[0][player])
+                assert np.isclose(node.regret_sum[action], expected)
+
+    paths = []
+    for i, (nodes, actions) in enumerate(runs):
+        paths.append((str(tmp_path / f'blueprint{i}.po'), str(tmp_path / f'actions{i}.po')))
+        for obj, path in zip((nodes, actions), paths[-1]):
+            with open(path, 'wb') as f:
+                pickle.dump(obj, f)
+
+    stores = regret_stores(str(tmp_path / 'merged'), 2, cache_size=3)
+    merged, _ = merge((path for path in paths), node_map=stores)
+    for player in node_map:
+        for info_set, node in merge(runs)[0][player].items():
+            assert merged[player][info_set].strategy_sum == node.strategy_sum
+
+
+def test_reconcile_actions():
+    first = MNode(['F', 'C', '2R'])
+    first.regret_sum = {'F': 1, 'C': 2, '2R': 3}
+    second = MNode(['F', 'C', '2R', '3R'])
+    second.regret_sum = {'F': 1, 'C': 1, '2R': 1, '3R': 5}
+
+    node_map, action_map = merge([({0: {'k': first}}, {0: {'k': {'actions': ['F', 'C', '2R']}}}),
+                                  ({0: {'k': second}}, {0: {'k': {'actions': ['F', 'C', '2R', '3R']}}})])
+    assert node_map[0]['k'].actions == ['F', 'C', '2R', '3R']
+    assert node_map[0]['k'].regret_sum == {'F': 2, 'C': 3, '2R': 4, '3R': 5}
+    assert action_map[0]['k']['actions'] == ['F', 'C', '2R', '3R']
+
+
+def test_merge_vanilla():
+    runs = []
+    for _ in range(2):
+        node_map, action_map = {0: {}, 1: {}}, {0: {}, 1: {}}
+        vanilla.learn(50, KUHN.deck(), 2, node_map, action_map, game=KUHN)
+        runs.append((node_map, action_map))
+
+    node_map, action_map = merge(runs)
+    for player in node_map:
+        assert action_map[player].keys() == node_map[player].keys()
+        for info_set, node in node_map[player].items():
+            assert action_map[player][info_set] == node.actions
+            expected = sum(run[0][player][info_set].strategy_sum['C'] for run in runs
+                           if info_set in run[0][player])
+            assert np.isclose(node.strategy_sum['C'], expected)
@@ -0,0 +1,51 @@
+import pytest
+
+from leduc.game import KUHN, LEDUC
+from leduc.policy import PolicyTable
+from leduc.search import Pluribus
+from leduc.util import expected_utility
+
+
+@pytest.fixture(scope='module')
+def trainer():
+    pytest.importorskip('cppimport')
+    from leduc.native import train
+    try:
+        return train(2000)
+    except Exception as e:
+        pytest.skip(f"Couldn't build the C++ trainer: {e}")
+
+
+def test_cpp_game():
+    pytest.importorskip('cppimport')
+    from leduc.native import train, node_maps, coverage
+    try:
+        trainer = train(200, KUHN)
+    except Exception as e:
+        pytest.skip(f"Couldn't build the C++ trainer: {e}")
+
+    node_map, action_map = node_maps(trainer, KUHN)
+    assert coverage(node_map, KUHN) == (12, 12)
+    assert trainer.expectedUtility() == pytest.approx(
+        expected_utility(KUHN.deck(), KUHN.num_cards, 2, node_map, action_map, game=KUHN),
+        abs=1e-5)
+
+
+def test_node_maps(trainer):
+    from leduc.native import node_maps, coverage
+
+    assert len(trainer.expectedUtility()) == 2
+    node_map, action_map = node_maps(trainer)
+    assert all(node_map[player] for player in node_map)
+    assert coverage(node_map) == (468, 468)
+    for player in node_map:
+        assert node_map[player].keys() == action_map[player].keys()
+        for info_set, node in node_map[player].items():
+            assert sum(node.avg_strategy().values()) == pytest.approx(1)
+
+    table = PolicyTable.from_blueprint(node_map)
+    pluribus = Pluribus(node_map, action_map, LEDUC.deck(), LEDUC.num_cards, game=LEDUC)
+    state = pluribus.root
+    assert pluribus.strategy(state) == pytest.approx(
+        table.strategy(state.turn, state.info_set()))
+    assert pluribus.act(state) in state.valid_actions()
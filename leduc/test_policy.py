@@ -0,0 +1,55 @@
+import numpy as np
+
+from leduc.monte import learn
+from leduc.policy import PolicyTable, state_key
+from leduc.game import KUHN
+from leduc.card import Card
+
+np.random.seed(0)
+
+
+def kuhn_blueprint(iterations=200):
+    node_map = {i: {} for i in range(2)}
+    action_map = {i: {} for i in range(2)}
+    learn(iterations, KUHN.deck(), 2, node_map, action_map, game=KUHN)
+    return node_map, action_map
+
+
+def test_policy_table():
+    node_map, _ = kuhn_blueprint()
+    table = PolicyTable.from_blueprint(node_map)
+
+    keys = [(player, info_set) for player in node_map for info_set in node_map[player]]
+    probs = table.lookup(keys + [(0, 'missing')])
+
+    assert len(table) == len(keys) and probs.shape == (len(keys) + 1, len(table.actions))
+    assert np.allclose(probs[:-1].sum(axis=1), 1, atol=1e-5)
+    assert not probs[-1].any()
+
+    for player, info_set in keys:
+        expected = node_map[player][info_set].avg_strategy()
+        strategy = table.strategy(player, info_set)
+        assert strategy.keys() == expected.keys()
+        assert all(abs(strategy[a] - expected[a]) < 1e-6 for a in expected)
+
+
+def test_state_key():
+    node_map, _ = kuhn_blueprint(50)
+    cards = [Card(14, 1), Card(13, 1)]
+    state = KUHN.new_state(cards)
+
+    assert state_key(state) == (0, state.info_set())
+    assert state_key(state, Card(14, 1)) == state_key(state)
+    assert state_key(state, Card(13, 1)) in PolicyTable.from_blueprint(node_map).index
+
+
+def test_save_load(tmp_path):
+    node_map, _ = kuhn_blueprint(50)
+    table = PolicyTable.from_blueprint(node_map)
+    table.save(tmp_path / 'policy.bin')
+    loaded = PolicyTable.load(tmp_path / 'policy.bin')
+
+    assert loaded.keys == table.keys and loaded.actions == table.actions
+    assert np.array_equal(loaded.probs, table.probs)
+    assert np.array_equal(loaded.valid, table.valid)
+    assert loaded.strategy(*table.keys[0]) == table.strategy(*table.keys[0])
@@ -0,0 +1,57 @@
+import numpy as np
+import pytest
+
+from leduc.monte import learn
+from leduc.sampling import get_sampler, SAMPLERS, OutcomeSampler
+from leduc.util import expected_utility
+from leduc.chance import deal_table
+from leduc.card import Card
+
+np.random.seed(0)
+
+
+@pytest.mark.parametrize('name, iterations', [('external', 3000),
+                                              ('outcome', 10000),
+                                              ('chance', 3000)])
+def test_kuhn_converges(name, iterations):
+    num_players = 2
+    node_map = {i: {} for i in range(num_players)}
+    action_map = {i: {} for i in range(num_players)}
+    cards = [Card(14, 1), Card(13, 1), Card(12, 1)]
+    sampler = learn(iterations, cards, 2, node_map, action_map, sampler=name)
+
+    util = expected_utility(cards, 2, 2, node_map, action_map)
+
+    assert sampler.name == name and sampler.iterations == iterations, sampler
+    assert abs(util.sum()) <= 0.0001, f"Util was {util}"
+    assert abs(util[1] - 1/18) <= .03, f"Util not converging {util}"
+
+
+def test_nodes_per_iteration():
+    cards = [Card(14, 1), Card(13, 1), Card(12, 1)]
+    touched = {}
+    for name in SAMPLERS:
+        node_map = {i: {} for i in range(2)}
+        action_map = {i: {} for i in range(2)}
+        sampler = learn(50, cards, 2, node_map, action_map, sampler=name)
+        touched[name] = sampler.nodes_per_iteration()
+
+    assert touched['outcome'] < touched['external'] < touched['chance'], touched
+    assert touched['public_chance'] == 6 * touched['chance'], touched
+
+
+def test_get_sampler():
+    sampler = OutcomeSampler(epsilon=.3)
+
+    assert get_sampler(sampler) is sampler
+
+    with pytest.raises(ValueError):
+        get_sampler('vanilla')
+
+
+def test_public_chance_deals():
+    cards = [Card(14, 1), Card(13, 1), Card(12, 1), Card(14, 2), Card(13, 2), Card(12, 2)]
+    deals = get_sampler('public_chance').deals(deal_table(cards, 3), 2)
+
+    assert len(deals) > 1, deals
+    assert all(deal[2:] == deals[0][2:] for deal in deals), deals
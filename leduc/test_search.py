@@ -0,0 +1,82 @@
+import os
+import sys
+import pickle
+import subprocess
+
+from leduc.search import Pluribus
+from leduc.subgame import fingerprint
+from leduc.policy import PolicyTable
+from leduc.test_policy import kuhn_blueprint
+from leduc.game import KUHN, LEDUC
+
+FIRST_ACTION = """
+import sys
+from leduc.search import Pluribus
+from leduc.subgame import fingerprint
+from leduc.game import KUHN
+pluribus = Pluribus.load({policy!r}, game=KUHN)
+print(pluribus.act(pluribus.root))
+print(any(m in sys.modules for m in ['tqdm', 'leduc.monte', 'leduc.best_response']))
+"""
+
+
+def test_cold_start(tmp_path):
+    node_map, _ = kuhn_blueprint(50)
+    PolicyTable.from_blueprint(node_map).save(tmp_path / 'policy.bin')
+
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    output = subprocess.run(
+        [sys.executable, '-c', FIRST_ACTION.format(policy=str(tmp_path / 'policy.bin'))],
+        env=dict(os.environ, PYTHONPATH=root), check=True, capture_output=True, text=True)
+    action, imported = output.stdout.split()
+
+    assert action in ['F', 'C', '1R'] and imported == 'False', output.stdout
+
+
+def test_lazy_blueprint(tmp_path):
+    node_map, action_map = kuhn_blueprint(50)
+    paths = (tmp_path / 'blueprint.po', tmp_path / 'actions.po')
+    for path, obj in zip(paths, [node_map, action_map]):
+        with open(path, 'wb') as f:
+            pickle.dump(obj, f)
+    PolicyTable.from_blueprint(node_map).save(tmp_path / 'policy.bin')
+
+    pluribus = Pluribus.load(tmp_path / 'policy.bin', *paths, game=KUHN)
+    state = pluribus.root
+    pluribus.frozen[(0, state.info_set())] = (state.valid_actions(), 'C')
+
+    assert pluribus._blueprint is None and pluribus._action_map is None
+    assert pluribus.blueprint.keys() == node_map.keys()
+    assert pluribus.action_map[0][state.info_set()]['frozen'] == 'C'
+
+
+def test_blueprint_strategy(tmp_path):
+    node_map, action_map = kuhn_blueprint(50)
+    state = KUHN.new_state(KUHN.deck()[:2])
+    del node_map[0][state.info_set()]
+
+    pluribus = Pluribus(node_map, action_map, KUHN.deck(), 2, game=KUHN)
+    version = pluribus.version
+    pluribus.observe(state, 'C')
+    assert pluribus.blueprint_strategy(state) == {a: 1 / 3 for a in state.valid_actions()}
+    assert state.info_set() not in node_map[0] and fingerprint(node_map) == version
+
+    PolicyTable.from_blueprint(node_map).save(tmp_path / 'policy.bin')
+    pluribus = Pluribus.load(tmp_path / 'policy.bin', tmp_path / 'missing.po', game=KUHN)
+    pluribus.observe(state, 'C')
+    assert pluribus._blueprint is None
+
+
+def test_play_twice(monkeypatch):
+    pluribus = Pluribus({0: {}, 1: {}}, {0: {}, 1: {}}, LEDUC.deck(), LEDUC.num_cards,
+                        game=LEDUC)
+    monkeypatch.setattr(pluribus, 'act', lambda state: 'C')
+    monkeypatch.setattr(pluribus, 'solve', lambda state: None)
+    prompts = []
+    monkeypatch.setattr('builtins.input', lambda prompt: prompts.append(prompt) or 'C')
+
+    for _ in range(2):
+        prompts.clear()
+        pluribus.play()
+        assert len(prompts) == 2
+        assert pluribus.root.round == 1
@@ -0,0 +1,73 @@
+import os
+import stat
+import pytest
+import threading
+import numpy as np
+
+from multiprocessing import AuthenticationError
+from leduc.server import PolicyServer, PolicyClient
+from leduc.test_policy import kuhn_blueprint
+from leduc.game import KUHN
+from leduc.card import Card
+
+
+def test_server_batches(tmp_path):
+    node_map, action_map = kuhn_blueprint()
+    keys = [(player, info_set) for player in node_map for info_set in node_map[player]]
+    address = str(tmp_path / 'policy.sock')
+    errors = []
+
+    with PolicyServer(node_map, action_map, KUHN.deck(), 2, address=address) as server:
+        expected = server.table.lookup(keys)
+
+        def play():
+            with PolicyClient(address, server.authkey) as client:
+                for _ in range(50):
+                    if not np.array_equal(client.strategy(keys), expected):
+                        errors.append(client.actions)
+
+        threads = [threading.Thread(target=play) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        with PolicyClient(address, server.authkey) as client:
+            stats = client.stats()
+            state = KUHN.new_state([Card(14, 1), Card(13, 1)])
+            probs = client.strategy_states([(state, None), (state, Card(12, 1))])
+
+    assert not errors
+    assert stats['requests'] == 200 and stats['keys'] == 200 * len(keys), stats
+    assert 0 < stats['batches'] <= 200, stats
+    assert np.allclose(probs.sum(axis=1), 1, atol=1e-5)
+
+
+def test_server_search(tmp_path):
+    node_map, action_map = kuhn_blueprint(50)
+    address = str(tmp_path / 'policy.sock')
+
+    with PolicyServer(node_map, action_map, KUHN.deck(), 2, address=address) as server:
+        with PolicyClient(address, server.authkey) as client:
+            state = KUHN.new_state([Card(14, 1), Card(13, 1)])
+            strategy = client.search(state)
+
+    assert abs(sum(strategy.values()) - 1) < 1e-6, strategy
+
+
+def test_server_security(tmp_path):
+    node_map, action_map = kuhn_blueprint(50)
+    address = str(tmp_path / 'policy.sock')
+
+    with PolicyServer(node_map, action_map, KUHN.deck(), 2, address=address) as server:
+        assert stat.S_IMODE(os.stat(address).st_mode) == 0o600
+        assert len(server.authkey) == 32
+        with pytest.raises(AuthenticationError):
+            PolicyClient(address, b'pluribus')
+
+        with PolicyClient(address, server.authkey) as client:
+            with pytest.raises(ValueError):
+                client.search(None)
+            with pytest.raises(ValueError):
+                client.strategy([[0]])
+            assert client.strategy([]).shape == (0, len(client.actions))
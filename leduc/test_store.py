@@ -0,0 +1,65 @@
+import numpy as np
+import pytest
+
+from leduc.game import KUHN, LEDUC
+from leduc.monte import learn, Search
+from leduc.node import MNode
+from leduc.store import RegretStore, regret_stores
+
+
+def train(game, node_map, iterations=200):
+    np.random.seed(3)
+    action_map = {i: {} for i in range(game.num_players)}
+    learn(iterations, game.deck(), game.num_cards, node_map, action_map, game=game)
+    return action_map
+
+
+def assert_same(node_map, other):
+    for player in node_map:
+        assert set(node_map[player]) == set(other[player])
+        for info_set, node in node_map[player].items():
+            for action in node.actions:
+                assert np.isclose(node.regret_sum[action], other[player][info_set].regret_sum[action])
+                assert np.isclose(node.strategy_sum[action],
+                                  other[player][info_set].strategy_sum[action])
+
+
+def test_learn(tmp_path):
+    node_map = {i: {} for i in range(2)}
+    train(LEDUC, node_map)
+
+    stores = regret_stores(str(tmp_path), 2, cache_size=50, capacity=16, batch=8)
+    train(LEDUC, stores)
+    assert stores[0].capacity > 16 and stores[0].misses > 0
+    assert_same(node_map, stores)
+
+    for store in stores.values():
+        store.close()
+    assert_same(node_map, regret_stores(str(tmp_path), 2, cache_size=10))
+
+
+def test_rows(tmp_path):
+    store = RegretStore(str(tmp_path), cache_size=2, width=3)
+    for i in range(5):
+        store[f'info {i}'] = MNode(['F', 'C', '2R'])
+        store[f'info {i}'].regret_sum['C'] += i
+
+    assert len(store) == 5 and list(store) == [f'info {i}' for i in range(5)]
+    assert [store[f'info {i}'].regret_sum['C'] for i in range(5)] == list(range(5))
+    assert 'missing' not in store and store.get('missing') is None
+
+    store.scale(.5)
+    assert store['info 4'].regret_sum['C'] == 2
+
+    with pytest.raises(ValueError):
+        store['wide'] = MNode(['F', 'C', '2R', '4R'])
+
+
+def test_search(tmp_path):
+    stores = regret_stores(str(tmp_path), 2, cache_size=4)
+    action_map = train(KUHN, stores)
+    state = KUHN.new_state(KUHN.deck()[:2])
+    state.take('C')
+
+    solved = Search(state, stores, action_map, KUHN.deck(), 2, iterations=50).search()
+    assert solved[1] and all(type(node) is MNode for node in solved[1].values())
@@ -0,0 +1,130 @@
+import os
+
+from leduc.card import Card
+from leduc.game import KUHN, LEDUC
+from leduc.monte import Search
+from leduc.search import Pluribus
+from leduc.subgame import SubgameCache, public_history, extends, subgame
+from leduc.test_policy import kuhn_blueprint
+
+
+def test_extends():
+    assert public_history("As |Qs| [['2R', 'C'], ['C']]") == [['2R', 'C'], ['C']]
+    assert extends([['C', 'C'], ['2R']], [['C']])
+    assert extends([['C']], [['C']])
+    assert not extends([['2R']], [['C']])
+    assert not extends([['C']], [['C', 'C'], []])
+
+
+def key(*actions, version='v'):
+    state = LEDUC.new_state(LEDUC.deck()[:3])
+    for action in actions:
+        state.take(action)
+    return SubgameCache.key(state, version=version)
+
+
+def test_lru(tmp_path):
+    path = str(tmp_path / 'subgames.po')
+    cache = SubgameCache(max_size=2, path=path)
+    solutions = [{0: {}, 1: {i: None}} for i in range(4)]
+    for i, actions in enumerate([(), ('C',), ('2R',)]):
+        cache.put(key(*actions), solutions[i])
+
+    assert len(cache) == 2 and key() not in cache
+    assert cache.get(key('C')) is solutions[1] and cache.hits == 1
+    assert cache.get(key()) is None and cache.misses == 1
+
+    cache.put(key('C', '2R'), solutions[3])
+    assert key('C') in cache and key('2R') not in cache
+    assert cache.nearest(key('C', '2R', '2R')) is solutions[3]
+    assert cache.nearest(key('2R', '2R')) is None
+    assert cache.nearest(key('C', version='w')) is None
+    cache.close()
+    assert SubgameCache(path=path).entries.keys() == cache.entries.keys()
+
+
+def test_save_every(tmp_path):
+    path = tmp_path / 'subgames.po'
+    with SubgameCache(path=str(path), save_every=2) as cache:
+        cache.put(key(), {0: {}, 1: {}})
+        assert not path.exists()
+        cache.put(key('C'), {0: {}, 1: {}})
+        assert len(SubgameCache(path=str(path))) == 2
+
+        cache.put(key('2R'), {0: {}, 1: {}})
+    assert len(SubgameCache(path=str(path))) == 3 and os.listdir(tmp_path) == ['subgames.po']
+
+
+def test_key():
+    state = LEDUC.new_state(LEDUC.deck()[:3])
+    state.take('C')
+    injected = {("[['C']]", '1R'), ("[['2R']]", '1R')}
+
+    root, board, actions, version = SubgameCache.key(state, injected, 'v')
+    assert root == "[['C']]" and board == '' and version == 'v'
+    assert actions == (("[['C']]", '1R'),)
+
+    state.take('C')
+    assert SubgameCache.key(state)[1] == str(Card(state.cards[2].rank, 1))
+
+    other = LEDUC.new_state(LEDUC.deck()[:2] + [Card(state.cards[2].rank, 2)])
+    other.take('C')
+    other.take('C')
+    assert SubgameCache.key(other) == SubgameCache.key(state)
+
+
+def test_cache_hit():
+    node_map, action_map = kuhn_blueprint()
+    pluribus = Pluribus(node_map, action_map, KUHN.deck(), 2, game=KUHN)
+    state = KUHN.new_state(KUHN.deck()[:2])
+
+    solution = pluribus.solve(state)
+    assert pluribus.solve(state) is solution
+    assert pluribus.cache.hits == 1 and pluribus.cache.misses == 1
+    assert solution[0].keys() == node_map[0].keys()
+
+
+def test_warm_start():
+    node_map, action_map = kuhn_blueprint()
+    state = KUHN.new_state(KUHN.deck()[:2])
+    state.take('C')
+
+    solved = Search(state, node_map, action_map, KUHN.deck(), 2, iterations=100).search()
+    warm_start = subgame(solved, state.history[:1])
+    assert any(warm_start.values())
+    seeded = Search(state, node_map, action_map, KUHN.deck(), 2, iterations=0,
+                    warm_start=warm_start).search()
+
+    for player in seeded:
+        for info_set, node in seeded[player].items():
+            expected = warm_start[player].get(info_set, node_map[player].get(info_set))
+            assert node.regret_sum == expected.regret_sum
+
+
+def test_nearest():
+    cache = SubgameCache()
+    cache.put(("[['C']]", '', (), 'v'), 'check')
+    cache.put(("[['2R']]", '', (), 'v'), 'raise')
+    cache.put(("[['C', '2R']]", '', (), 'v'), 'check raise')
+
+    assert cache.nearest(("[['C', 'C']]", '', (), 'v')) == 'check'
+    assert cache.nearest(("[['C', '2R', 'C']]", '', (), 'v')) == 'check raise'
+    assert cache.nearest(("[['2R', 'C']]", '', (), 'v')) == 'raise'
+    assert cache.nearest(("[['4R']]", '', (), 'v')) is None
+    assert cache.nearest(("[['C']]", 'Ks', (), 'v')) is None
+
+
+def test_unseeded_search():
+    node_map, action_map = kuhn_blueprint()
+    state = KUHN.new_state(KUHN.deck()[:2])
+    state.take('C')
+
+    unrelated = {0: {}, 1: {}}
+    search = Search(state, node_map, action_map, KUHN.deck(), 2, iterations=0,
+                    warm_start=unrelated, warm_iterations=50)
+    assert search.seed(subgame(node_map, state.history[:1]), action_map) == 0
+
+    solution = search.search()
+    for player in solution:
+        for info_set, node in solution[player].items():
+            assert node.regret_sum == node_map[player][info_set].regret_sum
@@ -0,0 +1,43 @@
+import pytest
+
+from leduc.game import KUHN, LEDUC
+from leduc.search import Pluribus
+from leduc.translation import pseudo_harmonic, translate, pot
+from leduc.test_policy import kuhn_blueprint
+
+
+def test_pseudo_harmonic():
+    assert pseudo_harmonic(.5, .5, 1) == 1
+    assert pseudo_harmonic(1, .5, 1) == 0
+    assert 0 < pseudo_harmonic(.75, .5, 1) < 1
+
+
+def test_translate():
+    state = LEDUC.new_state(LEDUC.deck()[:3])
+    assert pot(state) == 2
+
+    assert translate(state, '2R', ['F', 'C', '2R']) == ('2R', 0)
+    assert translate(state, '3R', ['F', 'C', '2R']) == ('2R', pytest.approx(.5 / 2.5))
+    assert translate(state, '1R', ['F', 'C', '2R', '4R'])[0] == '2R'
+    assert translate(state, '3R', ['F', 'C', '2R', '4R'])[0] in ['2R', '4R']
+    assert translate(state, '3R', ['F', 'C']) == (None, float('inf'))
+
+
+def test_translated_raise():
+    node_map, action_map = kuhn_blueprint()
+    pluribus = Pluribus(node_map, action_map, KUHN.deck(), 2, game=KUHN)
+
+    state = KUHN.new_state(KUHN.deck()[:2])
+    state.take('C')
+    pluribus.opponent_turn('2R', state)
+    assert str(state) == "[['C', '2R']]"
+    assert str(pluribus.abstract_state(state)) == "[['C', '1R']]"
+    assert pluribus.cache.misses == 0 and pluribus.node_map is None
+
+    pluribus.reset()
+    state = KUHN.new_state(KUHN.deck()[:2])
+    state.take('C')
+    pluribus.opponent_turn('5R', state)
+    assert str(pluribus.abstract_state(state)) == "[['C', '5R']]"
+    assert pluribus.cache.misses == 1 and pluribus.injected == {("[['C']]", '5R')}
+    assert pluribus.act(pluribus.abstract_state(state)) in ['F', 'C']
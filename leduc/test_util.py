@@ -0,0 +1,67 @@
+import pytest
+import numpy as np
+
+from leduc.game import KUHN
+from leduc.test_policy import kuhn_blueprint
+from leduc.util import expected_utility, estimate_utility
+
+
+def test_sampled():
+    node_map, action_map = kuhn_blueprint()
+    args = (KUHN.deck(), 2, 2, node_map, action_map)
+    exact = expected_utility(*args, game=KUHN)
+
+    for sample_actions in [False, True]:
+        mean, error, deals = estimate_utility(*args, game=KUHN, max_deals=3000,
+                                              sample_actions=sample_actions, seed=1)
+        assert deals == 3000
+        assert np.all(np.abs(mean - exact) <= 5 * error + 1e-9)
+
+    sampled = expected_utility(*args, game=KUHN, sampled=True, max_deals=200, seed=1)
+    assert sampled.shape == exact.shape
+
+
+def test_stopping():
+    node_map, action_map = kuhn_blueprint()
+    args = (KUHN.deck(), 2, 2, node_map, action_map)
+
+    _, error, deals = estimate_utility(*args, game=KUHN, precision=.1, batch=50, seed=0)
+    assert error.max() <= .1 and deals < 1000000
+
+    _, _, deals = estimate_utility(*args, game=KUHN, time_budget=0, batch=50, seed=0)
+    assert deals == 50
+
+    _, _, deals = estimate_utility(*args, game=KUHN, max_deals=130, batch=50, seed=0)
+    assert deals == 130
+
+    _, _, deals = estimate_utility(*args, game=KUHN, max_deals=None, time_budget=0,
+                                   batch=50, seed=0)
+    assert deals == 50
+
+    with pytest.raises(ValueError):
+        estimate_utility(*args, game=KUHN, max_deals=0)
+
+
+def test_global_rng():
+    node_map, action_map = kuhn_blueprint()
+    np.random.seed(3)
+    before = np.random.random()
+    np.random.seed(3)
+    first = estimate_utility(KUHN.deck(), 2, 2, node_map, action_map, game=KUHN,
+                             max_deals=100, sample_actions=True, seed=0)
+    assert np.random.random() == before
+
+    second = estimate_utility(KUHN.deck(), 2, 2, node_map, action_map, game=KUHN,
+                              max_deals=100, sample_actions=True, seed=0)
+    assert np.array_equal(first[0], second[0])
+
+
+def test_workers():
+    node_map, action_map = kuhn_blueprint()
+    mean, _, deals = estimate_utility(KUHN.deck(), 2, 2, node_map, action_map, game=KUHN,
+                                      max_deals=400, batch=100, workers=2, seed=0)
+    assert deals == 400 and np.isclose(mean.sum(), 0)
+
+    _, _, deals = estimate_utility(KUHN.deck(), 2, 2, node_map, action_map, game=KUHN,
+                                   max_deals=250, batch=100, workers=2, seed=0)
+    assert deals == 250
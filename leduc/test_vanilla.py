@@ -1,8 +1,9 @@
 import json
 import numpy as np
+import pytest
 
 
-from leduc.vanilla import learn
+from leduc.vanilla import learn, get_mode, MODES
 from leduc.util import expected_utility
 from leduc.best_response import exploitability
 from leduc.card import Card
@@ -46,3 +47,28 @@ def test_expected_utility_three_player():
 
     assert abs(util.sum()) <= 0.0001, f"Something weird, not a zero sum game"
     assert np.abs(util).sum() > 0, f"Util was {util}"
+
+
+@pytest.mark.parametrize('mode', list(MODES))
+def test_modes(mode):
+    np.random.seed(0)
+    node_map = {i: {} for i in range(2)}
+    action_map = {i: {} for i in range(2)}
+    cards = [Card(14, 1), Card(13, 1), Card(12, 1)]
+    iterations = learn(5000, cards, 2, node_map, action_map, mode=mode,
+                       target=.005, check_every=100)
+
+    exploit = exploitability(cards, 2, node_map, action_map)
+
+    assert iterations < 5000 and iterations % 100 == 0, iterations
+    assert exploit <= .005, f"Exploitability was : {exploit}"
+    if get_mode(mode).plus:
+        assert all(r >= 0 for nodes in node_map.values() for node in nodes.values()
+                   for r in node.regret_sum.values())
+
+
+def test_get_mode():
+    assert get_mode(MODES['dcfr']) is MODES['dcfr']
+
+    with pytest.raises(ValueError):
+        get_mode('cfr++')
@@ -0,0 +1,54 @@
+"""Action translation. An off-tree raise is mapped onto the blueprint raises
+at that info set, sizes taken as fractions of the pot: pseudo-harmonically
+at random between two sizes, to the closest one outside them. `Pluribus`
+plays on the translated history, keeps the real one for payoffs and only
+injects and searches the raise when the error, the size difference as a
+fraction of the pot after the bet, is above its `threshold`.
+"""
+import random
+
+from bisect import bisect
+
+
+def raise_size(action):
+    return int(action[:-1])
+
+
+def pot(state):
+    """Chips in the pot once the player to act has called."""
+    bets = [p.bets for p in state.players]
+    return sum(bets) + max(bets) - bets[state.turn]
+
+
+def pseudo_harmonic(x, a, b):
+    """Probability of mapping a bet of `x` onto the smaller size `a` rather
+    than `b`, all sizes as fractions of the pot."""
+    return (b - x) * (1 + a) / ((b - a) * (1 + x))
+
+
+def translate(state, action, valid_actions):
+    """Maps an off-tree raise onto a raise of `valid_actions`.
+
+    Bets between two abstract sizes are mapped onto one of them at random
+    with the pseudo-harmonic mapping, bets outside the range onto the
+    closest size. Returns the abstract action and the translation error,
+    the size difference as a fraction of the pot after the bet, or
+    (None, inf) when there is nothing to map onto.
+    """
+    sizes = sorted(raise_size(a) for a in valid_actions if a.endswith('R'))
+    if not sizes or not action.endswith('R'):
+        return None, float('inf')
+
+    chips = pot(state)
+    x = raise_size(action) / chips
+    fractions = [size / chips for size in sizes]
+    if x <= fractions[0]:
+        size = sizes[0]
+    elif x >= fractions[-1]:
+        size = sizes[-1]
+    else:
+        i = bisect(fractions, x)
+        a, b = fractions[i - 1], fractions[i]
+        size = sizes[i - 1] if random.random() < pseudo_harmonic(x, a, b) else sizes[i]
+
+    return f'{size}R', abs(x - size / chips) / (1 + x)
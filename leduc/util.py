@@ -1,25 +1,42 @@
+"""Expected utility of a blueprint, over every deal or, with
+`sampled=True`, estimated from sampled deals by `estimate_utility`, which
+makes games with more cards tractable.
+"""
+import time
 import numpy as np
 
-from itertools import permutations
+from collections import deque
+from itertools import islice
+from multiprocessing import Pool
 from tqdm import tqdm
+from leduc.game import game_for
+from leduc.chance import deal_table
+
+_worker = {}
+
 
 def expected_utility(cards, num_cards, num_players,
-                     node_map, action_map):
-    if len(cards) > 4:
-        from leduc.state import Leduc as State
-        from leduc.hand_eval import leduc_eval as eval
-    else:
-        from leduc.state import State
-        from leduc.hand_eval import kuhn_eval as eval
+                     node_map, action_map, game=None, sampled=False, **kwargs):
+    """Expected utility of every player when all play the average strategy
+    of `node_map`, over every deal. With `sampled=True` it's estimated by
+    `estimate_utility` instead, which takes the extra keyword arguments."""
+    if sampled:
+        return estimate_utility(cards, num_cards, num_players, node_map, action_map,
+                                game=game, **kwargs)[0]
+
+    if game is None:
+        game = game_for(cards, num_players)
+
     cards = sorted(cards)
-    all_combos = [list(t) for t in set(permutations(cards, num_cards))]
+    all_combos, weights, _ = deal_table(cards, num_cards).classes()
 
     expected_utility = np.zeros(num_players)
-    for card in tqdm(all_combos, desc='calculating expected utility'):
-        hand = State(card, num_players, eval)
-        expected_utility += traverse_tree(hand, node_map, action_map)
+    for card, weight in tqdm(zip(all_combos, weights), total=len(all_combos),
+                             desc='calculating expected utility'):
+        hand = game.new_state(card)
+        expected_utility += traverse_tree(hand, node_map, action_map) * weight
 
-    return expected_utility/len(all_combos)
+    return expected_utility/weights.sum()
 
 
 def traverse_tree(hand, node_map, action_map):
@@ -41,6 +58,122 @@ def traverse_tree(hand, node_map, action_map):
 
     return util
 
+
+def sample_tree(hand, node_map, action_map, rng):
+    """Utility of one trajectory with actions drawn from the average
+    strategy by `rng`, an unbiased estimate of `traverse_tree`."""
+    while not hand.terminal:
+        info_set = hand.info_set()
+        strategy = node_map[hand.turn][info_set].avg_strategy()
+        valid_actions = action_map[hand.turn][info_set]
+        if 'actions' in valid_actions:
+            valid_actions = valid_actions['actions']
+
+        probs = np.array([strategy[action] for action in valid_actions])
+        action = valid_actions[rng.choice(len(valid_actions), p=probs / probs.sum())]
+        hand = hand.take(action, deep=True)
+
+    return hand.utility()
+
+
+def init_worker(*args):
+    _worker['args'] = args
+
+
+def utility_batch(size, sample_actions, seed, args=None):
+    """Utilities of `size` deals drawn uniformly, one row per deal. Each
+    deal is drawn on its own, so the deal table is never built."""
+    game, cards, num_cards, node_map, action_map = _worker['args'] if args is None else args
+    rng = np.random.default_rng(seed)
+
+    utilities = []
+    for _ in range(size):
+        deal = [cards[i] for i in rng.permutation(len(cards))[:num_cards]]
+        hand = game.new_state(deal)
+        if sample_actions:
+            utilities.append(sample_tree(hand, node_map, action_map, rng))
+        else:
+            utilities.append(traverse_tree(hand, node_map, action_map))
+    return np.array(utilities)
+
+
+def utility_stream(cards, num_cards, num_players, node_map, action_map, game=None,
+                   batch=100, sample_actions=False, workers=1, seed=None,
+                   max_deals=None):
+    """Yields the number of deals sampled so far with the running mean and
+    standard error of every player's utility after each batch of deals,
+    until `max_deals` deals, the last batch cut short to hit it exactly,
+    or without end. Batches run in `workers` processes when it's above 1."""
+    if game is None:
+        game = game_for(cards, num_players)
+    args = (game, sorted(cards), num_cards, node_map, action_map)
+    seeds = np.random.SeedSequence(seed)
+
+    def next_seed():
+        return seeds.spawn(1)[0].generate_state(1)[0]
+
+    def sizes():
+        queued = 0
+        while max_deals is None or queued < max_deals:
+            size = batch if max_deals is None else min(batch, max_deals - queued)
+            queued += size
+            yield size
+
+    def batches():
+        if workers == 1:
+            for size in sizes():
+                yield utility_batch(size, sample_actions, next_seed(), args)
+            return
+
+        queue = sizes()
+        with Pool(workers, initializer=init_worker, initargs=args) as pool:
+            pending = deque(pool.apply_async(utility_batch, (size, sample_actions, next_seed()))
+                            for size in islice(queue, 2 * workers))
+            while pending:
+                result = pending.popleft().get()
+                for size in islice(queue, 1):
+                    pending.append(pool.apply_async(utility_batch,
+                                                    (size, sample_actions, next_seed())))
+                yield result
+
+    total = np.zeros(num_players)
+    squares = np.zeros(num_players)
+    deals = 0
+    for values in batches():
+        total += values.sum(axis=0)
+        squares += (values ** 2).sum(axis=0)
+        deals += len(values)
+
+        mean = total / deals
+        variance = np.maximum(squares - deals * mean ** 2, 0) / max(deals - 1, 1)
+        yield deals, mean, np.sqrt(variance / deals)
+
+
+def estimate_utility(cards, num_cards, num_players, node_map, action_map, game=None,
+                     precision=None, time_budget=None, max_deals=1000000, batch=100,
+                     sample_actions=False, workers=1, seed=None):
+    """Monte Carlo `expected_utility` over sampled deals, walking each deal's
+    tree or, with `sample_actions`, one trajectory of it. Stops once every
+    player's standard error is at most `precision`, after `time_budget`
+    seconds or after `max_deals` deals, whichever comes first. Returns the
+    mean, the standard error and the number of deals."""
+    if max_deals is not None and max_deals < 1:
+        raise ValueError(f"max_deals has to be at least 1, got {max_deals}")
+
+    start = time.perf_counter()
+    stream = utility_stream(cards, num_cards, num_players, node_map, action_map, game,
+                            batch, sample_actions, workers, seed, max_deals)
+    progress = tqdm(stream, desc='estimating expected utility')
+    for deals, mean, error in progress:
+        progress.set_postfix(error=f'{error.max():.4f}')
+        if ((max_deals is not None and deals >= max_deals) or
+                (time_budget is not None and time.perf_counter() - start >= time_budget) or
+                (precision is not None and deals > batch and error.max() <= precision)):
+            break
+    stream.close()
+
+    return mean, error, deals
+
     
 def bias(strategy, action_to_bias):
     new_strat = {k:(v if k != action_to_bias else v * 5) for k, v in strategy.items()}
@@ -1,32 +1,126 @@
+"""Full tree CFR. `learn` runs `mode` `vanilla` (default), `cfr+` (regrets
+floored at zero, linear averaging, alternating updates), `linear` or
+`dcfr`, stops once the exploitability checked every `check_every`
+iterations reaches `target` and returns the iterations it ran.
+`python vanilla.py [target]` compares the modes on Kuhn.
+"""
 import sys
-import json
 import numpy as np
 
-from itertools import permutations
 from tqdm import tqdm
 from leduc.best_response import exploitability
 from leduc.node import Node
-from leduc.card import Card
-from leduc.util import expected_utility
-
-
-def learn(iterations, cards, num_cards, node_map, action_map):
-    if len(cards) > 4:
-        from leduc.state import Leduc as State
-        from leduc.hand_eval import leduc_eval as eval
-    else:
-        from leduc.state import State
-        from leduc.hand_eval import kuhn_eval as eval
-    all_combos = [list(t) for t in set(permutations(cards, num_cards))]
+from leduc.game import game_for, KUHN
+from leduc.chance import deal_table
+
+
+class Mode:
+    """Regret and averaging rules of a CFR variant.
+
+    After iteration t positive regrets are scaled by t^alpha / (t^alpha + 1),
+    negative ones by t^beta / (t^beta + 1) and the strategy sums by
+    (t / (t + 1))^gamma, None leaves them alone. `plus` floors regrets at
+    zero and `alternating` updates one player per traversal.
+    """
+    def __init__(self, name, alpha=None, beta=None, gamma=None, plus=False,
+                 alternating=False):
+        self.name = name
+        self.alpha = alpha
+        self.beta = beta
+        self.gamma = gamma
+        self.plus = plus
+        self.alternating = alternating
+
+    def factors(self, t):
+        """Scales of the positive regrets, negative regrets and strategy
+        sums after iteration t, None when nothing is discounted."""
+        if self.alpha is None and self.beta is None and self.gamma is None:
+            return None
+
+        positive = t ** self.alpha / (t ** self.alpha + 1) if self.alpha is not None else 1
+        negative = t ** self.beta / (t ** self.beta + 1) if self.beta is not None else 1
+        average = (t / (t + 1)) ** self.gamma if self.gamma is not None else 1
+
+        return positive, negative, average
+
+    def discount(self, node_map, t):
+        factors = self.factors(t)
+        if factors is None:
+            return
+
+        positive, negative, average = factors
+        for player in node_map:
+            for node in node_map[player].values():
+                for action, regret in node.regret_sum.items():
+                    node.regret_sum[action] = regret * (positive if regret > 0 else negative)
+                for action, total in node.strategy_sum.items():
+                    node.strategy_sum[action] = total * average
+
+    def __repr__(self):
+        return self.name
+
+
+MODES = {mode.name: mode for mode in [
+    Mode('vanilla'),
+    Mode('cfr+', gamma=1, plus=True, alternating=True),
+    Mode('linear', alpha=1, beta=1, gamma=1),
+    Mode('dcfr', alpha=1.5, beta=0, gamma=2, alternating=True),
+]}
+
+
+def get_mode(mode):
+    if isinstance(mode, Mode):
+        return mode
+
+    if mode not in MODES:
+        raise ValueError(f"Unknown mode {mode}, choose from {list(MODES)}")
+
+    return MODES[mode]
+
+
+def learn(iterations, cards, num_cards, node_map, action_map, game=None,
+          mode='vanilla', target=None, check_every=100, backend='python'):
+    """Runs up to `iterations` iterations of `mode` and returns the number
+    run. With a `target` exploitability, stops at the first check, every
+    `check_every` iterations, that reaches it. `backend='numba'` runs the
+    same updates over arrays, see `leduc.flat`."""
+    if game is None:
+        game = game_for(cards, len(node_map))
+
+    mode = get_mode(mode)
+    if backend == 'numba':
+        from leduc.flat import learn_vanilla
+        return learn_vanilla(iterations, cards, num_cards, node_map, action_map,
+                             game, mode, target=target, check_every=check_every)
+    elif backend != 'python':
+        raise ValueError(f"Unknown backend {backend}, choose from ['python', 'numba']")
+
+    table = deal_table(cards, num_cards)
+    hands, _, _ = table.classes()
     num_players = len(node_map)
-    for _ in tqdm(range(iterations), desc="learning"):
-        card = np.random.choice(len(all_combos))
-        state = State(all_combos[card], num_players, eval)
-        probs = np.ones(num_players)
-        accumulate_regrets(state, node_map, action_map, probs)
+    traversers = list(range(num_players)) if mode.alternating else [None]
+    for t in tqdm(range(1, iterations + 1), desc="learning"):
+        hand = hands[table.sample_class()]
+        for traverser in traversers:
+            state = game.new_state(hand)
+            probs = np.ones(num_players)
+            accumulate_regrets(state, node_map, action_map, probs,
+                               traverser=traverser, plus=mode.plus)
 
+        mode.discount(node_map, t)
 
-def accumulate_regrets(state, node_map, action_map, probs):
+        if target is not None and t % check_every == 0:
+            if exploitability(cards, num_cards, node_map, action_map, game=game) <= target:
+                return t
+
+    return iterations
+
+
+def accumulate_regrets(state, node_map, action_map, probs, traverser=None,
+                       plus=False):
+    """One CFR pass over the deal in `state`. With a `traverser` only that
+    player's regrets and average strategy are updated, `plus` floors the
+    regrets at zero."""
     if state.terminal:
         util = state.utility()
         return util
@@ -42,8 +136,9 @@ def accumulate_regrets(state, node_map, action_map, probs):
         node_map[state.turn][info_set] = Node(valid_actions)
 
     node = node_map[state.turn][info_set]
+    update = traverser is None or traverser == state.turn
 
-    strategy = node.strategy(probs[state.turn])
+    strategy = node.strategy(probs[state.turn] if update else 0)
 
     util = {a: 0 for a in valid_actions}
     node_util = np.zeros(len(node_map))
@@ -52,11 +147,14 @@ def accumulate_regrets(state, node_map, action_map, probs):
                     for i, p in enumerate(probs)]
         new_state = state.take(action, deep=True)
         returned = accumulate_regrets(new_state, node_map,
-                                      action_map, new_prob)
+                                      action_map, new_prob, traverser, plus)
 
         util[action] = returned[state.turn]
         node_util += returned * strategy[action]
 
+    if not update:
+        return node_util
+
     reach_prob = 1
     for p, prob in enumerate(probs):
         if p != state.turn:
@@ -65,24 +163,20 @@ def accumulate_regrets(state, node_map, action_map, probs):
     for action in valid_actions:
         regret = util[action] - node_util[state.turn]
         node.regret_sum[action] += regret * reach_prob
+        if plus and node.regret_sum[action] < 0:
+            node.regret_sum[action] = 0
 
     return node_util
 
 
 if __name__ == '__main__':
-    num_players = 2
-    node_map = {i: {} for i in range(num_players)}
-    action_map = {i: {} for i in range(num_players)}
-    cards = [Card(14, 1), Card(13, 1), Card(12, 1), Card(14, 2), Card(13, 2), Card(12, 2)]
-    learn(10000, cards, 3, node_map, action_map)
-
-    for player in node_map:
-        print(f"Player {player}")
-        print('Number of info sets', len(node_map[player]))
-        for info_set, node in node_map[player].items():
-            avg_strat = node.avg_strategy()
-            print(f"{info_set}: {avg_strat}")
-        
-
-    util = expected_utility(cards, 3, 2, node_map, action_map)
-    print(util)
\ No newline at end of file
+    target = float(sys.argv[1]) if len(sys.argv) > 1 else .001
+    cards = KUHN.deck()
+    for mode in MODES:
+        num_players = 2
+        node_map = {i: {} for i in range(num_players)}
+        action_map = {i: {} for i in range(num_players)}
+        iterations = learn(100000, cards, 2, node_map, action_map, game=KUHN,
+                           mode=mode, target=target)
+        exploit = exploitability(cards, 2, node_map, action_map, game=KUHN)
+        print(f"{mode}: {iterations} iterations to exploitability {exploit:.5f}")
@@ -0,0 +1,29 @@
+import sys
+import time
+import numpy as np
+
+from leduc.card import encode
+from spin_n_go.hand_eval import deck, evaluate
+from spin_n_go.lookup import hand_tables
+
+
+def evaluations_per_second(evaluator, hands, repeat=3):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        evaluator(hands)
+    return repeat * len(hands) / (time.perf_counter() - start)
+
+
+if __name__ == '__main__':
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+
+    rng = np.random.default_rng(0)
+    codes = encode(deck()).astype(np.int64)
+    tables = hand_tables()
+    for size in (5, 6, 7):
+        hands = codes[np.argsort(rng.random((n, len(codes))), axis=1)[:, :size]]
+        for batch in (1000, n):
+            direct = evaluations_per_second(evaluate, hands[:batch])
+            lookup = evaluations_per_second(tables.evaluate, hands[:batch])
+            print(f"{size} cards, batches of {batch}: direct {direct:,.0f} evaluations/sec, "
+                  f"lookup {lookup:,.0f} evaluations/sec")
@@ -0,0 +1,37 @@
+import sys
+import time
+import random
+
+from spin_n_go.game import SPIN
+
+
+def traverse(state, player):
+    """External sampling walk: every action of `player`, one sampled
+    action elsewhere. Returns the number of nodes visited."""
+    if state.terminal:
+        state.utility(player)
+        return 1
+
+    actions = state.valid_actions()
+    state.info_set()
+    if state.turn != player:
+        actions = [random.choice(actions)]
+
+    nodes = 1
+    for action in actions:
+        nodes += traverse(state.apply(action), player)
+        state.undo()
+    return nodes
+
+
+if __name__ == '__main__':
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+
+    nodes = 0
+    start = time.perf_counter()
+    for i in range(iterations):
+        state = SPIN.new_state(button=i % 3)
+        nodes += traverse(state, i % 3)
+    seconds = time.perf_counter() - start
+    print(f"{nodes} nodes in {seconds:.1f}s: {nodes / seconds:,.0f} nodes/sec, "
+          f"{60 * nodes / seconds / 1e6:.2f}M nodes/min")
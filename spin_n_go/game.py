@@ -0,0 +1,60 @@
+from spin_n_go.hand_eval import deck
+from spin_n_go.state import SpinNGoState
+
+
+class SpinSpec:
+    """Blinds and bet abstraction of a no-limit Hold'em Spin & Go table.
+
+    Amounts are in chips. `bet_sizes` are the raises allowed as fractions
+    of the pot once the raiser has called, either one tuple for every
+    street or one tuple per street; going all in is always allowed.
+    """
+    def __init__(self, small_blind=10, big_blind=20, ante=0, bet_sizes=(.5, 1.),
+                 num_players=3, starting_stack=500):
+        if bet_sizes and not isinstance(bet_sizes[0], (tuple, list)):
+            bet_sizes = (tuple(bet_sizes),) * 4
+        if len(bet_sizes) != 4:
+            raise ValueError("bet_sizes needs one tuple per street or a single tuple")
+
+        self.small_blind = small_blind
+        self.big_blind = big_blind
+        self.ante = ante
+        self.bet_sizes = tuple(tuple(sizes) for sizes in bet_sizes)
+        self.num_players = num_players
+        self.starting_stack = starting_stack
+
+    def key(self):
+        return (self.small_blind, self.big_blind, self.ante, self.bet_sizes,
+                self.num_players, self.starting_stack)
+
+    def __eq__(self, other):
+        return isinstance(other, SpinSpec) and self.key() == other.key()
+
+    def __hash__(self):
+        return hash(self.key())
+
+    def __repr__(self):
+        return (f"SpinSpec(small_blind={self.small_blind}, big_blind={self.big_blind}, "
+                f"ante={self.ante}, bet_sizes={self.bet_sizes}, "
+                f"num_players={self.num_players}, starting_stack={self.starting_stack})")
+
+    def replace(self, **kwargs):
+        params = dict(small_blind=self.small_blind, big_blind=self.big_blind, ante=self.ante,
+                      bet_sizes=self.bet_sizes, num_players=self.num_players,
+                      starting_stack=self.starting_stack)
+        params.update(kwargs)
+
+        return SpinSpec(**params)
+
+    def deck(self):
+        return deck()
+
+    def new_state(self, stacks=None, cards=None, button=0, **kwargs):
+        if stacks is None:
+            stacks = [self.starting_stack] * self.num_players
+        return SpinNGoState(self, stacks, cards, button, **kwargs)
+
+
+# 500 chip stacks at the first 10/20 level, 25 big blinds each
+SPIN = SpinSpec()
+SPIN_HEADS_UP = SpinSpec(num_players=2, starting_stack=750)
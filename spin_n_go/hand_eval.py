@@ -1,4 +1,93 @@
+import numpy as np
+
+from leduc.card import Card, encode
+
+RANKS = tuple(range(2, 15))
+SUITS = (1, 2, 3, 4)
+HIGH_CARD, PAIR, TWO_PAIR, TRIPS, STRAIGHT, FLUSH, FULL_HOUSE, QUADS, STRAIGHT_FLUSH = range(9)
+CATEGORIES = ('high card', 'pair', 'two pair', 'trips', 'straight', 'flush', 'full house',
+              'quads', 'straight flush')
+
+# bits of the five ranks of every straight, the wheel last
+STRAIGHTS = [(top, sum(1 << r for r in range(top - 4, top + 1))) for top in range(14, 5, -1)]
+STRAIGHTS.append((5, (1 << 14) | sum(1 << r for r in range(2, 6))))
+
+
+def deck():
+    return [Card(rank, suit) for suit in SUITS for rank in RANKS]
+
+
+def category(score):
+    return CATEGORIES[int(score) >> 20]
+
+
+def straight_tops(masks):
+    """Top rank of the best straight in each rank bit mask, 0 if none."""
+    tops = np.zeros(len(masks), dtype=np.int64)
+    for top, bits in reversed(STRAIGHTS):
+        tops = np.where((masks & bits) == bits, top, tops)
+    return tops
+
+
+def kickers(ranks):
+    """Packs the first five ranks of each row, four bits each."""
+    ranks = ranks[:, :5]
+    return sum(ranks[:, j].astype(np.int64) << (4 * (4 - j)) for j in range(5))
+
+
+def evaluate(cards):
+    """Scores of an (n, k) array of card codes, 5 <= k <= 7, higher is
+    better. The category takes the bits above 20 and the five ranks that
+    break ties four bits each below it."""
+    cards = np.asarray(cards, dtype=np.int64)
+    ranks, suits = cards >> 2, cards & 3
+    n = len(cards)
+    rows = np.arange(n)
+
+    counts = np.zeros((n, 15), dtype=np.int64)
+    np.add.at(counts, (np.repeat(rows, cards.shape[1]), ranks.ravel()), 1)
+    masks = ((counts > 0) << np.arange(15)).sum(axis=1)
+
+    # cards of the largest group first, then the second, then by rank;
+    # next to quads only the highest other card counts, whatever its group
+    group = counts * 16 + np.arange(15)
+    first = group.argmax(axis=1)
+    group[rows, first] = 0
+    second = group.argmax(axis=1)
+    most, next_most = counts[rows, first], counts[rows, second]
+    second_first = (ranks == second[:, None]) & (most != 4)[:, None]
+    order = np.where(ranks == first[:, None], 32, np.where(second_first, 16, 0))
+    ordered = -np.sort(-(order + ranks), axis=1) & 15
+
+    scores = np.where(most == 4, QUADS,
+             np.where((most == 3) & (next_most >= 2), FULL_HOUSE,
+             np.where(most == 3, TRIPS,
+             np.where((most == 2) & (next_most == 2), TWO_PAIR,
+             np.where(most == 2, PAIR, HIGH_CARD))))) << 20
+    scores |= kickers(ordered)
+
+    tops = straight_tops(masks)
+    straight = (tops > 0) & (scores >> 20 < STRAIGHT)
+    scores = np.where(straight, (STRAIGHT << 20) | (tops << 16), scores)
+
+    suit_counts = np.stack([(suits == s).sum(axis=1) for s in range(4)], axis=1)
+    flush_suit = suit_counts.argmax(axis=1)
+    flush = suit_counts[rows, flush_suit] >= 5
+    if flush.any():
+        in_suit = suits[flush] == flush_suit[flush, None]
+        suited = np.where(in_suit, ranks[flush], 0)
+        flush_masks = ((suited[:, :, None] == np.arange(15)).any(axis=1) << np.arange(15)).sum(axis=1)
+        flush_tops = straight_tops(flush_masks)
+        flush_scores = np.where(flush_tops > 0, (STRAIGHT_FLUSH << 20) | (flush_tops << 16),
+                                (FLUSH << 20) | kickers(-np.sort(-suited, axis=1)))
+        scores[flush] = np.maximum(scores[flush], flush_scores)
+
+    return scores
+
+
 def spin_n_go_eval(hand, board):
-    # Implementa la logica per valutare una mano nel contesto del board
-    # Restituisce un valore numerico che rappresenta la forza della mano
-    return 0  # Sostituire con la logica appropriata
+    """Score of the best five card hand out of `hand` and `board`, looked
+    up in the tables of `spin_n_go.lookup`."""
+    from spin_n_go.lookup import lookup_evaluate
+
+    return int(lookup_evaluate(encode(list(hand) + list(board))[None])[0])
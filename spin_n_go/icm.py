@@ -0,0 +1,119 @@
+import numpy as np
+
+from itertools import permutations
+
+WINNER_TAKES_ALL = (1.,)
+# (multiplier of the buy-in, probability, share of the prize pool by place)
+SPIN_MULTIPLIERS = ((2, .75, (1.,)), (3, .15, (1.,)), (5, .07, (1.,)), (10, .02, (1.,)),
+                    (25, .009, (1.,)), (1000, .001, (.8, .1, .1)))
+
+
+def finish_probabilities(stacks):
+    """Malmuth-Harville probabilities of every finishing place, an
+    (n, players, places) array for an (n, players) array of stacks. Each
+    place goes to one of the players left with probability proportional to
+    their stack; busted players share the last places evenly."""
+    stacks = np.asarray(stacks, dtype=float)
+    n, players = stacks.shape
+    places = np.zeros((n, players, players))
+    for order in permutations(range(players)):
+        prob = np.ones(n)
+        remaining = stacks.sum(axis=1)
+        left = players
+        for player in order:
+            stack = stacks[:, player]
+            prob = prob * np.where(remaining > 0, stack / np.where(remaining > 0, remaining, 1),
+                                   1 / left)
+            remaining = remaining - stack
+            left -= 1
+        for place, player in enumerate(order):
+            places[:, player, place] += prob
+
+    return places
+
+
+def icm_equity(stacks, prizes):
+    """Prize equity of every player, with `prizes` by place and only the
+    first as many places as there are players paid."""
+    stacks = np.asarray(stacks, dtype=float)
+    players = stacks.shape[-1]
+    paid = np.zeros(players)
+    paid[:min(players, len(prizes))] = prizes[:players]
+    if not paid[1:].any():
+        total = stacks.sum(axis=-1, keepdims=True)
+        return paid[0] * stacks / np.where(total > 0, total, 1)
+
+    return (finish_probabilities(stacks.reshape(-1, players)) @ paid).reshape(stacks.shape)
+
+
+def spin_prizes(buy_in, multiplier, multipliers=SPIN_MULTIPLIERS):
+    """Prizes by place of a Spin & Go of three `buy_in`s whose prize pool
+    is `multiplier` times the buy-in."""
+    for value, _, shares in multipliers:
+        if value == multiplier:
+            return tuple(buy_in * multiplier * share for share in shares)
+    raise ValueError(f"Unknown multiplier {multiplier}, choose from "
+                     f"{[value for value, _, _ in multipliers]}")
+
+
+def random_prizes(buy_in, rng=None, multipliers=SPIN_MULTIPLIERS):
+    """Prizes of a Spin & Go with the multiplier drawn like the lobby does."""
+    rng = np.random.default_rng() if rng is None else rng
+    probs = np.array([prob for _, prob, _ in multipliers])
+    multiplier = multipliers[rng.choice(len(multipliers), p=probs / probs.sum())][0]
+    return spin_prizes(buy_in, multiplier, multipliers)
+
+
+class ICM:
+    """`icm_equity` for fixed `prizes`, memoized on the stacks as shares of
+    the chips in play rounded to `resolution`. ICM doesn't depend on the
+    scale of the stacks, so every terminal of every hand with the same
+    shares hits the same entry."""
+    def __init__(self, prizes=WINNER_TAKES_ALL, resolution=1e-4):
+        self.prizes = tuple(prizes)
+        self.resolution = resolution
+        self.cache = {}
+        self.hits = 0
+        self.misses = 0
+
+    def quantize(self, stacks):
+        total = stacks.sum(axis=1, keepdims=True)
+        return np.rint(stacks / np.where(total > 0, total, 1) / self.resolution).astype(np.int64)
+
+    def equity(self, stacks):
+        """Prize equities of a stack vector or an (n, players) batch of them."""
+        if not isinstance(stacks, np.ndarray) or stacks.ndim == 1:
+            return self.single(stacks)
+
+        stacks = np.asarray(stacks, dtype=float)
+        batch = np.atleast_2d(stacks)
+        keys, inverse = np.unique(self.quantize(batch), axis=0, return_inverse=True)
+        keys = [tuple(key) for key in keys]
+
+        missing = [i for i, key in enumerate(keys) if key not in self.cache]
+        self.hits += len(keys) - len(missing)
+        self.misses += len(missing)
+        if missing:
+            shares = np.array([keys[i] for i in missing], dtype=float) * self.resolution
+            for i, value in zip(missing, icm_equity(shares, self.prizes)):
+                self.cache[keys[i]] = value
+
+        equity = np.stack([self.cache[key] for key in keys])[np.ravel(inverse)]
+        return equity if stacks.ndim > 1 else equity[0]
+
+    def single(self, stacks):
+        """`equity` of one stack vector without going through numpy on a hit."""
+        total = sum(stacks) or 1
+        key = tuple(round(stack / total / self.resolution) for stack in stacks)
+        equity = self.cache.get(key)
+        if equity is None:
+            self.misses += 1
+            equity = icm_equity(np.array(key, dtype=float) * self.resolution, self.prizes)
+            self.cache[key] = equity
+        else:
+            self.hits += 1
+        return equity
+
+    def __repr__(self):
+        return (f"ICM(prizes={self.prizes}: {len(self.cache)} stacks cached, "
+                f"{self.hits / max(self.hits + self.misses, 1):.0%} hits)")
@@ -0,0 +1,107 @@
+import os
+import numpy as np
+
+from functools import lru_cache
+from itertools import combinations, combinations_with_replacement
+from collections import Counter
+from spin_n_go.hand_eval import evaluate
+
+PRIMES = np.array([2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37, 41], dtype=np.int64)
+TABLE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'tables')
+FILES = ('products', 'classes', 'flush', 'scores')
+# bumped whenever `evaluate` changes, so stale tables are rebuilt
+TABLE_VERSION = 2
+NUM_CLASSES = 7462
+
+
+def rank_multisets():
+    """Ranks 0-12 of every 5, 6 and 7 card hand, no rank more than four times."""
+    return [ranks for size in (5, 6, 7) for ranks in combinations_with_replacement(range(13), size)
+            if max(Counter(ranks).values()) <= 4]
+
+
+def unsuited(ranks):
+    """Card codes with `ranks` and suits dealt in turn, so no flush."""
+    return [(rank + 2) * 4 + j % 4 for j, rank in enumerate(ranks)]
+
+
+def build_tables():
+    """Lookup tables from the direct `evaluate`.
+
+    Hands without a flush are keyed by the product of a prime per rank,
+    unique for every multiset of ranks, and `products` holds the sorted
+    keys with their classes in `classes`. Flushes are indexed directly by
+    the 13 bit mask of the flush suit's ranks in `flush`. Classes number the
+    7462 distinct hand values from worst to best and `scores` maps them
+    back onto `evaluate` scores.
+    """
+    multisets = rank_multisets()
+    products = np.array([PRIMES[list(ranks)].prod() for ranks in multisets])
+    plain = np.concatenate([evaluate([unsuited(ranks) for ranks in multisets if len(ranks) == size])
+                            for size in (5, 6, 7)])
+
+    masks = [sum(1 << r for r in ranks) for size in (5, 6, 7)
+             for ranks in combinations(range(13), size)]
+    flushes = np.concatenate([evaluate([[(r + 2) * 4 for r in ranks]
+                                        for ranks in combinations(range(13), size)])
+                              for size in (5, 6, 7)])
+
+    scores = np.unique(np.concatenate([plain, flushes]))
+    assert len(scores) == NUM_CLASSES, len(scores)
+    order = np.argsort(products)
+    flush = np.zeros(1 << 13, dtype=np.uint16)
+    flush[masks] = np.searchsorted(scores, flushes)
+
+    return {'products': products[order],
+            'classes': np.searchsorted(scores, plain)[order].astype(np.uint16),
+            'flush': flush, 'scores': scores}
+
+
+class HandTables:
+    """Table driven 5 to 7 card evaluator. The tables are built once into
+    `path` and memory mapped from there afterwards."""
+    def __init__(self, path=TABLE_DIR):
+        if not all(os.path.exists(self.file(path, name)) for name in FILES):
+            os.makedirs(path, exist_ok=True)
+            for name, table in build_tables().items():
+                np.save(self.file(path, name), table)
+
+        self.path = path
+        for name in FILES:
+            setattr(self, name, np.load(self.file(path, name), mmap_mode='r'))
+
+    @staticmethod
+    def file(path, name):
+        return os.path.join(path, f'{name}.v{TABLE_VERSION}.npy')
+
+    def strength(self, cards):
+        """Classes of an (n, k) array of card codes, 5 <= k <= 7, from 0 for
+        the worst hand to 7461 for a royal flush."""
+        cards = np.asarray(cards, dtype=np.int64)
+        ranks, suits = (cards >> 2) - 2, cards & 3
+        classes = self.classes[np.searchsorted(self.products, PRIMES[ranks].prod(axis=1))]
+
+        # three bits per suit count the cards of each suit
+        counts = (1 << 3 * suits).sum(axis=1)
+        flush_suit = np.full(len(cards), -1)
+        for suit in range(4):
+            flush_suit[(counts >> 3 * suit & 7) >= 5] = suit
+        flush = flush_suit >= 0
+        if flush.any():
+            in_suit = suits[flush] == flush_suit[flush, None]
+            classes[flush] = self.flush[(in_suit << ranks[flush]).sum(axis=1)]
+
+        return classes
+
+    def evaluate(self, cards):
+        """Same scores as `spin_n_go.hand_eval.evaluate`."""
+        return self.scores[self.strength(cards)]
+
+
+@lru_cache(maxsize=None)
+def hand_tables(path=TABLE_DIR):
+    return HandTables(path)
+
+
+def lookup_evaluate(cards):
+    return hand_tables().evaluate(cards)
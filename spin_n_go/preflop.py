@@ -0,0 +1,191 @@
+import os
+import numpy as np
+
+from itertools import combinations, combinations_with_replacement, permutations
+from tqdm import tqdm
+from leduc.card import Card, encode
+from spin_n_go.hand_eval import deck
+from spin_n_go.lookup import lookup_evaluate, hand_tables
+
+NUM_CLASSES = 169
+EQUITY_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'equity.npy')
+THREE_WAY_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'three_way.npy')
+
+
+def hand_class(first, second):
+    """Index of the starting hand class of two cards in the 13 x 13 grid:
+    pairs on the diagonal, suited hands above it and offsuit ones below,
+    aces first."""
+    high, low = max(first.rank, second.rank), min(first.rank, second.rank)
+    row, col = 14 - high, 14 - low
+    if first.suit != second.suit:
+        row, col = col, row
+    return row * 13 + col
+
+
+def class_name(index):
+    row, col = divmod(index, 13)
+    high, low = Card.CARD_STRING[14 - min(row, col)], Card.CARD_STRING[14 - max(row, col)]
+    if row == col:
+        return high + low
+    return high + low + ('s' if row < col else 'o')
+
+
+def class_combos():
+    """The (first, second) card codes of every two card combo of each class."""
+    combos = [[] for _ in range(NUM_CLASSES)]
+    for first, second in combinations(deck(), 2):
+        combos[hand_class(first, second)].append((int(first), int(second)))
+    return [np.array(c, dtype=np.int64) for c in combos]
+
+
+def class_weights():
+    """Prior probability of being dealt each class."""
+    counts = np.array([len(c) for c in class_combos()], dtype=float)
+    return counts / counts.sum()
+
+
+def sample_matchups(pairs, combos, rng):
+    """A random combo of each class of `pairs` that shares no card with its
+    opponent, as (n, 2) arrays of card codes."""
+    first = np.stack([combos[a][rng.integers(len(combos[a]))] for a in pairs[:, 0]])
+    second = np.empty_like(first)
+    todo = np.arange(len(pairs))
+    while len(todo):
+        second[todo] = np.stack([combos[b][rng.integers(len(combos[b]))] for b in pairs[todo, 1]])
+        clash = (first[todo, :, None] == second[todo, None, :]).any(axis=(1, 2))
+        todo = todo[clash]
+    return first, second
+
+
+def sample_boards(used, rng):
+    """Five random cards per row missing from the cards of `used`."""
+    codes = encode(deck()).astype(np.int64)
+    keys = rng.random((len(used), len(codes)))
+    keys[(used[:, :, None] == codes).any(axis=1)] = 2
+    return codes[np.argsort(keys, axis=1)[:, :5]]
+
+
+def equity_table(samples=500, seed=None, path=EQUITY_PATH, chunk=20000):
+    """Heads-up all-in equity of every class against every other, ties
+    counting half, estimated from `samples` random combos and boards per
+    matchup. The table is read from `path` when it's there and written to
+    it otherwise, pass None to skip the file."""
+    if path is not None and os.path.exists(path):
+        return np.load(path)
+
+    rng = np.random.default_rng(seed)
+    combos = class_combos()
+    pairs = np.array([(a, b) for a in range(NUM_CLASSES) for b in range(a, NUM_CLASSES)])
+    matchups = np.repeat(pairs, samples, axis=0)
+    wins = np.zeros(len(pairs))
+    for start in tqdm(range(0, len(matchups), chunk), desc='equity table'):
+        batch = matchups[start:start + chunk]
+        first, second = sample_matchups(batch, combos, rng)
+        board = sample_boards(np.hstack([first, second]), rng)
+        first_scores = lookup_evaluate(np.hstack([first, board]))
+        second_scores = lookup_evaluate(np.hstack([second, board]))
+        share = (first_scores > second_scores) + .5 * (first_scores == second_scores)
+        np.add.at(wins, (start + np.arange(len(batch))) // samples, share)
+
+    table = np.zeros((NUM_CLASSES, NUM_CLASSES))
+    table[pairs[:, 0], pairs[:, 1]] = wins / samples
+    table[pairs[:, 1], pairs[:, 0]] = 1 - wins / samples
+    np.fill_diagonal(table, .5)
+    if path is not None:
+        np.save(path, table)
+    return table
+
+
+def padded_combos():
+    """`class_combos` as one (classes, 12, 2) array and the number of combos
+    of each class, so combos of many classes are drawn in one go."""
+    combos = class_combos()
+    counts = np.array([len(c) for c in combos])
+    padded = np.zeros((NUM_CLASSES, counts.max(), 2), dtype=np.int64)
+    for i, c in enumerate(combos):
+        padded[i, :len(c)] = c
+    return padded, counts
+
+
+def sample_hands(classes, padded, counts, rng, tries=100):
+    """A random combo of every class in each row of `classes`, no card dealt
+    twice in a row, as an (n, 2 * players) array of card codes. Clashing
+    rows are redrawn whole up to `tries` times; the second array marks the
+    rows that got a deal, rows of classes that can't be dealt together
+    never do."""
+    def draw(rows):
+        pick = (rng.random(rows.shape) * counts[rows]).astype(np.int64)
+        return padded[rows, pick].reshape(len(rows), -1)
+
+    def clashes(hands):
+        ordered = np.sort(hands, axis=1)
+        return (ordered[:, 1:] == ordered[:, :-1]).any(axis=1)
+
+    hands = draw(classes)
+    todo = np.flatnonzero(clashes(hands))
+    for _ in range(tries):
+        if not len(todo):
+            break
+        hands[todo] = draw(classes[todo])
+        todo = todo[clashes(hands[todo])]
+
+    dealt = np.ones(len(classes), dtype=bool)
+    dealt[todo] = False
+    return hands, dealt
+
+
+def pot_shares(hands, board):
+    """Share of the pot every hand of the rows of `hands` wins on `board`,
+    split evenly between tied hands."""
+    strength = hand_tables().strength
+    scores = np.stack([strength(np.hstack([hands[:, 2 * p:2 * p + 2], board]))
+                       for p in range(hands.shape[1] // 2)], axis=1)
+    best = scores == scores.max(axis=1, keepdims=True)
+    return best / best.sum(axis=1, keepdims=True)
+
+
+def three_way_equity(triples, samples, rng, chunk=60000):
+    """All-in equity of each class of the rows of `triples` against the
+    other two, (n, 3), from `samples` random deals per row. Rows that can't
+    be dealt get a third each."""
+    padded, counts = padded_combos()
+    deals = np.repeat(np.asarray(triples), samples, axis=0)
+    shares = np.zeros((len(triples), 3))
+    dealt = np.zeros(len(triples))
+    for start in tqdm(range(0, len(deals), chunk), desc='three-way equity'):
+        rows = (start + np.arange(len(deals[start:start + chunk]))) // samples
+        hands, ok = sample_hands(deals[start:start + chunk], padded, counts, rng)
+        board = sample_boards(hands[ok], rng)
+        np.add.at(shares, rows[ok], pot_shares(hands[ok], board))
+        np.add.at(dealt, rows[ok], 1)
+
+    equity = np.full((len(triples), 3), 1 / 3)
+    equity[dealt > 0] = shares[dealt > 0] / dealt[dealt > 0, None]
+    return equity
+
+
+def three_way_table(samples=100, seed=None, path=THREE_WAY_PATH):
+    """Three-way all-in equity, [h, b, c] for class h against b and c, with
+    card removal between the three hands and ties splitting the pot. Each
+    unordered triple of classes is estimated from `samples` random deals
+    and boards and copied to its permutations. Read from and written to
+    `path` like `equity_table`."""
+    if path is not None and os.path.exists(path):
+        return np.load(path)
+
+    triples = np.array(list(combinations_with_replacement(range(NUM_CLASSES), 3)))
+    equity = three_way_equity(triples, samples, np.random.default_rng(seed))
+    # hands of the same class share their equity
+    for first, second in [(0, 1), (1, 2)]:
+        same = triples[:, first] == triples[:, second]
+        equity[same, first] = equity[same, second] = equity[same][:, [first, second]].mean(axis=1)
+    equity[(triples[:, 0] == triples[:, 2])] = 1 / 3
+
+    table = np.zeros((NUM_CLASSES,) * 3, dtype=np.float32)
+    for order in permutations(range(3)):
+        a, b, c = (triples[:, j] for j in order)
+        table[a, b, c] = equity[:, order[0]]
+    if path is not None:
+        np.save(path, table)
+    return table
@@ -0,0 +1,167 @@
+import sys
+import numpy as np
+
+from itertools import product
+from tqdm import tqdm
+from spin_n_go.preflop import (NUM_CLASSES, equity_table, three_way_table, class_weights,
+                               class_name, hand_class)
+
+BTN, SB, BB = range(3)
+BLINDS = (0., .5, 1.)
+DECISIONS = ('btn_push', 'sb_call', 'sb_push', 'bb_call_btn', 'bb_call_sb', 'bb_call_both')
+STACK_LEVELS = (2, 3, 4, 5, 6, 8, 10, 12, 15, 20, 25)
+CHART_PATH = 'pushfold.npz'
+
+
+class PushFold:
+    """Three-handed all-in or fold game for a batch of stack configurations.
+
+    `stacks` is a (configs, 3) array of the button, small and big blind
+    stacks in big blinds. The button pushes or folds, the small blind calls
+    a push or pushes when folded to and the big blind calls whatever pushes
+    reach it, so a strategy is the push or call probability of every class
+    at each of `DECISIONS`. Payoffs are chip changes; equities come from the
+    heads-up `table` and the three-way table `three`, `three_way_table()`
+    by default. Card removal is ignored between the ranges, not within a
+    matchup.
+    """
+    def __init__(self, table, stacks, three=None):
+        self.table = table
+        self.three = (three_way_table() if three is None else three).reshape(NUM_CLASSES, -1).T
+        self.stacks = np.asarray(stacks, dtype=float)
+        self.prior = class_weights()
+
+    def range(self, strategy):
+        """Probability of the action and the distribution of the classes
+        that take it."""
+        weights = self.prior * strategy
+        prob = weights.sum(axis=1)
+        return prob[:, None], weights / np.maximum(prob, 1e-12)[:, None]
+
+    def equity(self, opponent):
+        return opponent @ self.table.T
+
+    def equity3(self, first, second):
+        outer = (first[:, :, None] * second[:, None, :]).reshape(len(first), -1)
+        return outer.astype(np.float32) @ self.three
+
+    def heads_up(self, equity, player, opponent, dead):
+        stacks = self.stacks
+        effective = np.minimum(stacks[:, player], stacks[:, opponent])[:, None]
+        return equity * (2 * effective + dead) - effective
+
+    def all_in(self, player, first, second, ranges):
+        """Chips `player` ends with, minus what it put in, when all three are
+        all in. The smallest stack plays for the main pot, the other two
+        also for the side pot between them."""
+        stacks = self.stacks
+        others = [p for p in range(3) if p != player]
+        low, mid = np.sort(stacks, axis=1)[:, :2].T
+        main, side = 3 * low, 2 * (mid - low)
+        in_side = stacks[:, player] >= mid
+
+        side_equity = np.where((stacks[:, others[0]] >= stacks[:, others[1]])[:, None],
+                               self.equity(ranges[others[0]]), self.equity(ranges[others[1]]))
+        return (self.equity3(first, second) * main[:, None]
+                + (in_side * side)[:, None] * side_equity
+                - np.minimum(stacks[:, player], mid)[:, None])
+
+    def gains(self, strategy):
+        """What pushing or calling wins over folding for every class at each
+        decision, against `strategy` everywhere else."""
+        p_push, btn = self.range(strategy['btn_push'])
+        p_call, sb_call = self.range(strategy['sb_call'])
+        p_sb, sb_push = self.range(strategy['sb_push'])
+        p_bb1, bb1 = self.range(strategy['bb_call_btn'])
+        p_bb2, bb2 = self.range(strategy['bb_call_sb'])
+        p_bb3, bb3 = self.range(strategy['bb_call_both'])
+
+        btn_push = ((1 - p_call) * ((1 - p_bb1) * (BLINDS[SB] + BLINDS[BB])
+                                    + p_bb1 * self.heads_up(self.equity(bb1), BTN, BB, BLINDS[SB]))
+                    + p_call * ((1 - p_bb3) * self.heads_up(self.equity(sb_call), BTN, SB, BLINDS[BB])
+                                + p_bb3 * self.all_in(BTN, sb_call, bb3,
+                                                      {SB: sb_call, BB: bb3})))
+        sb_call_value = ((1 - p_bb3) * self.heads_up(self.equity(btn), SB, BTN, BLINDS[BB])
+                         + p_bb3 * self.all_in(SB, btn, bb3, {BTN: btn, BB: bb3}))
+        sb_push_value = ((1 - p_bb2) * BLINDS[BB]
+                         + p_bb2 * self.heads_up(self.equity(bb2), SB, BB, 0))
+
+        return {'btn_push': btn_push,
+                'sb_call': sb_call_value + BLINDS[SB],
+                'sb_push': sb_push_value + BLINDS[SB],
+                'bb_call_btn': self.heads_up(self.equity(btn), BB, BTN, BLINDS[SB]) + BLINDS[BB],
+                'bb_call_sb': self.heads_up(self.equity(sb_push), BB, SB, 0) + BLINDS[BB],
+                'bb_call_both': self.all_in(BB, btn, sb_call, {BTN: btn, SB: sb_call})
+                                + BLINDS[BB]}
+
+    def solve(self, iterations=200):
+        """Fictitious play from uniform strategies: every decision plays the
+        average of its best responses to the others so far."""
+        strategy = {d: np.full((len(self.stacks), NUM_CLASSES), .5) for d in DECISIONS}
+        for t in range(1, iterations + 1):
+            gains = self.gains(strategy)
+            for d in DECISIONS:
+                strategy[d] += ((gains[d] > 0) - strategy[d]) / t
+
+        return strategy
+
+
+class PushFoldChart:
+    """Push and call probabilities solved on the stack grid `levels`, a
+    uint8 array indexed by the button, small and big blind levels, the
+    decision and the class. Stacks are looked up at the nearest level
+    through a table of quarter big blinds, so a lookup is a few indexing
+    operations."""
+    def __init__(self, levels, chart):
+        self.levels = np.asarray(levels, dtype=float)
+        self.chart = chart
+        quarters = np.arange(4 * self.levels[-1] + 1) / 4
+        self.nearest = np.abs(quarters[:, None] - self.levels).argmin(axis=1)
+
+    def index(self, stacks):
+        last = len(self.nearest) - 1
+        return tuple(self.nearest[min(int(4 * s + .5), last)] for s in stacks)
+
+    def strategy(self, decision, hand, stacks):
+        """Probability of pushing or calling `hand`, a class index or two
+        cards, at `decision` with the button, small and big blind `stacks`."""
+        if not isinstance(hand, (int, np.integer)):
+            hand = hand_class(*hand)
+        return self.chart[self.index(stacks) + (DECISIONS.index(decision), hand)] / 255
+
+    def range(self, decision, stacks, threshold=.5):
+        """Names of the classes played at least `threshold` of the time."""
+        probs = self.chart[self.index(stacks) + (DECISIONS.index(decision),)] / 255
+        return [class_name(i) for i in np.flatnonzero(probs >= threshold)]
+
+    def save(self, path=CHART_PATH):
+        np.savez_compressed(path, levels=self.levels, chart=self.chart)
+
+    @classmethod
+    def load(cls, path=CHART_PATH):
+        with np.load(path) as data:
+            return cls(data['levels'], data['chart'])
+
+
+def solve_chart(table=None, levels=STACK_LEVELS, iterations=200, chunk=64, three=None):
+    """Solves `PushFold` on every configuration of `levels` big blinds,
+    `chunk` configurations at a time."""
+    table = equity_table() if table is None else table
+    three = three_way_table() if three is None else three
+    stacks = np.array(list(product(levels, repeat=3)), dtype=float)
+    chart = np.zeros((len(stacks), len(DECISIONS), NUM_CLASSES), dtype=np.uint8)
+    for start in tqdm(range(0, len(stacks), chunk), desc='push/fold'):
+        strategy = PushFold(table, stacks[start:start + chunk], three).solve(iterations)
+        for j, d in enumerate(DECISIONS):
+            chart[start:start + chunk, j] = np.rint(255 * strategy[d])
+
+    shape = (len(levels),) * 3 + (len(DECISIONS), NUM_CLASSES)
+    return PushFoldChart(levels, chart.reshape(shape))
+
+
+if __name__ == '__main__':
+    path = sys.argv[1] if len(sys.argv) > 1 else CHART_PATH
+    chart = solve_chart()
+    chart.save(path)
+    for decision in DECISIONS:
+        print(decision, ' '.join(chart.range(decision, (10, 10, 10))))
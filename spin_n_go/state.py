@@ -1,19 +1,278 @@
+import random
+import numpy as np
+
+from array import array
+from bisect import bisect_right
+from leduc.card import Card
+from spin_n_go.icm import ICM
+from spin_n_go.pushfold import STACK_LEVELS
+
+PREFLOP, FLOP, TURN, RIVER, SHOWDOWN = range(5)
+BOARD_DEALT = (0, 3, 4, 5, 5)
+DECK = tuple(range(8, 60))
+STACK_BUCKETS = (0,) + STACK_LEVELS
+
+
 class SpinNGoState:
-    def __init__(self, players, board, pot):
-        self.players = players  # Lista di oggetti giocatore
-        self.board = board  # Carte sul tavolo
-        self.pot = pot  # Somma nel piatto
+    """A no-limit Hold'em hand at a Spin & Go table of `spec`.
+
+    Stacks, chips committed on the current street and chips put in over
+    the hand are integer arrays indexed by seat, seats without chips sit
+    the hand out. `cards` are card codes, two per seat then the five board
+    cards, dealt at random when not given. Actions are 'F', 'C' to check or
+    call and '$R' to put in $ chips on top of the call, sized from the
+    spec's pot fractions or all in.
+
+    `apply` plays an action in place and `undo` takes it back, so a
+    traversal can walk the tree on a single state; `take` returns a new
+    state instead. The public part of the info set key grows by one token
+    per action, after a prefix with the number of seats, the actor's seat
+    counted from the button and the starting stacks from the button on,
+    bucketed in big blinds at `STACK_BUCKETS`. At the end of the hand the
+    pots, side pots included, go to the best hands and `utility` is the
+    prize equity of the stacks under `icm`.
+    """
+    __slots__ = ('spec', 'cards', 'button', 'seats', 'stacks', 'committed', 'contributed',
+                 'folded', 'street', 'turn', 'pending', 'bet', 'min_raise', 'key', 'terminal',
+                 'undos', 'holes', 'boards', 'prefixes', 'scores', 'chart', 'icm')
+
+    def __init__(self, spec, stacks, cards=None, button=0, chart=None, icm=None):
+        num_players = len(stacks)
+        if cards is None:
+            cards = random.sample(DECK, 2 * num_players + 5)
+        self.spec = spec
+        self.cards = tuple(int(card) for card in cards)
+        self.button = button
+        self.seats = tuple(p for p in [(button + i) % num_players for i in range(num_players)]
+                           if stacks[p] > 0)
+        self.stacks = array('q', stacks)
+        self.committed = array('q', [0] * num_players)
+        self.contributed = array('q', [0] * num_players)
+        self.folded = sum(1 << p for p in range(num_players) if stacks[p] <= 0)
+        self.street = PREFLOP
+        self.turn = None
+        self.pending = 0
+        self.bet = 0
+        self.min_raise = spec.big_blind
+        self.key = ''
+        self.terminal = False
+        self.undos = []
+        self.scores = None
+        self.chart = chart  # PushFoldChart for short stacks
+        self.icm = icm if icm is not None else ICM()  # prizes by finishing place
+
+        codes = [Card.from_code(card) for card in self.cards]
+        self.holes = tuple(f'{codes[2 * p]}{codes[2 * p + 1]}' for p in range(num_players))
+        board = codes[2 * num_players:]
+        self.boards = tuple(''.join(repr(card) for card in board[:dealt]) for dealt in BOARD_DEALT)
+        depths = '.'.join(
+            str(STACK_BUCKETS[bisect_right(STACK_BUCKETS, stacks[p] / spec.big_blind) - 1])
+            for p in self.seats)
+        self.prefixes = tuple(f'{len(self.seats)}|{self.seats.index(p)}|{depths}|'
+                              if p in self.seats else '' for p in range(num_players))
+
+        if len(self.seats) < 2:
+            self.terminal = True
+        else:
+            self.post_blinds()
+
+    def post_blinds(self):
+        seats, spec = self.seats, self.spec
+        for p in seats:
+            self.put(p, spec.ante)
+            self.committed[p] = 0
+        # heads up the button posts the small blind, either way the first
+        # seat acts first before the flop and the second after it
+        small, big = (seats[0], seats[1]) if len(seats) == 2 else (seats[1], seats[2])
+        self.put(small, spec.small_blind)
+        self.put(big, spec.big_blind)
+        self.bet = max(self.committed)
+        self.pending = len(self.actors())
+        self.turn = seats[-1]
+        self.settle()
+
+    def put(self, player, amount):
+        amount = min(amount, self.stacks[player])
+        self.stacks[player] -= amount
+        self.committed[player] += amount
+        self.contributed[player] += amount
+
+    def live(self):
+        return [p for p in self.seats if not self.folded >> p & 1]
+
+    def actors(self):
+        """Seats still in the hand with chips behind."""
+        return [p for p in self.seats if not self.folded >> p & 1 and self.stacks[p] > 0]
+
+    def next_actor(self, player):
+        seats = self.seats
+        start = seats.index(player)
+        for i in range(1, len(seats) + 1):
+            p = seats[(start + i) % len(seats)]
+            if not self.folded >> p & 1 and self.stacks[p] > 0:
+                return p
+        return None
+
+    def board(self):
+        start = 2 * len(self.stacks)
+        return self.cards[start:start + BOARD_DEALT[self.street]]
+
+    def pot(self):
+        return sum(self.contributed)
+
+    def to_call(self):
+        return self.bet - self.committed[self.turn]
 
     def valid_actions(self):
-        # Restituisce una lista di azioni valide come 'call', 'raise', 'fold'
-        return ['call', 'raise', 'fold']
+        if self.terminal:
+            return []
+
+        p = self.turn
+        call = self.bet - self.committed[p]
+        behind = self.stacks[p] - call
+        actions = ['F', 'C'] if call > 0 else ['C']
+        if behind > 0 and any(q != p for q in self.actors()):
+            pot = self.pot() + call
+            sizes = {max(int(fraction * pot), self.min_raise) for fraction
+                     in self.spec.bet_sizes[self.street]}
+            actions += [f'{size}R' for size in sorted(sizes) if size < behind]
+            actions.append(f'{behind}R')
+
+        return actions
+
+    def apply(self, action):
+        """Plays `action` in place."""
+        p = self.turn
+        self.undos.append((p, self.stacks[p], self.contributed[p], self.committed.tolist(),
+                           self.folded, self.street, self.pending, self.bet, self.min_raise,
+                           self.key, self.terminal))
+        if action == 'F':
+            self.folded |= 1 << p
+            self.pending -= 1
+        elif action == 'C':
+            self.put(p, self.bet - self.committed[p])
+            self.pending -= 1
+        else:
+            size = int(action[:-1])
+            self.put(p, self.bet - self.committed[p] + size)
+            self.min_raise = max(self.min_raise, size)
+            self.bet = self.committed[p]
+            self.pending = sum(1 for q in self.actors() if q != p)
+
+        self.key += action + ' '
+        self.settle()
+        return self
+
+    def undo(self):
+        """Takes back the last action applied."""
+        (p, stack, contributed, committed, self.folded, self.street, self.pending, self.bet,
+         self.min_raise, self.key, self.terminal) = self.undos.pop()
+        self.stacks[p] = stack
+        self.contributed[p] = contributed
+        self.committed = array('q', committed)
+        self.turn = p
+        return self
+
+    def settle(self):
+        """Moves the turn on, to the next street or to the end of the hand
+        once nobody has to act on this one."""
+        if len(self.live()) == 1:
+            self.terminal = True
+            return
+
+        actors = self.actors()
+        if self.pending > 0 and actors:
+            self.turn = self.next_actor(self.turn)
+            return
+
+        if self.street == RIVER or len(actors) < 2:
+            self.street = SHOWDOWN
+            self.terminal = True
+            return
+
+        self.street += 1
+        self.committed = array('q', [0] * len(self.stacks))
+        self.bet = 0
+        self.min_raise = self.spec.big_blind
+        self.pending = len(actors)
+        self.key += '| '
+        self.turn = self.next_actor(self.seats[0])
 
     def take(self, action):
-        # Implementa la logica per prendere un'azione e restituire un nuovo stato
-        new_state = SpinNGoState(self.players, self.board, self.pot)
-        # Aggiorna new_state in base all'azione
-        return new_state
+        return self.copy().apply(action)
+
+    def copy(self):
+        state = SpinNGoState.__new__(SpinNGoState)
+        for name in self.__slots__:
+            setattr(state, name, getattr(self, name))
+        state.stacks = array('q', self.stacks)
+        state.committed = array('q', self.committed)
+        state.contributed = array('q', self.contributed)
+        state.undos = list(self.undos)
+        return state
+
+    def info_set(self):
+        return (f'{self.prefixes[self.turn]}{self.holes[self.turn]}|'
+                f'{self.boards[self.street]}|{self.key}')
+
+    def winnings(self):
+        """Chips every seat takes from the pots at the end of the hand."""
+        from spin_n_go.lookup import hand_tables
+
+        won = [0] * len(self.stacks)
+        live = self.live()
+        if len(live) == 1:
+            won[live[0]] = self.pot()
+            return won
+
+        if self.scores is None:
+            board = list(self.cards[2 * len(self.stacks):])
+            hands = np.array([list(self.cards[2 * p:2 * p + 2]) + board for p in self.seats])
+            self.scores = dict(zip(self.seats, hand_tables().strength(hands).tolist()))
+        scores = {p: self.scores[p] for p in live}
+
+        contributed = self.contributed
+        previous = 0
+        for level in sorted(set(contributed)):
+            if level == 0:
+                continue
+            chips = sum(min(c, level) - min(c, previous) for c in contributed)
+            eligible = [p for p in live if contributed[p] >= level] or \
+                       [p for p in self.seats if contributed[p] >= level]
+            best = max(scores.get(p, -1) for p in eligible)
+            winners = [p for p in eligible if scores.get(p, -1) == best]
+            for p in winners:
+                won[p] += chips // len(winners)
+            won[winners[0]] += chips % len(winners)
+            previous = level
+
+        return won
+
+    def final_stacks(self):
+        """Stacks once the pots are paid out, or with every bet handed back
+        if the hand isn't over."""
+        if self.terminal:
+            return [stack + won for stack, won in zip(self.stacks, self.winnings())]
+        return [stack + put for stack, put in zip(self.stacks, self.contributed)]
+
+    def payoffs(self):
+        """Chips each seat wins or loses over the hand."""
+        return [final - stack - put for final, stack, put
+                in zip(self.final_stacks(), self.stacks, self.contributed)]
+
+    def push_fold(self, decision, hand, stacks):
+        """Push or call probability of `hand` at `decision` of the chart,
+        see `spin_n_go.pushfold`, with the button, small and big blind
+        `stacks` in big blinds."""
+        if self.chart is None:
+            raise ValueError("This state has no push/fold chart")
+        return self.chart.strategy(decision, hand, stacks)
 
     def utility(self, player):
-        # Calcola l'utilità dello stato corrente per un determinato giocatore
-        return 0  # Sostituire con la logica appropriata
+        """Prize equity of `player`'s stack under `icm`, winner takes all
+        unless the state was given other prizes."""
+        return float(self.icm.equity(self.final_stacks())[player])
+
+    def __repr__(self):
+        return (f"SpinNGoState(stacks={list(self.stacks)}, pot={self.pot()}, "
+                f"board={self.boards[self.street]}, history={self.key!r})")
@@ -0,0 +1,50 @@
+import numpy as np
+
+from itertools import combinations
+from leduc.card import Card, encode
+from spin_n_go.hand_eval import deck, evaluate, category, spin_n_go_eval
+
+
+def cards(string):
+    return [Card.from_string(card) for card in string.split()]
+
+
+def test_categories():
+    hands = {'As Ks Qs Js Ts 2h 3d': 'straight flush', 'Ah Ad Ac As Kh Kd Qc': 'quads',
+             'Ah Ad Ac Kh Kd Ks 2c': 'full house', 'Ah Kh 2h 7h 9h 9c 9d': 'flush',
+             'Ah 2d 3c 4h 5s 9c Kc': 'straight', '9s 9h 9c 2h 5s Jc Kc': 'trips',
+             'Qh Qd 5c 5h 2s 2c Ac': 'two pair', 'Qh Qd 5c 7h 2s 3c Ac': 'pair',
+             '2h 7d 9c Jh Ks 3c 4d': 'high card'}
+    for hand, name in hands.items():
+        assert category(spin_n_go_eval(cards(hand)[:2], cards(hand)[2:])) == name
+
+    assert spin_n_go_eval(cards('Qh Qd'), cards('5c 5h 2s 2c Ac')) > \
+        spin_n_go_eval(cards('Qh Qd'), cards('5c 5h 2s 2c Kc'))
+    assert spin_n_go_eval(cards('6h 7d'), cards('2s 3c 4d 5h 8c')) > \
+        spin_n_go_eval(cards('Ah Kd'), cards('2s 3c 4d 5h 8c'))
+
+
+def score(string):
+    return evaluate(encode(cards(string))[None])[0]
+
+
+def test_quads_kicker():
+    aces_king = score('Ah Ad Ac As Kc')
+    for hand in ['3h 3d', 'Qh Jd', 'Kh Kd', 'Kh 2d', '3h']:
+        assert score(f'{hand} Ah Ad Ac As Kc') == aces_king
+
+    assert score('Qh Qd 9h 9d 9c 9s 2c') == score('Qh 3d 9h 9d 9c 9s 2c')
+    assert score('Qh Qd 9h 9d 9c 9s') > score('Jh Jd 9h 9d 9c 9s 2c')
+    assert score('9h 9d 9c 9s 2c 2d 2h') < score('9h 9d 9c 9s 3c')
+
+
+def test_best_five():
+    rng = np.random.default_rng(0)
+    codes = encode(deck())
+    hands = np.stack([rng.choice(codes, 7, replace=False) for _ in range(300)])
+
+    best = np.max([evaluate(hands[:, list(five)]) for five in combinations(range(7), 5)], axis=0)
+    assert np.array_equal(evaluate(hands), best)
+    assert np.array_equal(evaluate(hands[:, :6]),
+                          np.max([evaluate(hands[:, list(five)])
+                                  for five in combinations(range(6), 5)], axis=0))
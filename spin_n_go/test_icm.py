@@ -0,0 +1,58 @@
+import numpy as np
+
+from itertools import permutations
+from spin_n_go.icm import (ICM, finish_probabilities, icm_equity, spin_prizes, random_prizes,
+                           SPIN_MULTIPLIERS)
+from spin_n_go.game import SPIN
+
+
+def harville(stacks, prizes):
+    """Equity by enumerating finishing orders one at a time."""
+    equity = np.zeros(len(stacks))
+    for order in permutations(range(len(stacks))):
+        prob, left = 1, sum(stacks)
+        for player in order:
+            prob *= stacks[player] / left
+            left -= stacks[player]
+        for place, player in enumerate(order[:len(prizes)]):
+            equity[player] += prob * prizes[place]
+    return equity
+
+
+def test_equity():
+    prizes = (.5, .3, .2)
+    for stacks in [(50, 30, 20), (1, 1, 98), (10, 10, 10)]:
+        assert np.allclose(icm_equity(stacks, prizes), harville(stacks, prizes))
+    assert np.allclose(icm_equity((30, 10), (.5, .3, .2)), harville((30, 10), (.5, .3)))
+    assert np.allclose(icm_equity((30, 10, 60), (1,)), (.3, .1, .6))
+
+    places = finish_probabilities([[50, 30, 20], [0, 10, 30]])
+    assert np.allclose(places.sum(axis=1), 1) and np.allclose(places.sum(axis=2), 1)
+    assert np.allclose(places[1, 0], (0, 0, 1))
+
+
+def test_memo():
+    icm = ICM((.5, .3, .2))
+    batch = np.array([[50, 30, 20], [5, 3, 2], [0, 40, 60], [20, 50, 30]])
+    assert np.allclose(icm.equity(batch), icm_equity(batch, icm.prizes))
+    assert icm.misses == 3
+
+    assert np.allclose(icm.equity([500, 300, 200]), harville((50, 30, 20), icm.prizes))
+    assert icm.misses == 3 and icm.hits == 1
+
+
+def test_prizes():
+    assert spin_prizes(10, 1000) == (8000, 1000, 1000)
+    assert spin_prizes(5, 2) == (10,)
+    multipliers = {value for value, _, _ in SPIN_MULTIPLIERS}
+    rng = np.random.default_rng(0)
+    assert all(sum(random_prizes(1, rng)) in multipliers for _ in range(20))
+
+
+def test_utility():
+    state = SPIN.new_state([300, 200, 0])
+    assert state.utility(0) == .6 and state.utility(2) == 0
+
+    state = SPIN.new_state([300, 200, 0], icm=ICM(spin_prizes(1, 1000)))
+    assert np.isclose(sum(state.utility(p) for p in range(3)), 1000)
+    assert np.isclose(state.utility(2), 100)
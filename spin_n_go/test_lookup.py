@@ -0,0 +1,63 @@
+import numpy as np
+
+from itertools import combinations
+from leduc.card import encode
+from spin_n_go.hand_eval import deck, evaluate, category, CATEGORIES
+from spin_n_go.lookup import HandTables, NUM_CLASSES, rank_multisets, unsuited
+
+
+def random_hands(n, size, seed=0):
+    rng = np.random.default_rng(seed)
+    codes = encode(deck()).astype(np.int64)
+    return codes[np.argsort(rng.random((n, len(codes))), axis=1)[:, :size]]
+
+
+def test_tables(tmp_path):
+    tables = HandTables(str(tmp_path))
+    assert len(tables.scores) == NUM_CLASSES
+    assert isinstance(HandTables(str(tmp_path)).products, np.memmap)
+
+    # distinct five card hands of each category
+    counts = [1277, 2860, 858, 858, 10, 1277, 156, 156, 10]
+    names = [category(score) for score in tables.scores]
+    assert [names.count(name) for name in CATEGORIES] == counts
+
+
+def test_brute_force(tmp_path):
+    tables = HandTables(str(tmp_path))
+    hands = random_hands(5000, 7)
+    best = np.max([evaluate(hands[:, list(five)]) for five in combinations(range(7), 5)], axis=0)
+    assert np.array_equal(tables.evaluate(hands), best)
+
+    for size in (5, 6):
+        assert np.array_equal(tables.evaluate(hands[:, :size]), evaluate(hands[:, :size]))
+
+    flushes = np.array([[(rank + 2) * 4 + 1 for rank in (12, 11, 10, 9, 8)] + [8, 13]])
+    assert category(tables.evaluate(flushes)[0]) == 'straight flush'
+    assert tables.strength(flushes)[0] == NUM_CLASSES - 1
+
+
+def best_five(hands):
+    size = hands.shape[1]
+    return np.max([evaluate(hands[:, list(five)]) for five in combinations(range(size), 5)],
+                  axis=0)
+
+
+def test_every_entry(tmp_path):
+    """Every rank multiset and every flush against its best five cards."""
+    tables = HandTables(str(tmp_path))
+    multisets = rank_multisets()
+    for size in (5, 6, 7):
+        hands = np.array([unsuited(ranks) for ranks in multisets if len(ranks) == size])
+        assert np.array_equal(tables.evaluate(hands), best_five(hands))
+
+        flushes = np.array([[(rank + 2) * 4 + 2 for rank in ranks]
+                            for ranks in combinations(range(13), size)])
+        assert np.array_equal(tables.evaluate(flushes), best_five(flushes))
+
+    # quads with a pair or trips beside a higher or lower kicker
+    for ranks, five in [((1, 1, 12, 12, 12, 12, 11), (12, 12, 12, 12, 11)),
+                        ((10, 10, 12, 12, 12, 12), (12, 12, 12, 12, 10)),
+                        ((11, 11, 11, 12, 12, 12, 12), (12, 12, 12, 12, 11)),
+                        ((3, 3, 5, 5, 9, 9, 0), (9, 9, 5, 5, 3))]:
+        assert tables.evaluate([unsuited(ranks)])[0] == evaluate([unsuited(five)])[0]
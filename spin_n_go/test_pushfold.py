@@ -0,0 +1,63 @@
+import numpy as np
+
+from leduc.card import Card
+from spin_n_go.preflop import (NUM_CLASSES, class_name, class_combos, class_weights,
+                               hand_class, equity_table, three_way_table, three_way_equity)
+from spin_n_go.pushfold import DECISIONS, PushFold, PushFoldChart, solve_chart
+from spin_n_go.game import SPIN
+
+TABLE = equity_table(samples=20, seed=0, path=None)
+THREE = three_way_table(samples=1, seed=0, path=None)
+
+
+def test_classes():
+    names = [class_name(i) for i in range(NUM_CLASSES)]
+    assert len(set(names)) == NUM_CLASSES and names[0] == 'AA' and names[1] == 'AKs'
+    assert class_name(hand_class(Card(14, 1), Card(13, 2))) == 'AKo'
+    assert sum(len(c) for c in class_combos()) == 1326
+    assert np.isclose(class_weights().sum(), 1)
+
+
+def test_equity():
+    assert np.allclose(TABLE + TABLE.T, 1)
+    aa, kk, seven_two = 0, 14, class_name_index('72o')
+    assert TABLE[aa, kk] > .7 and TABLE[seven_two, aa] < .2
+
+    total = THREE + THREE.transpose(1, 0, 2) + THREE.transpose(2, 1, 0)
+    assert np.allclose(total, 1, atol=1e-5)
+    assert np.allclose(THREE, THREE.transpose(0, 2, 1))
+
+    aa, kk, qq = (class_name_index(name) for name in ['AA', 'KK', 'QQ'])
+    equity = three_way_equity([(aa, kk, qq), (aa, aa, aa)], 4000, np.random.default_rng(0))
+    assert .63 < equity[0, 0] < .70 and equity[0, 1] > equity[0, 2]
+    assert np.allclose(equity[1], 1 / 3)
+
+
+def class_name_index(name):
+    return [class_name(i) for i in range(NUM_CLASSES)].index(name)
+
+
+def test_solve(tmp_path):
+    chart = solve_chart(TABLE, levels=(4, 10, 25), iterations=60, three=THREE)
+    assert chart.chart.shape == (3, 3, 3, len(DECISIONS), NUM_CLASSES)
+
+    for decision in DECISIONS:
+        assert chart.strategy(decision, 0, (10, 10, 10)) == 1
+    assert chart.strategy('btn_push', class_name_index('72o'), (25, 25, 25)) == 0
+    assert len(chart.range('btn_push', (4, 4, 4))) > len(chart.range('btn_push', (25, 25, 25)))
+
+    path = str(tmp_path / 'chart.npz')
+    chart.save(path)
+    loaded = PushFoldChart.load(path)
+    state = SPIN.new_state(chart=loaded)
+    hand = [Card(14, 1), Card(14, 2)]
+    assert state.push_fold('bb_call_both', hand, (9.7, 11, 24)) == 1
+    assert loaded.index((9.7, 11, 24)) == (1, 1, 2)
+
+
+def test_gains():
+    game = PushFold(TABLE, [(10, 10, 10)], THREE)
+    folds = {d: np.zeros((1, NUM_CLASSES)) for d in DECISIONS}
+    gains = game.gains(folds)
+    assert np.allclose(gains['btn_push'], 1.5)
+    assert np.allclose(gains['sb_push'], 1.5)
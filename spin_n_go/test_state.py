@@ -0,0 +1,95 @@
+import random
+
+from leduc.card import Card
+from spin_n_go.game import SPIN, SPIN_HEADS_UP, SpinSpec
+from spin_n_go.state import FLOP, SHOWDOWN
+
+
+def deal(string):
+    return [Card.from_string(card) for card in string.split()]
+
+
+def snapshot(state):
+    return (list(state.stacks), list(state.committed), list(state.contributed), state.folded,
+            state.street, state.turn, state.pending, state.bet, state.min_raise, state.key,
+            state.terminal)
+
+
+def test_blinds():
+    state = SPIN.new_state(button=1)
+    assert list(state.committed) == [20, 0, 10] and state.turn == 1
+    assert state.valid_actions() == ['F', 'C', '25R', '50R', '480R']
+
+    heads_up = SPIN_HEADS_UP.new_state()
+    assert list(heads_up.committed) == [10, 20] and heads_up.turn == 0
+    heads_up.apply('C').apply('C')
+    assert heads_up.street == FLOP and heads_up.turn == 1
+
+    busted = SPIN.new_state([600, 0, 900])
+    assert busted.seats == (0, 2) and list(busted.committed) == [10, 0, 20]
+
+
+def test_streets():
+    cards = deal('As Ad Kc Kd 7h 2c Ah Kh 9s 4d 3c')
+    state = SPIN.new_state(cards=cards)
+    for action in ['C', 'C', 'C', 'C', '30R', 'C', 'F']:
+        state.apply(action)
+
+    assert state.street == 2 and state.turn == 2
+    assert state.info_set() == '3|2|25.25.25|7h2c|AhKh9s4d|C C C | C 30R C F | '
+    for action in ['C', 'C', 'C', 'C']:
+        state.apply(action)
+    assert state.terminal and state.street == SHOWDOWN
+    assert state.payoffs() == [70, -20, -50]
+
+
+def test_info_set_prefix():
+    cards = deal('As Ad Kc Kd 7h 2c Ah Kh 9s 4d 3c')
+    keys = {SPIN.new_state(cards=cards).info_set(),
+            SPIN.new_state([200, 500, 500], cards=cards).info_set(),
+            SPIN.new_state(cards=cards, button=1).info_set(),
+            SPIN.new_state([0, 500, 500], cards=cards).info_set()}
+    assert len(keys) == 4
+
+    state = SPIN.new_state([30, 100, 900], cards=cards, button=2)
+    assert state.turn == 2 and state.info_set().startswith('3|0|25.0.5|')
+    assert SPIN_HEADS_UP.new_state().info_set().startswith('2|0|25.25|')
+
+
+def test_side_pots():
+    cards = deal('7h 2c Ks Kd As Ad 9c 8d 4h 3s 2d')
+    state = SPIN.new_state([100, 300, 500], cards=cards)
+    state.apply('80R').apply('C').apply('C').apply('200R')
+    state.apply('C')
+    assert state.terminal
+
+    # aces win the main and the side pot, the sevens take nothing back
+    assert state.winnings() == [0, 0, 700]
+    assert state.final_stacks() == [0, 0, 900]
+
+    cards = deal('As Ad 7h 2c Ks Kd 9c 8d 4h 3s 2d')
+    state = SPIN.new_state([100, 300, 500], cards=cards).apply('80R').apply('C').apply('C')
+    state.apply('200R').apply('C')
+    assert state.winnings() == [300, 0, 400]
+    assert sum(state.final_stacks()) == 900
+
+
+def test_undo():
+    random.seed(0)
+    spec = SpinSpec(bet_sizes=((1.,), (.5, 1.), (1.,), (1., 2.)), ante=5)
+    for _ in range(200):
+        state = spec.new_state([random.randint(50, 800) for _ in range(3)])
+        start = snapshot(state)
+        seen = []
+        while not state.terminal:
+            seen.append(snapshot(state))
+            state.apply(random.choice(state.valid_actions()))
+
+        assert sum(state.final_stacks()) == sum(start[0]) + sum(start[2])
+        for expected in reversed(seen):
+            state.undo()
+            assert snapshot(state) == expected
+        assert snapshot(state) == start
+
+        copy = state.take(state.valid_actions()[0])
+        assert snapshot(state) == start and copy.key != state.key